@@ -0,0 +1,69 @@
+"""
+Benchmark: decodificación de mensajes binarios con esquemas compilados
+
+Genera mensajes de telemetría de tamaño fijo y compara tres formas de
+decodificarlos: campo a campo con int.from_bytes (lo que haría un
+_process_* escrito a mano), MessageSchema.decode() por mensaje y
+MessageSchema.decode_batch() por lotes.
+Uso: python -m benchmarks.bench_protocol [mensajes] [tamaño_de_lote]
+"""
+
+import struct
+import sys
+import time
+
+from src.protocol import MessageSchema
+
+FIELDS = [('seq', 'u16'), ('temp', 'i16', 0.01), ('hum', 'u16', 0.1),
+          ('ax', 'i16'), ('ay', 'i16'), ('az', 'i16'), ('flags', 'u8'), ('_', 'pad:1')]
+HEADER = b'\xAA\x55'
+
+
+def by_hand(data):
+    """Decodificación campo a campo, como un _process_* escrito a mano."""
+    if data[:2] != HEADER:
+        return None
+    return {
+        'seq': int.from_bytes(data[2:4], 'little'),
+        'temp': int.from_bytes(data[4:6], 'little', signed=True) * 0.01,
+        'hum': int.from_bytes(data[6:8], 'little') * 0.1,
+        'ax': int.from_bytes(data[8:10], 'little', signed=True),
+        'ay': int.from_bytes(data[10:12], 'little', signed=True),
+        'az': int.from_bytes(data[12:14], 'little', signed=True),
+        'flags': data[14],
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    layout = struct.Struct('<2sHhHhhhBx')
+    messages = [layout.pack(HEADER, n & 0xFFFF, 2500, 600, -n % 100, 0, 981, 1)
+                for n in range(count)]
+    schema = MessageSchema(FIELDS, header=HEADER, name='telemetria')
+
+    start = time.perf_counter()
+    for message in messages:
+        by_hand(message)
+    manual = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for message in messages:
+        schema.decode(message)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(0, count, batch):
+        schema.decode_batch(messages[i:i + batch])
+    batched = time.perf_counter() - start
+
+    print(f"{count} mensajes de {schema.size} bytes, lotes de {batch}")
+    for label, elapsed in (("Campo a campo", manual), ("decode()", single),
+                           ("decode_batch()", batched)):
+        print(f"{label:15} {count / elapsed:12,.0f} mensajes/s  "
+              f"({elapsed / count * 1e6:.2f} µs/mensaje)")
+
+
+if __name__ == "__main__":
+    main()
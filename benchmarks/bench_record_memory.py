@@ -0,0 +1,78 @@
+"""
+Benchmark: memoria por registro del historial de DataHandler
+
+Compara el diccionario de 5 claves que se usaba antes con DataRecord,
+antes y después de consultar 'text' y 'hex' (la consola consulta ambos en
+cada registro que muestra, y quedan guardados en el registro).
+Uso: python -m benchmarks.bench_record_memory [registros] [bytes_por_paquete]
+"""
+
+import sys
+import tracemalloc
+from datetime import datetime
+
+from src.data_handler import DataRecord
+
+
+def _legacy_record(raw):
+    """Registro con el formato anterior (dict con texto y hex calculados)."""
+    return {
+        'timestamp': datetime.now(),
+        'raw': raw,
+        'text': raw.decode('utf-8', errors='ignore'),
+        'length': len(raw),
+        'hex': ' '.join([f'{b:02X}' for b in raw])
+    }
+
+
+def _displayed_record(raw):
+    """DataRecord tal como queda después de mostrarlo en la consola."""
+    record = DataRecord(raw)
+    record.text
+    record.hex
+    return record
+
+
+def _measure(factory, payloads):
+    """
+    Mide la memoria que ocupan los registros creados por factory.
+    
+    Los payloads se crean antes de medir, así solo se cuenta el costo
+    propio de cada registro.
+    
+    Returns:
+        int: Bytes asignados por los registros
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [factory(raw) for raw in payloads]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return after - before
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    
+    payloads = [bytes([i % 256]) * size for i in range(count)]
+    
+    legacy = _measure(_legacy_record, payloads)
+    compact = _measure(DataRecord, payloads)
+    displayed = _measure(_displayed_record, payloads)
+    
+    print(f"Registros: {count} (payload de {size} bytes, no incluido)")
+    rows = (
+        ("dict anterior:", legacy),
+        ("DataRecord:", compact),
+        ("  con text/hex:", displayed),
+        ("Ahorro:", legacy - compact),
+        ("  con text/hex:", legacy - displayed),
+    )
+    for label, used in rows:
+        print(f"{label:16} {used / 1e6:8.2f} MB ({used / count:6.1f} B/registro)")
+
+
+if __name__ == "__main__":
+    main()
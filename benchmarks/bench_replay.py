@@ -0,0 +1,77 @@
+"""
+Benchmark: reproducción de capturas como prueba de carga
+
+Graba una captura binaria de un dispositivo simulado (SimulatedTransport) y
+la reproduce sin esperas por la ruta de datos en vivo: bus de datos →
+suscriptor 'procesamiento' → DataHandler.process_batch(). Mide frames por segundo
+y throughput de esa ruta.
+Uso: python -m benchmarks.bench_replay [segundos_de_grabacion] [paquetes_por_segundo] [velocidad]
+(velocidad = 0 reproduce tan rápido como se pueda)
+"""
+
+import sys
+import tempfile
+import time
+
+from src.bluetooth_manager import BluetoothManager
+from src.capture import BinaryCaptureWriter
+from src.data_handler import DataHandler
+from src.framing import DelimiterFramer
+from src.transport import SimulatedDevice, SimulatedTransport, SyntheticTraffic
+
+ADDRESS = "00:00:00:00:00:01"
+
+
+def record(directory, seconds, rate):
+    """Graba una captura del dispositivo simulado y devuelve sus archivos."""
+    transport = SimulatedTransport([
+        SimulatedDevice(ADDRESS, "Benchmark", traffic=SyntheticTraffic(rate=rate, packet_size=64))
+    ])
+    manager = BluetoothManager(transport=transport)
+    manager.set_framer(DelimiterFramer(b'\n'))
+
+    capture = BinaryCaptureWriter(directory=directory, max_bytes=0, max_seconds=0)
+    capture.start(manager)
+    if not manager.connect(ADDRESS, 1):
+        raise RuntimeError("No se pudo conectar al dispositivo simulado")
+    time.sleep(seconds)
+    manager.disconnect()
+    capture.stop()
+    return [capture.current_path], capture.frames
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    rate = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    speed = float(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths, recorded = record(directory, seconds, rate)
+
+        manager = BluetoothManager(transport=SimulatedTransport())  # Sin dispositivos: solo reproduce
+        handler = DataHandler(max_history=10000)
+        processed = {'frames': 0}
+
+        def on_frames(frames):
+            handler.process_batch(frames)
+            processed['frames'] += len(frames)
+
+        # Igual que main.py: el suscriptor recibe los frames por lotes
+        subscription = manager.subscribe(on_frames, name='procesamiento', policy='block',
+                                         batch=True)
+        start = time.monotonic()
+        replay = manager.start_replay(paths, speed=speed)
+        replay.wait()
+        subscription.stop()  # Procesa los frames que quedaban en cola
+        elapsed = time.monotonic() - start
+        stats = replay.get_stats()
+
+    print(f"Grabados:    {recorded} frames en {seconds:.0f}s")
+    print(f"Reproducción a {f'{speed:g}x' if speed else 'máxima velocidad'}:")
+    print(f"Publicados:  {stats['frames']} ({stats['frames'] / stats['elapsed']:,.0f}/s)")
+    print(f"Procesados:  {processed['frames']} ({processed['frames'] / elapsed:,.0f}/s, "
+          f"{stats['bytes'] / elapsed / 1e6:.2f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
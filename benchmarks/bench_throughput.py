@@ -0,0 +1,77 @@
+"""
+Benchmark: rendimiento de la ruta recepción → procesamiento
+
+Conecta BluetoothManager a un dispositivo simulado (SimulatedTransport) que
+envía paquetes "secuencia,t_ns,relleno\\n" y mide frames por segundo,
+throughput y latencia desde el envío hasta DataHandler.process().
+Uso: python -m benchmarks.bench_throughput [segundos] [paquetes_por_segundo] [bytes_por_paquete]
+(paquetes_por_segundo = 0 envía tan rápido como se pueda)
+"""
+
+import sys
+import time
+
+from src.bluetooth_manager import BluetoothManager
+from src.data_handler import DataHandler
+from src.framing import DelimiterFramer
+from src.transport import SimulatedDevice, SimulatedTransport, SyntheticTraffic
+
+ADDRESS = "00:00:00:00:00:01"
+
+
+def _percentile(values, fraction):
+    """Percentil de una lista ya ordenada."""
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    rate = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    size = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+
+    transport = SimulatedTransport([
+        SimulatedDevice(ADDRESS, "Benchmark", traffic=SyntheticTraffic(rate=rate, packet_size=size))
+    ])
+    manager = BluetoothManager(transport=transport)
+    manager.set_framer(DelimiterFramer(b'\n'))
+    handler = DataHandler(max_history=10000)
+
+    latencies = []
+    stats = {'frames': 0, 'bytes': 0, 'last_seq': -1, 'lost': 0}
+
+    def on_frame(frame):
+        handler.process(frame.data, t_ns=frame.t_ns, source=frame.source)
+        seq, sent_ns, _ = bytes(frame.data).split(b',', 2)
+        latencies.append(time.monotonic_ns() - int(sent_ns))
+        seq = int(seq)
+        stats['lost'] += seq - stats['last_seq'] - 1
+        stats['last_seq'] = seq
+        stats['frames'] += 1
+        stats['bytes'] += len(frame.data) + 1
+
+    subscription = manager.subscribe(on_frame, name='benchmark', policy='block')
+
+    if not manager.connect(ADDRESS, 1):
+        print("No se pudo conectar al dispositivo simulado")
+        return
+
+    start = time.monotonic()
+    time.sleep(seconds)
+    manager.disconnect()
+    subscription.stop()
+    elapsed = time.monotonic() - start
+
+    latencies.sort()
+    print(f"Tasa pedida: {rate or 'máxima'} paquetes/s de {size} bytes, {seconds:.0f}s")
+    print(f"Frames:      {stats['frames']} ({stats['frames'] / elapsed:,.0f}/s, "
+          f"{stats['lost']} perdidos)")
+    print(f"Throughput:  {stats['bytes'] / elapsed / 1e6:8.2f} MB/s")
+    print(f"Latencia:    p50 {_percentile(latencies, 0.5) / 1e6:6.2f} ms  "
+          f"p99 {_percentile(latencies, 0.99) / 1e6:6.2f} ms  "
+          f"máx {_percentile(latencies, 1.0) / 1e6:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
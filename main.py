@@ -10,7 +10,13 @@ from src.bluetooth_manager import BluetoothManager
 from src.data_handler import DataHandler
 from src.ui.main_window import MainWindow
 from src.config import Config
+from src.channel_store import ChannelStore
+from src.device_registry import DeviceRegistry
+from src.framing import create_framer
+from src.protocol import create_schema
+from src.service_cache import ServiceCache
 import logging
+import os
 
 # Configuración del sistema de logging
 logging.basicConfig(
@@ -39,14 +45,44 @@ class BluetoothApp:
         
         # Cargar configuración
         self.config = Config()
+        self.device_registry = DeviceRegistry(self.config)
         
         # Configurar el tema de CustomTkinter
         ctk.set_appearance_mode(self.config.get('appearance_mode', 'dark'))
         ctk.set_default_color_theme(self.config.get('color_theme', 'blue'))
         
         # Inicializar componentes
-        self.bluetooth_manager = BluetoothManager()
-        self.data_handler = DataHandler()
+        # Caché SDP persistida junto a config.json
+        config_dir = os.path.dirname(os.path.abspath(self.config.config_file))
+        self.service_cache = ServiceCache(
+            cache_file=os.path.join(config_dir, 'sdp_cache.json'),
+            ttl=self.config.get('sdp_cache_ttl', 3600)
+        )
+        
+        self.bluetooth_manager = BluetoothManager(
+            recv_size=self.config.get('recv_size', 4096),
+            service_cache=self.service_cache
+        )
+        self.bluetooth_manager.set_framer(
+            create_framer(**self.config.get('framing', {'mode': 'none'}))
+        )
+        self.bluetooth_manager.set_reconnect_policy(
+            **self.config.get('auto_reconnect', {'enabled': True})
+        )
+        self.bluetooth_manager.set_send_policy(
+            **self.config.get('send_queue', {})
+        )
+        self.data_handler = DataHandler(
+            max_history=self.config.get('history_size', 100)
+        )
+        if self.config.get('protocol'):
+            self.data_handler.set_schema(create_schema(**self.config.get('protocol')))
+            try:
+                self.data_handler.set_channel_store(
+                    ChannelStore(capacity=self.config.get('channel_history', 100000))
+                )
+            except ImportError as e:
+                logger.warning(f"Sin almacén de canales: {e}")
         self.ui = MainWindow(
             bluetooth_manager=self.bluetooth_manager,
             data_handler=self.data_handler,
@@ -56,6 +92,12 @@ class BluetoothApp:
         # Conectar callbacks
         self._setup_callbacks()
         
+        # Reconectar al último dispositivo sin escanear
+        last_device = self.device_registry.get_last()
+        if last_device and self.config.get('auto_connect', True):
+            logger.info(f"Reconectando a dispositivo conocido: {last_device['address']}")
+            self.ui.auto_connect(last_device)
+        
     def _setup_callbacks(self):
         """
         Configura los callbacks entre componentes.
@@ -63,28 +105,45 @@ class BluetoothApp:
         Esto permite que el gestor de Bluetooth notifique a la interfaz
         cuando se reciben nuevos datos.
         """
-        self.bluetooth_manager.set_data_callback(self._on_data_received)
+        # Etapa de procesamiento: suscriptor del bus con su propia cola,
+        # el hilo de recepción solo publica frames
+        self.processing = self.bluetooth_manager.subscribe(
+            self._on_data_received,
+            name='procesamiento',
+            max_size=self.config.get('processing_queue_size', 10000),
+            policy=self.config.get('overflow_policy', 'drop_oldest'),
+            batch=True
+        )
         self.bluetooth_manager.set_connection_callback(self._on_connection_change)
+        self.bluetooth_manager.sessions.set_session_callback(self._on_session_change)
+        self.bluetooth_manager.set_reconnect_callback(self._on_reconnect_attempt)
         
-    def _on_data_received(self, raw_data):
+    def _on_data_received(self, frames):
         """
         Callback ejecutado cuando se reciben datos del dispositivo Bluetooth.
         
+        Se ejecuta en el hilo del suscriptor 'procesamiento' del bus de
+        datos, no en el hilo de recepción. Recibe todos los frames que
+        esperaban en la cola, así los mensajes binarios se decodifican en
+        una sola pasada (ver DataHandler.process_batch).
+        
         Args:
-            raw_data: Datos crudos recibidos del dispositivo
+            frames: Lista de Frames publicados en el bus de datos
         """
         try:
-            # Procesar los datos recibidos
-            processed_data = self.data_handler.process(raw_data)
+            # Procesar los datos recibidos (y los marcadores de corte)
+            records = self.data_handler.process_batch(frames)
             
-            # Actualizar la interfaz con los datos procesados
-            self.ui.update_data_display(processed_data)
+            # Encolar para la interfaz (se dibuja en el hilo principal)
+            for processed_data in records:
+                self.ui.enqueue_data_display(processed_data)
             
-            logger.debug(f"Datos procesados: {processed_data}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Datos procesados: {len(records)} registros")
             
         except Exception as e:
             logger.error(f"Error al procesar datos: {e}")
-            self.ui.show_error(f"Error procesando datos: {str(e)}")
+            self.ui.root.after(0, self.ui.show_error, f"Error procesando datos: {str(e)}")
     
     def _on_connection_change(self, connected, device_info=None):
         """
@@ -94,13 +153,41 @@ class BluetoothApp:
             connected: True si está conectado, False si está desconectado
             device_info: Información del dispositivo conectado
         """
-        self.ui.update_connection_status(connected, device_info)
+        self.ui.root.after(0, self.ui.update_connection_status, connected, device_info)
         
         if connected:
             logger.info(f"Conectado a dispositivo: {device_info}")
+            self.device_registry.remember(
+                device_info['address'], device_info['port'], device_info.get('name')
+            )
         else:
             logger.info("Desconectado del dispositivo")
     
+    def _on_reconnect_attempt(self, attempt, delay):
+        """
+        Callback ejecutado antes de cada reintento de reconexión.
+        
+        Args:
+            attempt: Número de intento
+            delay: Segundos de espera antes del intento
+        """
+        self.ui.root.after(0, self.ui.show_reconnecting, attempt, delay)
+    
+    def _on_session_change(self, device_address, connected):
+        """
+        Callback ejecutado al abrir o cerrar una sesión simultánea.
+        
+        Args:
+            device_address: Dirección MAC del dispositivo
+            connected: True si la sesión se abrió, False si se cerró
+        """
+        self.ui.root.after(0, self.ui.update_sessions_status)
+        
+        if connected:
+            logger.info(f"Sesión simultánea abierta: {device_address}")
+        else:
+            logger.info(f"Sesión simultánea cerrada: {device_address}")
+    
     def run(self):
         """Inicia el loop principal de la aplicación."""
         logger.info("Iniciando interfaz gráfica")
@@ -109,7 +196,20 @@ class BluetoothApp:
     def cleanup(self):
         """Limpia recursos antes de cerrar la aplicación."""
         logger.info("Cerrando aplicación")
+        self.bluetooth_manager.stop_discovery()
+        self.bluetooth_manager.stop_replay()
         self.bluetooth_manager.disconnect()
+        self.ui.stop_capture()
+        self.bluetooth_manager.sessions.close_all()
+        
+        for name, stats in self.bluetooth_manager.data_bus.get_stats().items():
+            logger.info(f"Suscriptor '{name}': {stats['processed']} frames procesados, "
+                        f"{stats['dropped']} descartados")
+        self.bluetooth_manager.data_bus.close()
+        
+        send_stats = self.bluetooth_manager.send_queue.get_stats()
+        logger.info(f"Cola de envío: {send_stats['submitted']} envíos en "
+                    f"{send_stats['batches']} escrituras, {send_stats['rejected']} rechazados")
 
 
 def main():
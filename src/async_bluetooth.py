@@ -0,0 +1,338 @@
+"""
+API asyncio para la comunicación Bluetooth
+"""
+
+import asyncio
+import errno
+import logging
+import os
+import socket
+import time
+from collections import deque
+
+from src.data_bus import Frame
+from src.framing import PassthroughFramer
+from src.transport import BluezTransport
+
+logger = logging.getLogger(__name__)
+
+# errno que indican que una operación no bloqueante sigue en curso
+_IN_PROGRESS = (errno.EINPROGRESS, errno.EAGAIN, errno.EWOULDBLOCK)
+
+
+class AsyncConnection:
+    """
+    Conexión RFCOMM no bloqueante atendida por el event loop.
+
+    El socket se registra en el loop con add_reader(); los frames
+    completos se acumulan en una cola acotada. Si el consumidor no da
+    abasto, se deja de leer el socket hasta que la cola se vacíe a la
+    mitad, en lugar de crecer sin límite.
+
+    Se puede iterar con "async for frame in conexion".
+    """
+
+    def __init__(self, sock, address, port, framer, recv_size=4096, queue_size=1000):
+        """
+        Args:
+            sock: Socket ya conectado y en modo no bloqueante
+            address: Dirección MAC del dispositivo
+            port: Puerto RFCOMM
+            framer: Reensamblador de mensajes de esta conexión
+            recv_size: Máximo de bytes por lectura
+            queue_size: Máximo de frames en espera de ser consumidos
+        """
+        self.socket = sock
+        self.address = address
+        self.port = port
+        self.framer = framer
+        self.recv_size = recv_size
+
+        self._loop = asyncio.get_running_loop()
+        self._fd = sock.fileno()
+        self._frames = deque()
+        self._queue_size = queue_size
+        self._ready = asyncio.Event()
+        self._paused = False
+        self._error = None
+        self.closed = False
+
+        self._loop.add_reader(self._fd, self._on_readable)
+
+    def _on_readable(self):
+        """Lee lo disponible en el socket (se ejecuta en el event loop)."""
+        try:
+            data = self.socket.recv(self.recv_size)
+        except OSError as e:
+            if getattr(e, 'errno', None) in _IN_PROGRESS:
+                return
+            logger.error(f"Error de recepción en {self.address}: {e}")
+            self._finish(e)
+            return
+
+        if not data:
+            logger.warning(f"Conexión con {self.address} cerrada por el dispositivo")
+            self._finish(None)
+            return
+
+        frames = self.framer.feed(data)
+        if not frames:
+            return
+
+        t_ns = time.monotonic_ns()
+        self._frames.extend(Frame(bytes(frame), self.address, t_ns) for frame in frames)
+        self._ready.set()
+
+        if len(self._frames) >= self._queue_size and not self._paused:
+            # Contrapresión: dejar de leer hasta que el consumidor avance
+            self._loop.remove_reader(self._fd)
+            self._paused = True
+
+    def _finish(self, error):
+        """Deja de leer y despierta a quien espere frames."""
+        if not self.closed:
+            self._error = error
+            self.closed = True
+            self._loop.remove_reader(self._fd)
+            self._ready.set()
+
+    async def recv_frame(self, timeout=None):
+        """
+        Espera el siguiente frame.
+
+        Args:
+            timeout: Segundos máximos de espera (None = sin límite)
+
+        Returns:
+            Frame: Siguiente frame, o None si la conexión terminó
+
+        Raises:
+            asyncio.TimeoutError: Si no llega ningún frame a tiempo
+            OSError: Si la conexión terminó por un error de socket
+        """
+        if not self._frames and not self.closed:
+            await asyncio.wait_for(self._wait_frames(), timeout)
+
+        if not self._frames:
+            # Conexión terminada y sin frames pendientes
+            if self._error is not None:
+                raise self._error
+            return None
+
+        frame = self._frames.popleft()
+
+        if self._paused and not self.closed and \
+                len(self._frames) <= self._queue_size // 2:
+            self._loop.add_reader(self._fd, self._on_readable)
+            self._paused = False
+
+        return frame
+
+    async def _wait_frames(self):
+        while not self._frames and not self.closed:
+            self._ready.clear()
+            await self._ready.wait()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        frame = await self.recv_frame()
+        if frame is None:
+            raise StopAsyncIteration
+        return frame
+
+    async def send(self, data, timeout=None):
+        """
+        Envía datos al dispositivo.
+
+        Args:
+            data: Datos a enviar (string o bytes)
+            timeout: Segundos máximos para completar el envío
+
+        Raises:
+            asyncio.TimeoutError: Si el envío no se completa a tiempo
+            OSError: Si falla el socket
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        await asyncio.wait_for(self._send_all(bytes(data)), timeout)
+
+    async def _send_all(self, data):
+        while data:
+            if self.closed:
+                raise ConnectionError(f"Conexión con {self.address} cerrada")
+            try:
+                sent = self.socket.send(data)
+            except OSError as e:
+                if getattr(e, 'errno', None) not in _IN_PROGRESS:
+                    raise
+                await _wait_writable(self._loop, self._fd)
+                continue
+            data = data[sent:]
+
+    def close(self):
+        """Cierra la conexión."""
+        self._finish(None)
+        try:
+            self.socket.close()
+        except Exception as e:
+            logger.error(f"Error cerrando socket de {self.address}: {e}")
+        logger.info(f"Conexión asíncrona con {self.address} cerrada")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+
+async def _wait_writable(loop, fd):
+    """Espera a que el descriptor admita escritura."""
+    future = loop.create_future()
+    loop.add_writer(fd, lambda: future.done() or future.set_result(None))
+    try:
+        await future
+    finally:
+        loop.remove_writer(fd)
+
+
+class AsyncBluetoothManager:
+    """
+    Versión asyncio de BluetoothManager.
+
+    Las conexiones usan sockets no bloqueantes registrados en el event
+    loop, así un solo loop atiende decenas de enlaces sin un hilo por
+    operación. El escaneo y la búsqueda SDP de PyBluez son bloqueantes
+    por naturaleza y se ejecutan en el executor del loop.
+    """
+
+    def __init__(self, framer_factory=PassthroughFramer, recv_size=4096, queue_size=1000,
+                 transport=None):
+        """
+        Inicializa el gestor asíncrono.
+
+        Args:
+            framer_factory: Función sin argumentos que crea un Framer por conexión
+            recv_size: Máximo de bytes por lectura
+            queue_size: Máximo de frames en espera por conexión
+            transport: Acceso al adaptador (por defecto BluezTransport)
+        """
+        self.transport = transport or BluezTransport()
+        self.framer_factory = framer_factory
+        self.recv_size = recv_size
+        self.queue_size = queue_size
+        self.connections = {}
+
+    async def scan_devices(self, duration=8):
+        """
+        Escanea dispositivos Bluetooth cercanos.
+
+        Args:
+            duration: Duración del escaneo en segundos
+
+        Returns:
+            list: Diccionarios con 'name' y 'address'
+        """
+        loop = asyncio.get_running_loop()
+        nearby_devices = await loop.run_in_executor(
+            None,
+            lambda: self.transport.discover_devices(duration=duration)
+        )
+        return [
+            {'name': name if name else "Dispositivo desconocido", 'address': addr}
+            for addr, name in nearby_devices
+        ]
+
+    async def find_service(self, device_address, timeout=None):
+        """
+        Busca los servicios SDP de un dispositivo.
+
+        Args:
+            device_address: Dirección MAC del dispositivo
+            timeout: Segundos máximos de espera
+
+        Returns:
+            list: Servicios encontrados
+        """
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(None, lambda: self.transport.find_service(device_address)),
+            timeout
+        )
+
+    async def connect(self, device_address, port=1, timeout=10):
+        """
+        Conecta a un dispositivo sin bloquear el event loop.
+
+        Args:
+            device_address: Dirección MAC del dispositivo
+            port: Puerto RFCOMM
+            timeout: Segundos máximos para establecer la conexión
+
+        Returns:
+            AsyncConnection: Conexión establecida
+
+        Raises:
+            asyncio.TimeoutError: Si la conexión no se establece a tiempo
+            OSError: Si la conexión es rechazada o falla
+        """
+        logger.info(f"Conectando (async) a {device_address} en puerto {port}")
+        loop = asyncio.get_running_loop()
+
+        sock = self.transport.create_socket()
+        sock.setblocking(False)
+        try:
+            await asyncio.wait_for(self._connect_socket(loop, sock, device_address, port), timeout)
+        except BaseException:
+            # Incluye CancelledError: no dejar el socket abierto
+            sock.close()
+            raise
+
+        connection = AsyncConnection(
+            sock, device_address, port, self.framer_factory(),
+            recv_size=self.recv_size, queue_size=self.queue_size
+        )
+        self.connections[device_address] = connection
+        logger.info(f"Conectado (async) a {device_address}")
+        return connection
+
+    async def _connect_socket(self, loop, sock, device_address, port):
+        try:
+            sock.connect((device_address, port))
+            return
+        except OSError as e:
+            if getattr(e, 'errno', None) not in _IN_PROGRESS:
+                raise
+
+        await _wait_writable(loop, sock.fileno())
+        error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if error:
+            raise OSError(error, os.strerror(error))
+
+    async def send(self, device_address, data, timeout=None):
+        """
+        Envía datos a un dispositivo conectado.
+
+        Args:
+            device_address: Dirección MAC del dispositivo
+            data: Datos a enviar (string o bytes)
+            timeout: Segundos máximos para completar el envío
+        """
+        await self.connections[device_address].send(data, timeout)
+
+    def disconnect(self, device_address):
+        """
+        Cierra la conexión con un dispositivo.
+
+        Args:
+            device_address: Dirección MAC del dispositivo
+        """
+        connection = self.connections.pop(device_address, None)
+        if connection:
+            connection.close()
+
+    def disconnect_all(self):
+        """Cierra todas las conexiones."""
+        for address in list(self.connections):
+            self.disconnect(address)
@@ -2,11 +2,22 @@
 Módulo para gestionar la comunicación Bluetooth
 """
 
-import bluetooth
+import concurrent.futures
+import copy
 import logging
+import math
+import random
 import threading
 import time
 
+from src.data_bus import DataBus, Frame
+from src.discovery import DiscoveryService
+from src.framing import PassthroughFramer, retain
+from src.replay import CaptureReplay
+from src.send_queue import SendQueue
+from src.session_manager import SessionManager
+from src.transport import BluezTransport
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,18 +28,64 @@ class BluetoothManager:
     Esta clase maneja todo lo relacionado con Bluetooth usando PyBluez.
     """
     
-    def __init__(self):
-        """Inicializa el gestor de Bluetooth."""
+    def __init__(self, recv_size=4096, service_cache=None, transport=None):
+        """
+        Inicializa el gestor de Bluetooth.
+        
+        Args:
+            recv_size: Máximo de bytes por lectura del socket
+            service_cache: ServiceCache para reutilizar búsquedas SDP (opcional)
+            transport: Acceso al adaptador (por defecto BluezTransport; ver
+                SimulatedTransport para pruebas sin hardware)
+        """
+        self.transport = transport or BluezTransport()
         self.socket = None
+        self.service_cache = service_cache
         self.connected = False
         self.current_device = None
         self.receive_thread = None
         self.running = False
+        self._stop_event = threading.Event()
+        
+        # Reconexión automática (ver set_reconnect_policy)
+        self.reconnect_enabled = False
+        self.reconnect_initial_delay = 1.0
+        self.reconnect_max_delay = 30.0
+        self.reconnect_max_attempts = 0
+        
+        # Reensamblador de mensajes entre recv() y el callback de datos
+        self.framer = PassthroughFramer()
+        
+        # Buffer de recepción reutilizable para recv_into()
+        self.recv_size = recv_size
+        self._recv_buffer = bytearray(recv_size)
+        self._recv_view = memoryview(self._recv_buffer)
+        
+        # Bus de datos con múltiples suscriptores
+        self.data_bus = DataBus()
+        
+        # Sesiones adicionales simultáneas, atendidas por un único hilo de E/S
+        self.sessions = SessionManager(
+            self.data_bus,
+            framer_factory=self._new_framer,
+            recv_size=recv_size,
+            transport=self.transport
+        )
+        
+        # Descubrimiento continuo (ver start_discovery)
+        self.discovery = None
+        
+        # Reproducción de capturas grabadas (ver start_replay)
+        self.replay = None
+        
+        # Envíos asíncronos agrupados por un hilo escritor (ver set_send_policy)
+        self.send_queue = SendQueue(self._write)
         
         # Callbacks
         self.data_callback = None
         self.connection_callback = None
         self.scan_callback = None
+        self.reconnect_callback = None
         
         logger.info("BluetoothManager inicializado")
     
@@ -46,12 +103,7 @@ class BluetoothManager:
         
         try:
             # Escanear dispositivos cercanos
-            nearby_devices = bluetooth.discover_devices(
-                duration=duration,
-                lookup_names=True,
-                flush_cache=True,
-                lookup_class=False
-            )
+            nearby_devices = self.transport.discover_devices(duration=duration)
             
             logger.info(f"Escaneo completado. Dispositivos encontrados: {len(nearby_devices)}")
             
@@ -70,31 +122,138 @@ class BluetoothManager:
             logger.error(f"Error durante el escaneo: {e}")
             return []
     
-    def get_device_services(self, device_address):
+    def _find_services(self, device_address, use_cache=True):
+        """
+        Busca los servicios SDP de un dispositivo, usando la caché si hay.
+        
+        Solo se guardan en caché los resultados no vacíos: una búsqueda
+        vacía suele deberse a que el dispositivo está fuera de alcance.
+        
+        Args:
+            device_address: Dirección MAC del dispositivo
+            use_cache: Si False, siempre hace una búsqueda SDP nueva
+            
+        Returns:
+            tuple: (servicios, desde_cache)
+        """
+        if use_cache and self.service_cache:
+            services = self.service_cache.get(device_address)
+            if services is not None:
+                logger.info(f"Servicios de {device_address} obtenidos de la caché")
+                return services, True
+        
+        services = self.transport.find_service(device_address)
+        if services and self.service_cache:
+            self.service_cache.put(device_address, services)
+        return services, False
+    
+    def start_discovery(self, callback, window=2, stale_after=60):
+        """
+        Inicia el descubrimiento continuo de dispositivos en segundo plano.
+        
+        En lugar de un escaneo largo que devuelve la lista completa, se
+        repiten ventanas cortas y se notifican solo los cambios
+        ('added', 'changed', 'removed'; ver DiscoveryService).
+        
+        Args:
+            callback: Función (evento, dispositivo) a llamar en cada cambio
+            window: Duración de cada ventana de búsqueda en segundos
+            stale_after: Segundos sin ver un dispositivo para darlo por ausente
+        """
+        self.stop_discovery()
+        self.discovery = DiscoveryService(callback, window=window, stale_after=stale_after,
+                                          transport=self.transport)
+        self.discovery.start()
+    
+    def stop_discovery(self):
+        """Detiene el descubrimiento continuo si está activo."""
+        if self.discovery:
+            self.discovery.stop()
+            self.discovery = None
+    
+    def start_replay(self, paths, speed=1.0, on_finished=None, **kwargs):
+        """
+        Reproduce capturas grabadas como si llegaran de un dispositivo.
+        
+        Los frames se entregan a los suscriptores del bus y al callback de
+        datos igual que los de una conexión real (ver CaptureReplay).
+        
+        Args:
+            paths: Ruta o lista de rutas de capturas .btcap, en orden
+            speed: Factor de velocidad (1 = tiempo real, 0 = sin esperas)
+            on_finished: Función (estadísticas) a llamar al terminar
+            **kwargs: Ver CaptureReplay
+            
+        Returns:
+            CaptureReplay: Reproducción en curso
+        """
+        self.stop_replay()
+        replay = CaptureReplay(self, paths, speed=speed, on_finished=on_finished, **kwargs)
+        replay.start()
+        self.replay = replay
+        return replay
+    
+    def stop_replay(self):
+        """Detiene la reproducción de capturas si está activa."""
+        if self.replay:
+            self.replay.stop()
+            self.replay = None
+    
+    def get_device_services(self, device_address, use_cache=True):
         """
         Obtiene los servicios disponibles de un dispositivo.
         
         Args:
             device_address: Dirección MAC del dispositivo
+            use_cache: Si False, ignora la caché SDP
             
         Returns:
             list: Lista de servicios disponibles
         """
         try:
-            services = bluetooth.find_service(address=device_address)
+            services, _ = self._find_services(device_address, use_cache)
             logger.info(f"Servicios encontrados para {device_address}: {len(services)}")
             return services
         except Exception as e:
             logger.error(f"Error obteniendo servicios: {e}")
             return []
     
-    def diagnosticar_dispositivo(self, device_address, device_name="Dispositivo"):
+    def get_cached_port(self, device_address):
+        """
+        Obtiene el primer puerto RFCOMM conocido sin hacer búsqueda SDP.
+        
+        Args:
+            device_address: Dirección MAC del dispositivo
+            
+        Returns:
+            int o None: Puerto guardado en la caché, si lo hay
+        """
+        if not self.service_cache:
+            return None
+        
+        for service in self.service_cache.get(device_address) or []:
+            if service.get('port') is not None:
+                return service['port']
+        return None
+    
+    def invalidate_services(self, device_address=None):
+        """
+        Descarta los servicios SDP guardados en caché.
+        
+        Args:
+            device_address: Dirección MAC a descartar (None = todas)
+        """
+        if self.service_cache:
+            self.service_cache.invalidate(device_address)
+    
+    def diagnosticar_dispositivo(self, device_address, device_name="Dispositivo", use_cache=True):
         """
         Diagnostica un dispositivo y retorna información detallada.
         
         Args:
             device_address: Dirección MAC del dispositivo
             device_name: Nombre del dispositivo (opcional)
+            use_cache: Si False, fuerza una búsqueda SDP nueva
             
         Returns:
             dict: Información de diagnóstico con los siguientes campos:
@@ -103,6 +262,7 @@ class BluetoothManager:
                 - puerto_sugerido: int o None - Puerto RFCOMM si está disponible
                 - mensaje: str - Mensaje descriptivo del resultado
                 - detalles: str - Detalles técnicos del diagnóstico
+                - desde_cache: bool - Si los servicios salieron de la caché SDP
         """
         logger.info(f"Iniciando diagnóstico de {device_name} ({device_address})")
         
@@ -111,12 +271,13 @@ class BluetoothManager:
             'servicios': [],
             'puerto_sugerido': None,
             'mensaje': '',
-            'detalles': ''
+            'detalles': '',
+            'desde_cache': False
         }
         
         # PASO 1: Buscar servicios
         try:
-            servicios = bluetooth.find_service(address=device_address)
+            servicios, resultado['desde_cache'] = self._find_services(device_address, use_cache)
             
             if not servicios:
                 resultado['mensaje'] = "❌ NO COMPATIBLE"
@@ -233,13 +394,113 @@ class BluetoothManager:
             logger.error(f"Error en diagnóstico: {e}")
             return resultado
     
-    def connect(self, device_address, port=1):
+    def diagnosticar_dispositivos(self, devices, max_workers=8, timeout=15,
+                                  use_cache=True, callback=None):
+        """
+        Diagnostica varios dispositivos en paralelo.
+        
+        Las búsquedas SDP se reparten en un pool acotado de hilos, así el
+        escaneo completo tarda aproximadamente lo que la búsqueda más lenta
+        y no la suma de todas.
+        
+        Una búsqueda SDP de PyBluez no se puede cancelar: si un dispositivo
+        supera 'timeout' se reporta como tiempo agotado y su hilo se
+        abandona hasta que la búsqueda termine por sí sola. Como esos hilos
+        siguen ocupando el pool, además hay un límite global de
+        ceil(dispositivos / max_workers) * timeout: al alcanzarlo, todos los
+        dispositivos sin resultado (incluidos los que seguían en cola) se
+        reportan como tiempo agotado.
+        
+        Args:
+            devices: Lista de diccionarios con 'address' y 'name'
+            max_workers: Máximo de búsquedas SDP simultáneas
+            timeout: Segundos máximos por dispositivo, contados desde que
+                empieza su búsqueda
+            use_cache: Si False, fuerza búsquedas SDP nuevas
+            callback: Función (resultado) a llamar con cada resultado en
+                cuanto está listo; se ejecuta en el hilo que llama
+            
+        Returns:
+            list: Tabla de compatibilidad, un resultado por dispositivo en
+                el orden de 'devices'. Cada resultado tiene los campos de
+                diagnosticar_dispositivo() más 'address', 'name' y
+                'duracion' (segundos)
+        """
+        logger.info(f"Iniciando diagnóstico de {len(devices)} dispositivos "
+                    f"({max_workers} en paralelo)")
+        
+        started = {}
+        submitted = time.monotonic()
+        deadline = submitted + math.ceil(len(devices) / max(1, max_workers)) * timeout
+        
+        def diagnose(device):
+            started[device['address']] = time.monotonic()
+            return self.diagnosticar_dispositivo(device['address'], device['name'], use_cache)
+        
+        def report(device, resultado):
+            resultado['address'] = device['address']
+            resultado['name'] = device['name']
+            resultado['duracion'] = time.monotonic() - started.get(device['address'], submitted)
+            resultados[device['address']] = resultado
+            if callback:
+                try:
+                    callback(resultado)
+                except Exception as e:
+                    logger.error(f"Error en callback de diagnóstico: {e}")
+        
+        def report_timeout(device):
+            logger.warning(f"Diagnóstico de {device['address']} sin respuesta tras {timeout}s")
+            report(device, {
+                'compatible': False,
+                'servicios': [],
+                'puerto_sugerido': None,
+                'mensaje': "⏱️ TIEMPO AGOTADO",
+                'detalles': (
+                    f"{device['name']} no respondió a la búsqueda SDP "
+                    f"en {timeout} segundos."
+                ),
+                'desde_cache': False
+            })
+        
+        resultados = {}
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='diagnostico'
+        )
+        try:
+            pending = {executor.submit(diagnose, device): device for device in devices}
+            
+            while pending:
+                done, _ = concurrent.futures.wait(
+                    pending, timeout=0.5, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    report(pending.pop(future), future.result())
+                
+                # Dispositivos cuya búsqueda ya empezó y superó el límite; al
+                # vencer el límite global, todos los que quedan (si el pool
+                # está ocupado por búsquedas colgadas, los de la cola nunca
+                # empezarían)
+                now = time.monotonic()
+                for future, device in list(pending.items()):
+                    start = started.get(device['address'])
+                    if now >= deadline or (start is not None and now - start > timeout):
+                        del pending[future]
+                        report_timeout(device)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        compatibles = sum(1 for r in resultados.values() if r['compatible'])
+        logger.info(f"Diagnóstico múltiple finalizado: {compatibles}/{len(devices)} compatibles")
+        return [resultados[device['address']] for device in devices]
+    
+    def connect(self, device_address, port=1, device_name=None):
         """
         Conecta a un dispositivo Bluetooth específico.
         
         Args:
             device_address: Dirección MAC del dispositivo
             port: Puerto RFCOMM (por defecto 1)
+            device_name: Nombre del dispositivo (opcional, para el registro)
             
         Returns:
             bool: True si la conexión fue exitosa, False en caso contrario
@@ -248,7 +509,7 @@ class BluetoothManager:
             logger.info(f"Intentando conectar a {device_address} en puerto {port}")
             
             # Crear socket RFCOMM
-            self.socket = bluetooth.BluetoothSocket(bluetooth.RFCOMM)
+            self.socket = self.transport.create_socket()
             
             # Intentar conectar
             self.socket.connect((device_address, port))
@@ -256,11 +517,16 @@ class BluetoothManager:
             self.connected = True
             self.current_device = {
                 'address': device_address,
-                'port': port
+                'port': port,
+                'name': device_name
             }
             
-            # Iniciar hilo de recepción de datos
+            # Descartar restos de mensajes de una conexión anterior
+            self.framer.reset()
+            
+            # Iniciar hilo de recepción de datos y el escritor de envíos
             self._start_receive_thread()
+            self.send_queue.start()
             
             logger.info(f"Conectado exitosamente a {device_address}")
             
@@ -270,7 +536,7 @@ class BluetoothManager:
             
             return True
             
-        except bluetooth.BluetoothError as e:
+        except OSError as e:  # BluetoothError de PyBluez deriva de OSError
             logger.error(f"Error de Bluetooth al conectar: {e}")
             self.connected = False
             return False
@@ -279,19 +545,63 @@ class BluetoothManager:
             self.connected = False
             return False
     
+    def connect_known(self, device_address, port=None, device_name=None):
+        """
+        Conecta a un dispositivo conocido sin escanear.
+        
+        Primero intenta directamente con el puerto guardado (o el de la
+        caché SDP); solo si falla hace una búsqueda SDP nueva para
+        averiguar el puerto RFCOMM actual y reintenta.
+        
+        Args:
+            device_address: Dirección MAC del dispositivo
+            port: Último puerto RFCOMM que funcionó (opcional)
+            device_name: Nombre del dispositivo (opcional)
+            
+        Returns:
+            bool: True si la conexión fue exitosa
+        """
+        port = port or self.get_cached_port(device_address)
+        if port and self.connect(device_address, port, device_name):
+            return True
+        
+        logger.info(f"Conexión directa a {device_address} falló, consultando SDP")
+        try:
+            services, _ = self._find_services(device_address, use_cache=False)
+        except Exception as e:
+            logger.error(f"Error consultando servicios de {device_address}: {e}")
+            return False
+        
+        for service in services:
+            new_port = service.get('port')
+            if new_port is not None and new_port != port:
+                return self.connect(device_address, new_port, device_name)
+        
+        return False
+    
     def disconnect(self):
-        """Desconecta del dispositivo actual."""
-        if self.connected and self.socket:
+        """
+        Desconecta del dispositivo actual.
+        
+        También detiene una reconexión automática en curso.
+        """
+        if (self.connected and self.socket) or self.running:
             try:
                 logger.info("Desconectando dispositivo Bluetooth")
                 
-                # Detener hilo de recepción
+                # Detener hilo de recepción (y la espera entre reintentos)
                 self.running = False
-                if self.receive_thread and self.receive_thread.is_alive():
+                self._stop_event.set()
+                if self.receive_thread and self.receive_thread.is_alive() \
+                        and self.receive_thread is not threading.current_thread():
                     self.receive_thread.join(timeout=2)
                 
+                # Cancelar envíos pendientes
+                self.send_queue.stop()
+                
                 # Cerrar socket
-                self.socket.close()
+                if self.socket:
+                    self.socket.close()
                 self.socket = None
                 self.connected = False
                 
@@ -308,31 +618,73 @@ class BluetoothManager:
         """
         Envía datos al dispositivo conectado.
         
+        Los datos se encolan y los escribe el hilo escritor, así que este
+        método no bloquea. Para saber cuándo se enviaron, o si falló el
+        envío, usar send_data_async().
+        
         Args:
             data: Datos a enviar (string o bytes)
             
         Returns:
-            bool: True si el envío fue exitoso
+            bool: True si los datos se encolaron, False si no hay conexión
+                o la cola de envío está llena
+        """
+        return self.send_data_async(data) is not None
+    
+    def send_data_async(self, data, timeout=0):
+        """
+        Encola datos para enviarlos al dispositivo conectado.
+        
+        Args:
+            data: Datos a enviar (string o bytes)
+            timeout: Segundos máximos de espera si la cola está llena
+                (0 = no esperar)
+            
+        Returns:
+            Future: Se completa con el número de bytes enviados o con la
+                excepción del envío; None si no hay conexión o la cola de
+                envío está llena
         """
         if not self.connected or not self.socket:
             logger.warning("Intento de envío sin conexión activa")
-            return False
+            return None
         
-        try:
-            if isinstance(data, str):
-                data = data.encode('utf-8')
-            
-            self.socket.send(data)
-            logger.debug(f"Datos enviados: {data}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error al enviar datos: {e}")
-            return False
+        return self.send_queue.submit(data, timeout=timeout)
+    
+    def _write(self, data):
+        """
+        Escribe un bloque completo en el socket.
+        
+        Se ejecuta en el hilo escritor de la cola de envío.
+        
+        Args:
+            data: Bytes a enviar
+        """
+        sock = self.socket
+        if not self.connected or sock is None:
+            raise ConnectionError("Sin conexión activa")
+        
+        sock.sendall(data)
+        logger.debug(f"Datos enviados: {len(data)} bytes")
+    
+    def set_send_policy(self, max_size=1000, latency_ms=5, max_batch=4096):
+        """
+        Configura la cola de envío.
+        
+        Args:
+            max_size: Máximo de envíos en espera
+            latency_ms: Milisegundos que se espera a más envíos para
+                agruparlos en una sola escritura
+            max_batch: Máximo de bytes por escritura agrupada
+        """
+        self.send_queue.max_size = max_size
+        self.send_queue.latency = latency_ms / 1000
+        self.send_queue.max_batch = max_batch
     
     def _start_receive_thread(self):
         """Inicia el hilo para recibir datos continuamente."""
         self.running = True
+        self._stop_event.clear()
         self.receive_thread = threading.Thread(target=self._receive_loop, daemon=True)
         self.receive_thread.start()
         logger.info("Hilo de recepción iniciado")
@@ -347,23 +699,26 @@ class BluetoothManager:
         
         while self.running and self.connected:
             try:
-                # Recibir datos (máximo 1024 bytes)
-                data = self.socket.recv(1024)
+                # Recibir datos (máximo recv_size bytes)
+                data = self._read_chunk()
                 
-                if data:
-                    logger.debug(f"Datos recibidos: {data}")
-                    
-                    # Llamar al callback con los datos recibidos
-                    if self.data_callback:
-                        self.data_callback(data)
-                else:
-                    # Si no hay datos, puede que la conexión se haya cerrado
-                    logger.warning("No se recibieron datos, posible desconexión")
-                    time.sleep(0.1)
+                if not data:
+                    # Una lectura vacía es un cierre ordenado del otro extremo:
+                    # se trata igual que un error (reconexión o desconexión)
+                    raise ConnectionResetError("Conexión cerrada por el dispositivo")
+                
+                logger.debug(f"Datos recibidos: {len(data)} bytes")
+                
+                # Reensamblar mensajes y entregarlos al callback
+                frames = self.framer.feed(data)
+                if frames:
+                    self._dispatch_frames(frames)
                     
-            except bluetooth.BluetoothError as e:
+            except OSError as e:  # Incluye BluetoothError de PyBluez
                 if self.running:  # Solo loguear si no estamos cerrando intencionalmente
                     logger.error(f"Error de Bluetooth en recepción: {e}")
+                    if self.reconnect_enabled and self._reconnect():
+                        continue
                     self.disconnect()
                 break
             except Exception as e:
@@ -373,10 +728,237 @@ class BluetoothManager:
         
         logger.info("Loop de recepción finalizado")
     
+    def _reconnect(self):
+        """
+        Reintenta la conexión con la misma dirección y puerto.
+        
+        Se ejecuta en el hilo de recepción tras perder la conexión. Espera
+        entre intentos con backoff exponencial con jitter; el bus de datos
+        y sus suscriptores siguen activos. Al reconectar publica en el bus
+        un Frame de corte (gap_ns) con la duración de la interrupción.
+        
+        Returns:
+            bool: True si se reconectó, False si se agotaron los intentos
+                o se llamó a disconnect()
+        """
+        address = self.current_device['address']
+        port = self.current_device['port']
+        lost_ns = time.monotonic_ns()
+        
+        self.connected = False
+        try:
+            self.socket.close()
+        except Exception:
+            pass
+        
+        if self.connection_callback:
+            self.connection_callback(False, None)
+        
+        delay = self.reconnect_initial_delay
+        attempt = 0
+        
+        while self.running:
+            attempt += 1
+            if self.reconnect_max_attempts and attempt > self.reconnect_max_attempts:
+                logger.warning(f"Reconexión a {address} abandonada tras "
+                               f"{self.reconnect_max_attempts} intentos")
+                return False
+            
+            # Jitter: esperar entre la mitad y el total del retardo actual
+            wait = delay * random.uniform(0.5, 1.0)
+            logger.info(f"Reintento {attempt} de conexión a {address} en {wait:.1f}s")
+            if self.reconnect_callback:
+                self.reconnect_callback(attempt, wait)
+            
+            if self._stop_event.wait(wait):
+                return False
+            
+            try:
+                sock = self.transport.create_socket()
+                sock.connect((address, port))
+            except Exception as e:
+                logger.warning(f"Reintento {attempt} fallido: {e}")
+                delay = min(delay * 2, self.reconnect_max_delay)
+                continue
+            
+            if not self.running:
+                sock.close()
+                return False
+            
+            self.socket = sock
+            self.connected = True
+            self.framer.reset()
+            
+            now_ns = time.monotonic_ns()
+            gap_ns = now_ns - lost_ns
+            logger.info(f"Reconectado a {address} tras {gap_ns / 1e9:.1f}s sin conexión")
+            self.data_bus.publish(Frame(b'', address, now_ns, gap_ns))
+            
+            if self.connection_callback:
+                self.connection_callback(True, self.current_device)
+            return True
+        
+        return False
+    
+    def set_reconnect_policy(self, enabled=True, initial_delay=1.0, max_delay=30.0, max_attempts=0):
+        """
+        Configura la reconexión automática al perder la conexión.
+        
+        Args:
+            enabled: Si True, se reintenta la conexión en lugar de cerrarla
+            initial_delay: Segundos antes del primer reintento
+            max_delay: Máximo de segundos entre reintentos
+            max_attempts: Máximo de reintentos (0 = sin límite)
+        """
+        self.reconnect_enabled = enabled
+        self.reconnect_initial_delay = initial_delay
+        self.reconnect_max_delay = max_delay
+        self.reconnect_max_attempts = max_attempts
+    
+    def set_reconnect_callback(self, callback):
+        """
+        Establece el callback para los reintentos de conexión.
+        
+        Args:
+            callback: Función (intento, segundos_de_espera) a llamar antes
+                de cada reintento
+        """
+        self.reconnect_callback = callback
+    
+    def _read_chunk(self):
+        """
+        Lee el siguiente bloque del socket.
+        
+        Si el socket soporta recv_into(), lee sobre el buffer preasignado y
+        devuelve un memoryview que solo es válido hasta la próxima lectura;
+        si no, recurre a recv().
+        
+        Returns:
+            memoryview o bytes: Datos leídos (vacío si se cerró la conexión)
+        """
+        recv_into = getattr(self.socket, 'recv_into', None)
+        if recv_into is None:
+            return self.socket.recv(self.recv_size)
+        
+        size = recv_into(self._recv_buffer)
+        return self._recv_view[:size]
+    
+    def _dispatch_frames(self, frames):
+        """
+        Entrega un lote de frames completos a los consumidores.
+        
+        Cada frame se publica en el bus de datos como un Frame inmutable
+        (una sola copia compartida por todos los suscriptores) y, si hay
+        un callback de datos, se le pasa directamente.
+        
+        Args:
+            frames: Lista de frames en orden de llegada
+        """
+        if self.data_bus.has_subscribers():
+            source = self.current_device['address'] if self.current_device else None
+            t_ns = time.monotonic_ns()
+            for frame in frames:
+                self.data_bus.publish(Frame(retain(frame), source, t_ns))
+        
+        if self.data_callback:
+            for frame in frames:
+                self.data_callback(frame)
+    
+    def _new_framer(self):
+        """
+        Crea un reensamblador independiente con la configuración actual.
+        
+        Returns:
+            Framer: Copia vacía de self.framer
+        """
+        framer = copy.deepcopy(self.framer)
+        framer.reset()
+        return framer
+    
+    def open_session(self, device_address, port=1):
+        """
+        Abre una conexión adicional, simultánea con las demás.
+        
+        A diferencia de connect(), no reemplaza la conexión actual: cada
+        sesión se identifica por su dirección MAC y sus frames se publican
+        en el bus de datos con esa dirección como origen.
+        
+        Args:
+            device_address: Dirección MAC del dispositivo
+            port: Puerto RFCOMM
+            
+        Returns:
+            bool: True si la sesión quedó abierta
+        """
+        return self.sessions.open(device_address, port)
+    
+    def close_session(self, device_address):
+        """
+        Cierra una sesión abierta con open_session().
+        
+        Args:
+            device_address: Dirección MAC del dispositivo
+        """
+        self.sessions.close(device_address)
+    
+    def get_sessions(self):
+        """
+        Obtiene las sesiones simultáneas activas.
+        
+        Returns:
+            list: Información de cada sesión
+        """
+        return self.sessions.get_sessions()
+    
+    def set_framer(self, framer):
+        """
+        Establece el reensamblador de mensajes del flujo recibido.
+        
+        Args:
+            framer: Instancia de src.framing.Framer (None = sin reensamblar)
+        """
+        self.framer = framer if framer is not None else PassthroughFramer()
+    
+    def subscribe(self, callback, name=None, max_size=10000, policy='drop_oldest', batch=False):
+        """
+        Suscribe un consumidor al bus de datos.
+        
+        El callback recibe cada Frame en su propio hilo, con su propia cola
+        acotada (ver DataBus.subscribe).
+        
+        Args:
+            callback: Función a llamar con cada Frame
+            name: Nombre del suscriptor
+            max_size: Máximo de frames en espera
+            policy: Política de desborde ('block', 'drop_oldest' o 'drop_newest')
+            batch: Si True, el callback recibe listas con todos los Frames
+                pendientes en lugar de uno por llamada
+            
+        Returns:
+            ProcessingPipeline: Suscripción creada
+        """
+        return self.data_bus.subscribe(callback, name=name, max_size=max_size, policy=policy,
+                                       batch=batch)
+    
+    def unsubscribe(self, subscription):
+        """
+        Cancela una suscripción al bus de datos.
+        
+        Args:
+            subscription: Valor retornado por subscribe()
+        """
+        self.data_bus.unsubscribe(subscription)
+    
     def set_data_callback(self, callback):
         """
         Establece el callback para cuando se reciban datos.
         
+        El callback se ejecuta de forma síncrona en el hilo de recepción;
+        para consumidores que puedan tardar usa subscribe(). Los datos
+        pueden llegar como memoryview sobre el buffer de
+        recepción; el callback debe copiarlos con src.framing.retain()
+        si los conserva después de retornar.
+        
         Args:
             callback: Función a llamar cuando lleguen datos
         """
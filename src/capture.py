@@ -0,0 +1,663 @@
+"""
+Módulo para grabar en disco todos los frames recibidos y leer las capturas
+"""
+
+import bisect
+import functools
+import gzip
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+
+from src.data_bus import Frame
+from src.data_handler import _WALL_OFFSET_NS
+
+logger = logging.getLogger(__name__)
+
+# Formato binario (little endian). El archivo empieza con la cabecera y le
+# siguen los frames, cada uno con su cabecera de registro y sus datos. El
+# índice es un archivo aparte con entradas (t_ns, posición) ordenadas.
+BINARY_MAGIC = b'BTCAP\x00\x00\x01'
+INDEX_MAGIC = b'BTIDX\x00\x00\x01'
+_FILE_HEADER = struct.Struct('<8sq')  # Magic, desfase del reloj de pared (ns)
+_RECORD = struct.Struct('<Iq6sH')     # Longitud de los datos, t_ns, MAC, flags
+_INDEX_ENTRY = struct.Struct('<qQ')   # t_ns, posición del registro
+_GAP = struct.Struct('<q')            # Datos de un corte: su duración en ns
+_FLAG_GAP = 0x0001
+_NO_MAC = bytes(6)
+
+
+def encode_text(frame):
+    """
+    Codifica un Frame como línea de texto.
+
+    Formato: "timestamp<TAB>origen<TAB>bytes en hex\\n"; los cortes de
+    conexión se escriben como "timestamp<TAB>origen<TAB># corte N s".
+
+    Args:
+        frame: Frame del bus de datos
+
+    Returns:
+        bytes: Línea codificada
+    """
+    timestamp = datetime.fromtimestamp((frame.t_ns + _WALL_OFFSET_NS) / 1e9).isoformat()
+    if frame.gap_ns:
+        body = f"# corte {frame.gap_ns / 1e9:.3f} s"
+    else:
+        body = bytes(frame.data).hex(' ').upper()
+    return f"{timestamp}\t{frame.source}\t{body}\n".encode('utf-8')
+
+
+@functools.lru_cache(maxsize=64)
+def _pack_mac(source):
+    """Convierte "AA:BB:CC:DD:EE:FF" en 6 bytes (ceros si no es una MAC)."""
+    try:
+        raw = bytes.fromhex(source.replace(':', ''))
+    except (AttributeError, ValueError):
+        return _NO_MAC
+    return raw if len(raw) == 6 else _NO_MAC
+
+
+def _unpack_mac(raw):
+    """Inversa de _pack_mac (None si no había MAC)."""
+    if raw == _NO_MAC:
+        return None
+    return ':'.join(f"{b:02X}" for b in raw)
+
+
+def encode_binary(frame):
+    """
+    Codifica un Frame como registro binario.
+
+    Formato: longitud (uint32), t_ns (int64), MAC de origen (6 bytes),
+    flags (uint16) y los datos. Un corte de conexión lleva el flag de corte
+    y su duración en ns (int64) como datos.
+
+    Args:
+        frame: Frame del bus de datos
+
+    Returns:
+        bytes: Registro codificado
+    """
+    if frame.gap_ns:
+        payload, flags = _GAP.pack(frame.gap_ns), _FLAG_GAP
+    else:
+        payload, flags = bytes(frame.data), 0
+    return _RECORD.pack(len(payload), frame.t_ns, _pack_mac(frame.source), flags) + payload
+
+
+def index_path(path):
+    """
+    Ruta del índice de una captura binaria.
+
+    Args:
+        path: Ruta del archivo de captura
+
+    Returns:
+        str: Ruta del archivo .idx
+    """
+    return os.path.splitext(path)[0] + '.idx'
+
+
+class CaptureWriter:
+    """
+    Grabación continua de los frames del bus de datos.
+
+    Se suscribe al bus como un consumidor más: la escritura ocurre en el
+    hilo de su suscripción, nunca en el de recepción, y si el disco no da
+    abasto se descartan los frames más antiguos de su cola en lugar de
+    crecer en memoria.
+
+    Los frames se escriben en un archivo con buffer grande. Un hilo
+    auxiliar vacía el buffer cada flush_interval segundos y hace fsync
+    cada fsync_interval segundos, así el costo de fsync se reparte entre
+    muchos frames. El archivo rota al superar max_bytes o max_seconds y,
+    opcionalmente, se comprime con gzip.
+    """
+
+    EXTENSION = '.log'
+
+    # Nivel de gzip: prima la velocidad, la captura no debe quedarse atrás
+    COMPRESS_LEVEL = 1
+
+    def __init__(self, directory='capturas', prefix='captura', max_bytes=64 * 1024 * 1024,
+                 max_seconds=3600, compress=False, flush_interval=1.0, fsync_interval=5.0,
+                 buffer_size=1024 * 1024, max_queue=100000, encoder=encode_text):
+        """
+        Inicializa la grabación.
+
+        Args:
+            directory: Carpeta donde se crean los archivos
+            prefix: Prefijo del nombre de cada archivo
+            max_bytes: Bytes por archivo antes de rotar (0 = sin límite)
+            max_seconds: Segundos por archivo antes de rotar (0 = sin límite)
+            compress: Si True, los archivos se escriben comprimidos con gzip
+            flush_interval: Segundos máximos que un frame espera en el buffer
+            fsync_interval: Segundos entre fsync (0 = no forzar fsync)
+            buffer_size: Bytes del buffer de escritura
+            max_queue: Máximo de frames en espera de ser escritos
+            encoder: Función (Frame) -> bytes que da el formato de cada frame
+        """
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.buffer_size = buffer_size
+        self.max_queue = max_queue
+        self.encoder = encoder
+
+        self.manager = None
+        self._subscription = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._flush_thread = None
+
+        self._raw = None      # Archivo en disco
+        self._file = None     # Archivo donde se escribe (gzip o el mismo _raw)
+        self._opened_at = 0
+        self._file_bytes = 0
+        self._dirty = False
+        self._last_fsync = 0
+        self.current_path = None
+
+        # Contadores
+        self.frames = 0
+        self.bytes_written = 0
+        self.files = 0
+        self.dropped = 0  # De suscripciones ya terminadas
+
+    def start(self, manager):
+        """
+        Empieza a grabar los frames del bus de un BluetoothManager.
+
+        Args:
+            manager: BluetoothManager cuyos frames se graban
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            self._open_file()
+
+        self._stop_event.clear()
+        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flush_thread.start()
+
+        self.manager = manager
+        self._subscription = manager.subscribe(
+            self.write, name='captura', max_size=self.max_queue, policy='drop_oldest'
+        )
+        logger.info(f"Captura iniciada en {self.current_path}")
+
+    def stop(self):
+        """Deja de grabar, escribe lo pendiente y cierra el archivo."""
+        if self._subscription:
+            # Cancelar la suscripción procesa antes los frames en cola
+            self.manager.unsubscribe(self._subscription)
+            self.dropped += self._subscription.get_stats()['dropped']
+            self._subscription = None
+
+        self._stop_event.set()
+        if self._flush_thread and self._flush_thread.is_alive():
+            self._flush_thread.join(timeout=2)
+
+        with self._lock:
+            self._close_file()
+        logger.info(f"Captura detenida: {self.frames} frames, "
+                    f"{self.bytes_written / 1e6:.1f} MB en {self.files} archivo(s)")
+
+    def write(self, frame):
+        """
+        Graba un frame.
+
+        Se llama desde el hilo de la suscripción al bus.
+
+        Args:
+            frame: Frame del bus de datos
+        """
+        data = self.encoder(frame)
+
+        with self._lock:
+            if self._file is None:
+                return
+            if self._should_rotate():
+                self._close_file()
+                self._open_file()
+            self._append(frame, data)
+
+        self.frames += 1
+        self.bytes_written += len(data)
+
+    def get_stats(self):
+        """
+        Obtiene los contadores de la grabación.
+
+        Returns:
+            dict: Frames y bytes escritos, archivos creados, archivo actual
+                y frames descartados por falta de espacio en la cola
+        """
+        stats = self._subscription.get_stats() if self._subscription else {}
+        return {
+            'frames': self.frames,
+            'bytes_written': self.bytes_written,
+            'files': self.files,
+            'current_path': self.current_path,
+            'dropped': self.dropped + stats.get('dropped', 0),
+        }
+
+    def _append(self, frame, data):
+        """Escribe un frame ya codificado (con el lock tomado)."""
+        self._file.write(data)
+        self._file_bytes += len(data)
+        self._dirty = True
+
+    def _should_rotate(self):
+        """Indica si el archivo actual ya alcanzó su límite (con el lock tomado)."""
+        if self.max_bytes and self._file_bytes >= self.max_bytes:
+            return True
+        return bool(self.max_seconds and time.monotonic() - self._opened_at >= self.max_seconds)
+
+    def _open_file(self):
+        """Abre un archivo nuevo (con el lock tomado)."""
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        extension = self.EXTENSION + ('.gz' if self.compress else '')
+
+        # Dos grabaciones iniciadas en el mismo segundo generan el mismo
+        # nombre: se crea el archivo en modo exclusivo y, si ya existe, se
+        # prueba con el número siguiente en lugar de escribir dentro de él
+        number = self.files
+        while True:
+            path = os.path.join(self.directory, f"{self.prefix}_{stamp}_{number:03d}{extension}")
+            try:
+                self._raw = open(path, 'xb', buffering=self.buffer_size)
+                break
+            except FileExistsError:
+                number += 1
+
+        self._file = gzip.GzipFile(fileobj=self._raw, mode='wb',
+                                   compresslevel=self.COMPRESS_LEVEL) if self.compress else self._raw
+        self._opened_at = time.monotonic()
+        self._file_bytes = 0
+        self._last_fsync = self._opened_at
+        self.current_path = path
+        self.files += 1
+        logger.info(f"Archivo de captura abierto: {path}")
+
+    def _close_file(self):
+        """Cierra el archivo actual (con el lock tomado)."""
+        if self._file is None:
+            return
+        try:
+            if self._file is not self._raw:
+                self._file.close()  # Escribe el final del stream gzip
+            self._raw.flush()
+            os.fsync(self._raw.fileno())
+            self._raw.close()
+        except OSError as e:
+            logger.error(f"Error cerrando archivo de captura: {e}")
+        self._file = None
+        self._raw = None
+        self._dirty = False
+
+    def _flush(self):
+        """
+        Vacía el buffer al sistema operativo y, si toca, hace fsync (con el
+        lock tomado).
+        """
+        if self._file is None or not self._dirty:
+            return
+
+        # En gzip, flush() cierra el bloque comprimido actual: lo escrito
+        # hasta aquí se puede descomprimir aunque el proceso se interrumpa
+        self._file.flush()
+        if self._file is not self._raw:
+            self._raw.flush()
+        self._dirty = False
+
+        now = time.monotonic()
+        if self.fsync_interval and now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._raw.fileno())
+            self._last_fsync = now
+
+    def _flush_loop(self):
+        """
+        Vacía el buffer periódicamente.
+
+        Este método se ejecuta en un hilo separado.
+        """
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                with self._lock:
+                    self._flush()
+            except OSError as e:
+                logger.error(f"Error vaciando archivo de captura: {e}")
+
+
+class BinaryCaptureWriter(CaptureWriter):
+    """
+    Grabación en formato binario con índice de tiempos.
+
+    Cada frame se escribe con encode_binary(). Cada index_interval frames
+    se agrega al índice (archivo .idx junto a la captura) una entrada con
+    el t_ns y la posición del registro, así CaptureReader encuentra
+    cualquier instante con una búsqueda binaria sobre el índice y luego
+    lee a lo sumo index_interval registros.
+
+    El índice se vacía siempre después de los datos, de modo que sus
+    entradas nunca apuntan a registros que aún no están en el archivo.
+    El formato binario no admite compresión: se lee con mmap.
+    """
+
+    EXTENSION = '.btcap'
+
+    def __init__(self, directory='capturas', prefix='captura', index_interval=64, **kwargs):
+        """
+        Inicializa la grabación.
+
+        Args:
+            directory: Carpeta donde se crean los archivos
+            prefix: Prefijo del nombre de cada archivo
+            index_interval: Frames entre entradas del índice
+            **kwargs: Ver CaptureWriter (salvo compress y encoder)
+        """
+        if kwargs.get('compress'):
+            raise ValueError("El formato binario no admite compresión")
+        kwargs['encoder'] = encode_binary
+        super().__init__(directory, prefix, **kwargs)
+
+        self.index_interval = max(1, index_interval)
+        self._index = None
+        self._file_frames = 0
+        self._max_t_ns = 0
+
+    def _open_file(self):
+        """Abre un archivo nuevo y su índice (con el lock tomado)."""
+        super()._open_file()
+        self._file.write(_FILE_HEADER.pack(BINARY_MAGIC, _WALL_OFFSET_NS))
+        self._file_bytes = _FILE_HEADER.size
+        self._dirty = True
+
+        self._index = open(index_path(self.current_path), 'wb', buffering=64 * 1024)
+        self._index.write(INDEX_MAGIC)
+        self._file_frames = 0
+
+    def _append(self, frame, data):
+        """Escribe un frame y, si toca, su entrada del índice (con el lock tomado)."""
+        # Frames de distintos hilos pueden llegar con t_ns apenas
+        # desordenados: el índice guarda el máximo para seguir ordenado
+        self._max_t_ns = max(self._max_t_ns, frame.t_ns)
+        if self._file_frames % self.index_interval == 0:
+            self._index.write(_INDEX_ENTRY.pack(self._max_t_ns, self._file_bytes))
+        self._file_frames += 1
+        super()._append(frame, data)
+
+    def _close_file(self):
+        """Cierra el archivo actual y su índice (con el lock tomado)."""
+        super()._close_file()
+        if self._index is not None:
+            try:
+                self._index.close()
+            except OSError as e:
+                logger.error(f"Error cerrando índice de captura: {e}")
+            self._index = None
+
+    def _flush(self):
+        """Vacía datos e índice, en ese orden (con el lock tomado)."""
+        dirty = self._dirty
+        super()._flush()
+        if dirty and self._index is not None:
+            self._index.flush()
+
+
+class _IndexKeys:
+    """
+    Los t_ns de un índice vistos como secuencia, para usar bisect sobre el
+    archivo mapeado sin cargarlo en memoria.
+    """
+
+    def __init__(self, buffer, count):
+        self.buffer = buffer
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return _INDEX_ENTRY.unpack_from(self.buffer, len(INDEX_MAGIC) + i * _INDEX_ENTRY.size)[0]
+
+    def offset(self, i):
+        """Posición en la captura del registro de la entrada i."""
+        return _INDEX_ENTRY.unpack_from(self.buffer, len(INDEX_MAGIC) + i * _INDEX_ENTRY.size)[1]
+
+
+class CaptureReader:
+    """
+    Lectura de capturas binarias (ver BinaryCaptureWriter).
+
+    La captura y su índice se abren con mmap: abrir un archivo de varios GB
+    no lee nada más que la cabecera, y el sistema operativo solo carga las
+    páginas que se recorren. read_range() busca el inicio con bisect sobre
+    el índice (O(log n)) y lee desde ahí.
+
+    Si falta el índice (por ejemplo, la grabación se interrumpió antes de
+    vaciarlo) se reconstruye en memoria recorriendo la captura una vez.
+    Un registro incompleto al final del archivo se ignora.
+
+        with CaptureReader("capturas/captura_20240101_120000_000.btcap") as capture:
+            start, end = capture.time_range()
+            for frame in capture.read_range(start, start + 10 * 10**9):
+                ...
+    """
+
+    def __init__(self, path):
+        """
+        Abre una captura binaria.
+
+        Args:
+            path: Ruta del archivo .btcap
+
+        Raises:
+            ValueError: Si el archivo no es una captura binaria
+            OSError: Si no se puede abrir el archivo
+        """
+        self.path = path
+        self._index_file = None
+        self._index_map = None
+
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        if self.size < _FILE_HEADER.size:
+            self._file.close()
+            raise ValueError(f"{path} está vacío o incompleto")
+
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.wall_offset_ns = _FILE_HEADER.unpack_from(self._map, 0)
+        if magic != BINARY_MAGIC:
+            self.close()
+            raise ValueError(f"{path} no es una captura binaria")
+
+        self._index_keys = None
+
+    @property
+    def _index(self):
+        """Índice de tiempos; se abre (o reconstruye) la primera vez que se usa."""
+        if self._index_keys is None:
+            self._index_keys = self._open_index() or self._build_index()
+        return self._index_keys
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        return self.read_range()
+
+    def close(self):
+        """Libera los mapeos y cierra los archivos."""
+        for resource in (self._index_map, self._index_file, self._map, self._file):
+            if resource is not None:
+                resource.close()
+        self._index_map = self._index_file = self._map = None
+
+    def _open_index(self):
+        """
+        Mapea el índice del archivo .idx.
+
+        Returns:
+            _IndexKeys: Índice, o None si falta o no es válido
+        """
+        try:
+            self._index_file = open(index_path(self.path), 'rb')
+        except OSError:
+            return None
+
+        size = os.fstat(self._index_file.fileno()).st_size
+        count = (size - len(INDEX_MAGIC)) // _INDEX_ENTRY.size
+        if count <= 0:
+            self._index_file.close()
+            self._index_file = None
+            return None
+
+        self._index_map = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._index_map[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            logger.warning(f"Índice no válido para {self.path}, se reconstruye")
+            self._index_map.close()
+            self._index_file.close()
+            self._index_map = self._index_file = None
+            return None
+
+        index = _IndexKeys(self._index_map, count)
+        # Descartar entradas que apuntan más allá de los datos (corte abrupto)
+        while index.count and index.offset(index.count - 1) >= self.size:
+            index.count -= 1
+        return index
+
+    def _build_index(self, interval=64):
+        """
+        Reconstruye el índice recorriendo la captura.
+
+        Args:
+            interval: Registros entre entradas del índice
+
+        Returns:
+            _IndexKeys: Índice en memoria
+        """
+        logger.warning(f"{self.path} no tiene índice, se reconstruye recorriendo el archivo")
+        buffer = bytearray(INDEX_MAGIC)
+        max_t_ns = 0
+        for n, (offset, t_ns, _, _, _, _) in enumerate(self._records(_FILE_HEADER.size)):
+            max_t_ns = max(max_t_ns, t_ns)
+            if n % interval == 0:
+                buffer += _INDEX_ENTRY.pack(max_t_ns, offset)
+        return _IndexKeys(buffer, (len(buffer) - len(INDEX_MAGIC)) // _INDEX_ENTRY.size)
+
+    def _records(self, offset):
+        """
+        Recorre los registros desde una posición.
+
+        Args:
+            offset: Posición del primer registro
+
+        Yields:
+            tuple: (posición, t_ns, MAC, flags, inicio de datos, fin de datos)
+        """
+        data = self._map
+        while offset + _RECORD.size <= self.size:
+            length, t_ns, mac, flags = _RECORD.unpack_from(data, offset)
+            start = offset + _RECORD.size
+            end = start + length
+            if end > self.size:
+                break  # Registro incompleto
+            yield offset, t_ns, mac, flags, start, end
+            offset = end
+
+    def seek(self, t_ns):
+        """
+        Busca dónde empezar a leer para llegar a un instante.
+
+        Args:
+            t_ns: Instante buscado (reloj monotónico de la captura)
+
+        Returns:
+            int: Posición de un registro anterior o igual al primero con
+                t_ns mayor o igual al buscado
+        """
+        # Primera entrada con t_ns >= buscado; la anterior cubre los
+        # registros entre ambas, donde puede estar el primero que sirve
+        i = bisect.bisect_left(self._index, t_ns)
+        if i == 0:
+            return _FILE_HEADER.size
+        return self._index.offset(i - 1)
+
+    def read_range(self, start_ns=None, end_ns=None):
+        """
+        Lee los frames de un rango de tiempo.
+
+        Args:
+            start_ns: Primer instante incluido (None = desde el principio)
+            end_ns: Último instante incluido (None = hasta el final)
+
+        Yields:
+            Frame: Frames del rango, en el orden en que se grabaron
+        """
+        offset = _FILE_HEADER.size if start_ns is None else self.seek(start_ns)
+        for _, t_ns, mac, flags, start, end in self._records(offset):
+            if start_ns is not None and t_ns < start_ns:
+                continue
+            if end_ns is not None and t_ns > end_ns:
+                break
+            if flags & _FLAG_GAP:
+                yield Frame(b'', _unpack_mac(mac), t_ns, _GAP.unpack_from(self._map, start)[0])
+            else:
+                yield Frame(self._map[start:end], _unpack_mac(mac), t_ns)
+
+    def time_range(self):
+        """
+        Obtiene el primer y el último instante de la captura.
+
+        Solo lee el primer registro y los que siguen a la última entrada
+        del índice.
+
+        Returns:
+            tuple: (t_ns inicial, t_ns final), o (None, None) si está vacía
+        """
+        first = next(self._records(_FILE_HEADER.size), None)
+        if first is None:
+            return None, None
+
+        offset = self._index.offset(len(self._index) - 1) if len(self._index) else first[0]
+        last = first[1]
+        for _, t_ns, _, _, _, _ in self._records(offset):
+            last = max(last, t_ns)
+        return first[1], last
+
+    def to_datetime(self, t_ns):
+        """
+        Convierte un t_ns de la captura a fecha y hora.
+
+        Args:
+            t_ns: Instante en el reloj monotónico de la captura
+
+        Returns:
+            datetime: Fecha y hora locales
+        """
+        return datetime.fromtimestamp((t_ns + self.wall_offset_ns) / 1e9)
+
+    def to_t_ns(self, moment):
+        """
+        Convierte una fecha y hora al reloj monotónico de la captura.
+
+        Args:
+            moment: datetime a convertir
+
+        Returns:
+            int: t_ns equivalente, para read_range()
+        """
+        return int(moment.timestamp() * 1e9) - self.wall_offset_ns
@@ -0,0 +1,323 @@
+"""
+Módulo para guardar los valores numéricos decodificados como series de tiempo
+"""
+
+import logging
+import threading
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo necesita ChannelStore
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+class ChannelStore:
+    """
+    Almacén columnar de series de tiempo: un arreglo NumPy por canal y una
+    columna de timestamps compartida.
+
+    Cada columna es un buffer circular espejado: un arreglo de 2 * capacity
+    donde cada valor se escribe en la posición i y en i + capacity. Así los
+    últimos N valores siempre son un tramo contiguo del arreglo, y
+    window()/times() devuelven vistas sin copiar, listas para graficar,
+    calcular estadísticas o exportar con NumPy. El costo es escribir cada
+    valor dos veces, con asignaciones de bloque en C.
+
+    append_batch() agrega de una vez las columnas que devuelve
+    MessageSchema.decode_batch(); así lo alimenta DataHandler.process_batch()
+    con cada lote del bus de datos. Los valores se guardan como float64; los
+    canales que faltan en una fila o que aparecen más tarde quedan en NaN,
+    y los campos no numéricos (bytes) se ignoran.
+
+    Las vistas apuntan al buffer: reflejan los valores hasta que nuevas
+    filas los sobrescriben. Quien necesite conservarlas debe copiarlas.
+    """
+
+    def __init__(self, capacity=100000, channels=()):
+        """
+        Inicializa el almacén.
+
+        Args:
+            capacity: Filas que se conservan por canal
+            channels: Nombres de canales a crear de antemano (opcional; los
+                demás se crean al llegar)
+
+        Raises:
+            ImportError: Si NumPy no está instalado
+        """
+        if np is None:
+            raise ImportError("ChannelStore necesita NumPy: pip install numpy")
+        if capacity < 1:
+            raise ValueError("La capacidad debe ser mayor que cero")
+
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._t_ns = np.zeros(2 * capacity, dtype=np.int64)
+        self._channels = {}
+        self._ignored = set()
+        self._end = 0    # Próxima posición a escribir, en [0, capacity)
+        self._size = 0
+        self.appended = 0
+
+        for name in channels:
+            self._add_channel(name)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def channels(self):
+        """tuple: Nombres de los canales, en orden de creación."""
+        return tuple(self._channels)
+
+    def _add_channel(self, name):
+        """Crea un canal, vacío (NaN) hasta ahora (con el lock tomado)."""
+        self._channels[name] = np.full(2 * self.capacity, np.nan)
+
+    def _write(self, column, values, count):
+        """
+        Escribe los últimos count valores en una columna, en ambas mitades
+        (con el lock tomado).
+
+        Args:
+            column: Arreglo de 2 * capacity
+            values: Arreglo o escalar a escribir (escalar = mismo valor)
+            count: Filas a escribir (como mucho capacity)
+        """
+        capacity = self.capacity
+        start = self._end
+        first = min(count, capacity - start)  # Hasta el final de la mitad
+
+        head = values if np.isscalar(values) else values[:first]
+        column[start:start + first] = head
+        column[start + capacity:start + capacity + first] = head
+        if first < count:
+            tail = values if np.isscalar(values) else values[first:count]
+            column[:count - first] = tail
+            column[capacity:capacity + count - first] = tail
+
+    def _advance(self, count):
+        """Avanza la posición de escritura (con el lock tomado)."""
+        self._end = (self._end + count) % self.capacity
+        self._size = min(self.capacity, self._size + count)
+        self.appended += count
+
+    def _numeric(self, name, values):
+        """
+        Convierte una columna a float64.
+
+        Returns:
+            ndarray: Valores, o None si el campo no es numérico
+        """
+        if name in self._ignored:
+            return None
+        array = np.asarray(values)
+        if array.dtype.kind not in 'biuf':
+            self._ignored.add(name)
+            logger.info(f"Campo '{name}' no numérico: no se guarda en el almacén de canales")
+            return None
+        return array.astype(np.float64, copy=False)
+
+    def append(self, t_ns, values):
+        """
+        Agrega una fila.
+
+        Args:
+            t_ns: Timestamp de la fila (time.monotonic_ns())
+            values: dict canal -> valor (por ejemplo DataRecord.fields)
+        """
+        with self._lock:
+            end = self._end
+            mirror = end + self.capacity
+            self._t_ns[end] = self._t_ns[mirror] = t_ns
+
+            written = 0
+            for name, value in values.items():
+                if name not in self._channels:
+                    if name in self._ignored or not isinstance(value, (int, float, np.number)):
+                        self._ignored.add(name)
+                        continue
+                    self._add_channel(name)
+                column = self._channels[name]
+                column[end] = column[mirror] = value
+                written += 1
+
+            # Los canales ausentes de la fila quedan en NaN, no con el valor
+            # que ocupaba esta posición hace una vuelta del buffer
+            if written < len(self._channels):
+                for name, column in self._channels.items():
+                    if name not in values:
+                        column[end] = column[mirror] = np.nan
+
+            self._advance(1)
+
+    def append_batch(self, columns):
+        """
+        Agrega un lote de filas en forma vectorizada.
+
+        Args:
+            columns: dict canal -> lista o arreglo de valores, con la
+                columna 't_ns' (el formato de DataHandler.decode_batch())
+
+        Returns:
+            int: Filas agregadas
+        """
+        t_ns = np.asarray(columns['t_ns'], dtype=np.int64)
+        total = len(t_ns)
+        if total == 0:
+            return 0
+
+        # Con más filas que capacidad solo sobreviven las últimas
+        skip = max(0, total - self.capacity)
+        count = total - skip
+
+        arrays = {}
+        for name, values in columns.items():
+            if name == 't_ns':
+                continue
+            array = self._numeric(name, values)
+            if array is None:
+                continue
+            if len(array) != total:
+                raise ValueError(f"La columna '{name}' no tiene {total} valores")
+            arrays[name] = array[skip:]
+
+        with self._lock:
+            self._write(self._t_ns, t_ns[skip:], count)
+            for name, array in arrays.items():
+                if name not in self._channels:
+                    self._add_channel(name)
+                self._write(self._channels[name], array, count)
+
+            for name, column in self._channels.items():
+                if name not in arrays:
+                    self._write(column, np.nan, count)
+
+            self._advance(count)
+
+        return count
+
+    def _span(self, count):
+        """Inicio y fin del tramo contiguo con las últimas count filas (con el lock tomado)."""
+        if count is None or count > self._size:
+            count = self._size
+        end = self._end + self.capacity
+        return end - max(0, count), end
+
+    def times(self, count=None):
+        """
+        Obtiene los últimos timestamps.
+
+        Args:
+            count: Filas a obtener (None = todas)
+
+        Returns:
+            ndarray: Vista de solo lectura, de la más antigua a la más reciente
+        """
+        with self._lock:
+            start, end = self._span(count)
+            return self._read_only(self._t_ns[start:end])
+
+    def window(self, channel, count=None):
+        """
+        Obtiene los últimos valores de un canal, sin copiarlos.
+
+        Args:
+            channel: Nombre del canal
+            count: Filas a obtener (None = todas)
+
+        Returns:
+            ndarray: Vista de solo lectura, alineada con times(count)
+
+        Raises:
+            KeyError: Si el canal no existe
+        """
+        with self._lock:
+            start, end = self._span(count)
+            return self._read_only(self._channels[channel][start:end])
+
+    def window_between(self, start_ns=None, end_ns=None):
+        """
+        Obtiene todas las columnas de un rango de tiempo, sin copiarlas.
+
+        Busca el rango con np.searchsorted, así que supone timestamps en
+        orden creciente (el orden de llegada).
+
+        Args:
+            start_ns: Primer instante incluido (None = desde el principio)
+            end_ns: Último instante incluido (None = hasta el final)
+
+        Returns:
+            dict: 't_ns' y cada canal -> vista de solo lectura
+        """
+        with self._lock:
+            start, end = self._span(None)
+            times = self._t_ns[start:end]
+            first = 0 if start_ns is None else int(np.searchsorted(times, start_ns, 'left'))
+            last = len(times) if end_ns is None else int(np.searchsorted(times, end_ns, 'right'))
+
+            result = {'t_ns': self._read_only(times[first:last])}
+            for name, column in self._channels.items():
+                result[name] = self._read_only(column[start + first:start + last])
+            return result
+
+    @staticmethod
+    def _read_only(view):
+        view.flags.writeable = False
+        return view
+
+    def statistics(self, channel, count=None):
+        """
+        Calcula estadísticas de los últimos valores de un canal.
+
+        Args:
+            channel: Nombre del canal
+            count: Filas a considerar (None = todas)
+
+        Returns:
+            dict: Cantidad de valores, mínimo, máximo, media y desviación
+                estándar (ignorando NaN)
+        """
+        values = self.window(channel, count)
+        valid = values[~np.isnan(values)]
+        if not len(valid):
+            return {'count': 0, 'min': None, 'max': None, 'mean': None, 'std': None}
+        return {
+            'count': len(valid),
+            'min': float(valid.min()),
+            'max': float(valid.max()),
+            'mean': float(valid.mean()),
+            'std': float(valid.std()),
+        }
+
+    def export_csv(self, filepath, count=None):
+        """
+        Exporta las últimas filas a CSV (t_ns y un canal por columna).
+
+        Args:
+            filepath: Ruta del archivo de destino
+            count: Filas a exportar (None = todas)
+        """
+        with self._lock:
+            start, end = self._span(count)
+            names = list(self._channels)
+            # Arreglo estructurado: t_ns sigue siendo int64 (en float64 perdería precisión)
+            dtype = [('t_ns', np.int64)] + [(name, np.float64) for name in names]
+            table = np.empty(end - start, dtype=dtype)
+            table['t_ns'] = self._t_ns[start:end]
+            for name in names:
+                table[name] = self._channels[name][start:end]
+
+        np.savetxt(filepath, table, delimiter=',', header=','.join(['t_ns'] + names),
+                   comments='', fmt=['%d'] + ['%.10g'] * len(names))
+        logger.info(f"Canales exportados a {filepath}: {len(table)} filas")
+
+    def clear(self):
+        """Elimina todas las filas (los canales se conservan)."""
+        with self._lock:
+            self._end = 0
+            self._size = 0
+            for column in self._channels.values():
+                column.fill(np.nan)
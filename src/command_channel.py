@@ -0,0 +1,364 @@
+"""
+Módulo con la capa de comandos petición/respuesta
+"""
+
+import concurrent.futures
+import logging
+import threading
+import time
+from collections import deque
+
+from src.framing import DelimiterFramer
+
+logger = logging.getLogger(__name__)
+
+
+class _Request:
+    """Petición pendiente de respuesta."""
+
+    __slots__ = ('payload', 'request_id', 'future', 'timeout', 'deadline')
+
+    def __init__(self, payload, request_id, timeout):
+        self.payload = payload
+        self.request_id = request_id
+        self.future = concurrent.futures.Future()
+        self.timeout = timeout
+        self.deadline = None  # Se fija al enviarla
+
+
+class CommandChannel:
+    """
+    Envía comandos a la conexión principal y asocia cada respuesta a su
+    petición.
+
+    Hay dos formas de correlación:
+        - Por orden (reply_id=None): el firmware responde en el mismo
+          orden en que recibe los comandos (comandos AT, ELM327). Cada
+          respuesta completa se asigna a la petición más antigua en curso.
+        - Por ID (reply_id=función): cada respuesta lleva un identificador
+          que reply_id() extrae; se asigna a la petición enviada con ese
+          mismo request_id, en cualquier orden.
+
+    Se mantienen hasta max_in_flight peticiones enviadas a la vez; las
+    demás esperan en cola. Con varias en curso, el rendimiento queda
+    limitado por el ancho de banda del enlace y no por la latencia de ida
+    y vuelta de cada comando.
+
+    En correlación por orden, una respuesta que llega después de su
+    timeout se asignaría a la petición siguiente; si el firmware puede
+    responder tarde conviene usar correlación por ID o un timeout amplio.
+
+    Las respuestas llegan por el bus de datos. Si reply_delimiter es None,
+    cada Frame es una respuesta completa (el framing lo hace el
+    BluetoothManager); si no, los bytes se reensamblan aquí hasta el
+    delimitador (por ejemplo b'>' para el prompt de un ELM327).
+    """
+
+    def __init__(self, manager, terminator=b'\r', reply_delimiter=None, reply_id=None,
+                 max_in_flight=1, timeout=2.0, name='comandos', max_queue=10000):
+        """
+        Inicializa el canal y lo suscribe al bus de datos.
+
+        Args:
+            manager: BluetoothManager con la conexión principal
+            terminator: Bytes que se agregan al final de cada comando
+            reply_delimiter: Delimitador de fin de respuesta (None = un Frame
+                por respuesta)
+            reply_id: Función (respuesta) -> ID para correlacionar por ID, o
+                None para correlacionar por orden
+            max_in_flight: Máximo de peticiones enviadas sin respuesta
+            timeout: Segundos por defecto para recibir cada respuesta
+            name: Nombre del suscriptor en el bus (para logs)
+            max_queue: Máximo de frames en espera de ser asignados a una
+                petición; si se llena se descartan los más antiguos
+        """
+        if isinstance(terminator, str):
+            terminator = terminator.encode('utf-8')
+
+        self.manager = manager
+        self.terminator = terminator or b''
+        self.reply_id = reply_id
+        self.max_in_flight = max(1, max_in_flight)
+        self.timeout = timeout
+        self.name = name
+
+        self._framer = DelimiterFramer(reply_delimiter) if reply_delimiter else None
+        self._waiting = deque()                      # Aún sin enviar
+        self._in_flight = {} if reply_id else deque()  # Enviadas sin respuesta
+        # Reentrante: el callback de un envío fallido puede ejecutarse
+        # dentro de _pump() si el Future ya estaba completo
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self.running = True
+
+        # Contadores
+        self.completed = 0
+        self.timeouts = 0
+        self.unmatched = 0
+
+        self._timeout_thread = threading.Thread(
+            target=self._timeout_loop, name=f"{name}-timeouts", daemon=True
+        )
+        self._timeout_thread.start()
+
+        # 'drop_oldest': con 'block' un callback lento o un canal atascado
+        # frenaría el hilo de recepción y toda la conexión. Si se descartan
+        # frames, _on_frame() falla las peticiones en curso en lugar de
+        # asignarles respuestas desalineadas
+        self._subscription = None
+        self._seen_dropped = 0
+        self._subscription = manager.subscribe(self._on_frame, name=name, max_size=max_queue,
+                                               policy='drop_oldest')
+
+    def request(self, command, timeout=None, request_id=None):
+        """
+        Envía un comando sin esperar la respuesta.
+
+        Args:
+            command: Comando (string o bytes), sin el terminador
+            timeout: Segundos para recibir la respuesta, contados desde que
+                se envía el comando (None = el del canal)
+            request_id: ID que identificará la respuesta (solo en
+                correlación por ID)
+
+        Returns:
+            Future: Se completa con los bytes de la respuesta, o con
+                TimeoutError/ConnectionError
+        """
+        if isinstance(command, str):
+            command = command.encode('utf-8')
+        if self.reply_id and request_id is None:
+            raise ValueError("La correlación por ID requiere un request_id")
+
+        request = _Request(bytes(command) + self.terminator, request_id,
+                           self.timeout if timeout is None else timeout)
+
+        with self._lock:
+            if not self.running:
+                request.future.set_exception(ConnectionError("Canal de comandos cerrado"))
+                return request.future
+            self._waiting.append(request)
+            self._pump()
+
+        return request.future
+
+    def query(self, command, timeout=None, request_id=None):
+        """
+        Envía un comando y espera su respuesta.
+
+        Args:
+            command: Comando (string o bytes), sin el terminador
+            timeout: Segundos para recibir la respuesta (None = el del canal)
+            request_id: Ver request()
+
+        Returns:
+            bytes: Respuesta recibida
+
+        Raises:
+            TimeoutError: Si la respuesta no llega a tiempo
+            ConnectionError: Si no hay conexión o el canal se cerró
+        """
+        return self.request(command, timeout, request_id).result()
+
+    def close(self):
+        """Cancela la suscripción y falla las peticiones pendientes."""
+        with self._lock:
+            self.running = False
+            pending = self._take_all()
+            self._changed.notify_all()
+
+        self.manager.unsubscribe(self._subscription)
+        self._fail(pending, ConnectionError("Canal de comandos cerrado"))
+        logger.info(f"Canal de comandos '{self.name}' cerrado")
+
+    def get_stats(self):
+        """
+        Obtiene los contadores del canal.
+
+        Returns:
+            dict: Respuestas recibidas, tiempos agotados, respuestas sin
+                petición y peticiones en curso y en espera
+        """
+        with self._lock:
+            return {
+                'completed': self.completed,
+                'timeouts': self.timeouts,
+                'unmatched': self.unmatched,
+                'in_flight': len(self._in_flight),
+                'waiting': len(self._waiting),
+            }
+
+    def _pump(self):
+        """
+        Envía peticiones en espera mientras haya hueco (con el lock tomado).
+
+        Se envía con el lock tomado para que el orden de envío coincida con
+        el de _in_flight; send_data_async() no bloquea.
+        """
+        while self._waiting and len(self._in_flight) < self.max_in_flight:
+            request = self._waiting.popleft()
+            if request.future.cancelled():
+                continue
+
+            if self.reply_id:
+                if request.request_id in self._in_flight:
+                    self._waiting.appendleft(request)  # Mismo ID aún en curso
+                    break
+                self._in_flight[request.request_id] = request
+            else:
+                self._in_flight.append(request)
+
+            request.deadline = time.monotonic() + request.timeout
+            self._changed.notify()
+            sent = self.manager.send_data_async(request.payload)
+            if sent is None:
+                self._remove_in_flight(request)
+                request.future.set_exception(
+                    ConnectionError("Sin conexión o cola de envío llena")
+                )
+            else:
+                sent.add_done_callback(lambda f, r=request: self._on_sent(f, r))
+
+    def _on_sent(self, send_future, request):
+        """Falla la petición si su envío falló."""
+        error = send_future.exception()
+        if error is None:
+            return
+        with self._lock:
+            if not self._remove_in_flight(request):
+                return
+            self._pump()
+        self._fail([request], error)
+
+    def _remove_in_flight(self, request):
+        """
+        Quita una petición de las que están en curso (con el lock tomado).
+
+        Returns:
+            bool: True si estaba en curso
+        """
+        if self.reply_id:
+            if self._in_flight.get(request.request_id) is request:
+                del self._in_flight[request.request_id]
+                return True
+            return False
+        try:
+            self._in_flight.remove(request)
+            return True
+        except ValueError:
+            return False
+
+    def _take_all(self):
+        """Retira todas las peticiones pendientes (con el lock tomado)."""
+        in_flight = self._in_flight.values() if self.reply_id else self._in_flight
+        pending = list(in_flight) + list(self._waiting)
+        self._in_flight.clear()
+        self._waiting.clear()
+        return pending
+
+    def _fail(self, requests, error):
+        for request in requests:
+            if not request.future.done():
+                request.future.set_exception(error)
+
+    def _on_frame(self, frame):
+        """
+        Procesa un Frame del bus de datos.
+
+        Este método se ejecuta en el hilo de la suscripción.
+        """
+        current = self.manager.current_device
+        if current is None or frame.source != current['address']:
+            return
+
+        if frame.gap_ns:
+            # Las peticiones en curso se perdieron con la conexión
+            self._drop_in_flight(ConnectionError("Conexión interrumpida"))
+            return
+
+        subscription = self._subscription
+        if subscription is not None and subscription.dropped != self._seen_dropped:
+            # La cola se desbordó: alguna respuesta se perdió y las que
+            # siguen ya no corresponden a las peticiones en curso
+            self._seen_dropped = subscription.dropped
+            cancelled = self._drop_in_flight(ConnectionError("Respuestas descartadas por cola llena"))
+            if cancelled:
+                logger.warning(f"Canal de comandos '{self.name}': cola llena, "
+                               f"{cancelled} peticiones en curso canceladas")
+
+        replies = self._framer.feed(frame.data) if self._framer else [frame.data]
+        for reply in replies:
+            self._on_reply(bytes(reply))
+
+    def _drop_in_flight(self, error):
+        """
+        Falla las peticiones en curso y reinicia el reensamblado de
+        respuestas; las que esperan turno se envían a continuación.
+
+        Args:
+            error: Excepción con la que se completan las peticiones
+
+        Returns:
+            int: Peticiones canceladas
+        """
+        with self._lock:
+            lost = list(self._in_flight.values() if self.reply_id else self._in_flight)
+            self._in_flight.clear()
+            self._pump()
+        self._fail(lost, error)
+        if self._framer:
+            self._framer.reset()
+        return len(lost)
+
+    def _on_reply(self, reply):
+        """Asigna una respuesta completa a su petición."""
+        with self._lock:
+            if self.reply_id:
+                try:
+                    request = self._in_flight.pop(self.reply_id(reply), None)
+                except Exception as e:
+                    logger.error(f"Error extrayendo ID de respuesta: {e}")
+                    request = None
+            else:
+                request = self._in_flight.popleft() if self._in_flight else None
+
+            if request is None:
+                self.unmatched += 1
+                logger.debug(f"Respuesta sin petición en '{self.name}': {reply!r}")
+                return
+
+            self.completed += 1
+            self._pump()
+
+        if not request.future.done():
+            request.future.set_result(reply)
+
+    def _timeout_loop(self):
+        """
+        Falla las peticiones en curso cuyo plazo venció.
+
+        Este método se ejecuta en un hilo propio, que duerme hasta el
+        plazo más próximo.
+        """
+        while True:
+            with self._lock:
+                if not self.running:
+                    break
+
+                now = time.monotonic()
+                in_flight = list(self._in_flight.values() if self.reply_id else self._in_flight)
+                expired = [r for r in in_flight if r.deadline <= now]
+
+                if not expired:
+                    deadlines = [r.deadline for r in in_flight]
+                    self._changed.wait(min(deadlines) - now if deadlines else None)
+                    continue
+
+                for request in expired:
+                    self._remove_in_flight(request)
+                self.timeouts += len(expired)
+                self._pump()
+
+            for request in expired:
+                logger.warning(f"Comando sin respuesta en '{self.name}': {request.payload!r}")
+            self._fail(expired, TimeoutError("Tiempo de espera agotado"))
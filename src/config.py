@@ -32,7 +32,43 @@ class Config:
             'color_theme': 'blue',
             'window_size': '800x600',
             'scan_duration': 8,  # Duración del escaneo en segundos
-            'last_device': None  # Último dispositivo conectado
+            'discovery_window': 2,  # Duración de cada ventana del escaneo continuo
+            'discovery_stale_after': 60,  # Segundos sin ver un dispositivo para quitarlo
+            'diagnostic_workers': 8,  # Búsquedas SDP simultáneas en el diagnóstico múltiple
+            'diagnostic_timeout': 15,  # Segundos máximos de diagnóstico por dispositivo
+            'display_fps': 30,  # Refrescos por segundo de la consola de datos
+            'console_max_lines': 5000,  # Máximo de líneas en la consola (0 = sin límite)
+            'history_size': 100,  # Registros que conserva el historial de datos
+            'recv_size': 4096,  # Máximo de bytes por lectura del socket
+            'sdp_cache_ttl': 3600,  # Segundos que se reutilizan los servicios SDP
+            'auto_reconnect': {  # Reconexión con backoff exponencial al perder la conexión
+                'enabled': True,
+                'initial_delay': 1.0,
+                'max_delay': 30.0,
+                'max_attempts': 0  # 0 = sin límite
+            },
+            'send_queue': {  # Envíos agrupados por el hilo escritor
+                'max_size': 1000,  # Envíos en espera antes de rechazar
+                'latency_ms': 5,  # Ventana para agrupar envíos pequeños
+                'max_batch': 4096  # Máximo de bytes por escritura
+            },
+            'capture': {  # Grabación continua de frames (ver src/capture.py)
+                'directory': 'capturas',
+                'format': 'binary',  # binary (.btcap con índice) o text (.log)
+                'max_mb': 64,  # Tamaño de cada archivo antes de rotar
+                'max_minutes': 60,  # Duración de cada archivo antes de rotar
+                'compress': False,  # Comprimir con gzip (solo formato text)
+                'fsync_seconds': 5  # Intervalo entre fsync
+            },
+            'replay_speed': 1,  # Velocidad inicial de reproducción de capturas (0 = máxima)
+            'framing': {'mode': 'none'},  # Reensamblado de mensajes (ver src/framing.py)
+            'protocol': None,  # Esquema de mensajes binarios (ver src/protocol.py)
+            'channel_history': 100000,  # Filas por canal decodificado (requiere NumPy)
+            'processing_queue_size': 10000,  # Frames en espera de procesamiento
+            'overflow_policy': 'drop_oldest',  # block, drop_oldest o drop_newest
+            'last_device': None,  # Último dispositivo conectado
+            'known_devices': {},  # Dispositivos conocidos (ver src/device_registry.py)
+            'auto_connect': True,  # Reconectar al último dispositivo al iniciar
         }
         
         if os.path.exists(self.config_file):
@@ -69,6 +105,16 @@ class Config:
         self.config[key] = value
         self._save_config()
     
+    def update(self, values):
+        """
+        Establece varios valores de configuración y guarda una sola vez.
+        
+        Args:
+            values: Diccionario con las claves y valores a establecer
+        """
+        self.config.update(values)
+        self._save_config()
+    
     def _save_config(self):
         """Guarda la configuración en el archivo."""
         try:
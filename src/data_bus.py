@@ -0,0 +1,113 @@
+"""
+Módulo con el bus de datos publicación/suscripción
+"""
+
+import logging
+import threading
+from collections import namedtuple
+
+from src.pipeline import ProcessingPipeline
+
+logger = logging.getLogger(__name__)
+
+
+# Frame publicado en el bus. Es inmutable, así que el mismo objeto se
+# entrega a todos los suscriptores sin copiarlo.
+#   data:   bytes del frame
+#   source: dirección MAC del dispositivo de origen (o None)
+#   t_ns:   momento de recepción según time.monotonic_ns()
+#   gap_ns: si es distinto de 0, el frame no trae datos sino que marca
+#           un corte de la conexión de gap_ns nanosegundos que termina en t_ns
+Frame = namedtuple('Frame', ['data', 'source', 't_ns', 'gap_ns'], defaults=(0,))
+
+
+class DataBus:
+    """
+    Distribuye los frames recibidos a múltiples suscriptores.
+
+    Cada suscriptor tiene su propia cola acotada y su propio hilo
+    (un ProcessingPipeline), de modo que un consumidor lento, como una
+    exportación a disco, no frena a los demás ni al hilo de recepción.
+    """
+
+    def __init__(self):
+        """Inicializa el bus sin suscriptores."""
+        self._lock = threading.Lock()
+        # Tupla que se reemplaza al suscribir/desuscribir, para que publish()
+        # pueda recorrerla sin tomar el lock
+        self._subscribers = ()
+
+    def subscribe(self, callback, name=None, max_size=10000, policy='drop_oldest', batch=False):
+        """
+        Registra un suscriptor y arranca su hilo.
+
+        Args:
+            callback: Función a llamar con cada Frame (en el hilo del suscriptor)
+            name: Nombre del suscriptor (para logs y estadísticas)
+            max_size: Máximo de frames en espera para este suscriptor
+            policy: Política de desborde (ver ProcessingPipeline)
+            batch: Si True, callback recibe listas de Frames (ver ProcessingPipeline)
+
+        Returns:
+            ProcessingPipeline: Suscripción, para desuscribir o leer estadísticas
+        """
+        name = name or getattr(callback, '__name__', 'suscriptor')
+        subscription = ProcessingPipeline(callback, max_size=max_size, policy=policy, name=name,
+                                          batch=batch)
+        subscription.start()
+
+        with self._lock:
+            self._subscribers = self._subscribers + (subscription,)
+
+        logger.info(f"Suscriptor '{name}' agregado al bus de datos")
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Elimina un suscriptor y detiene su hilo.
+
+        Args:
+            subscription: Valor retornado por subscribe()
+        """
+        with self._lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not subscription)
+
+        subscription.stop()
+        logger.info(f"Suscriptor '{subscription.name}' eliminado del bus de datos")
+
+    def has_subscribers(self):
+        """
+        Verifica si hay suscriptores registrados.
+
+        Returns:
+            bool: True si hay al menos un suscriptor
+        """
+        return bool(self._subscribers)
+
+    def publish(self, frame):
+        """
+        Entrega un frame a todos los suscriptores.
+
+        Args:
+            frame: Frame a publicar
+        """
+        for subscription in self._subscribers:
+            subscription.submit(frame)
+
+    def close(self):
+        """Detiene todos los suscriptores."""
+        with self._lock:
+            subscribers = self._subscribers
+            self._subscribers = ()
+
+        for subscription in subscribers:
+            subscription.stop()
+
+    def get_stats(self):
+        """
+        Obtiene las estadísticas de cada suscriptor.
+
+        Returns:
+            dict: Estadísticas de ProcessingPipeline por nombre de suscriptor
+        """
+        return {s.name: s.get_stats() for s in self._subscribers}
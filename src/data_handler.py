@@ -3,11 +3,152 @@ Módulo para procesar y formatear datos recibidos
 """
 
 import logging
+import time
 from datetime import datetime
 
+from src.framing import retain
+from src.ring_buffer import RingBuffer
+
 logger = logging.getLogger(__name__)
 
 
+def _decode_text(data):
+    """
+    Convierte datos crudos a texto.
+    
+    Args:
+        data: Datos a convertir (bytes o string)
+        
+    Returns:
+        str: Texto decodificado como UTF-8
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data).decode('utf-8', errors='ignore')
+    return str(data)
+
+
+def _to_hex(data):
+    """
+    Convierte datos a representación hexadecimal.
+    
+    Usa bytes.hex(), que formatea todo el bloque en C en lugar de
+    construir un string por byte.
+    
+    Args:
+        data: Datos a convertir
+        
+    Returns:
+        str: Representación hexadecimal
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    elif not isinstance(data, (bytes, bytearray, memoryview)):
+        return ''
+    return bytes(data).hex(' ').upper()
+
+
+# Diferencia entre el reloj de pared y el monotónico, para convertir los
+# timestamps monotónicos de los registros a datetime solo cuando se muestran
+_WALL_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+
+class DataRecord:
+    """
+    Registro compacto de datos procesados.
+    
+    Solo guarda una referencia a los bytes crudos y un timestamp
+    monotónico en nanosegundos; usa __slots__ para evitar el diccionario
+    por instancia. 'text' y 'hex' se calculan la primera vez que se
+    consultan y quedan guardados en el registro. Si el DataHandler tiene
+    un esquema binario, 'fields' guarda los campos decodificados y 'text'
+    los muestra como "campo=valor".
+    
+    Mantiene el acceso estilo diccionario (registro['text'],
+    registro.get('hex')) para el código que trabajaba con los dicts
+    anteriores.
+    """
+    
+    __slots__ = ('raw', 't_ns', 'source', 'gap_ns', 'fields', '_text', '_hex')
+    
+    KEYS = ('timestamp', 'raw', 'text', 'length', 'hex', 'source', 'gap_ns', 'fields')
+    
+    def __init__(self, raw, t_ns=None, source=None, gap_ns=0):
+        """
+        Inicializa el registro.
+        
+        Args:
+            raw: Datos crudos (bytes o string)
+            t_ns: Timestamp de time.monotonic_ns() (None = ahora)
+            source: Dirección MAC del dispositivo de origen (opcional)
+            gap_ns: Duración de un corte de conexión que termina en t_ns;
+                distinto de 0 solo en los registros marcadores de corte
+        """
+        self.raw = raw
+        self.t_ns = time.monotonic_ns() if t_ns is None else t_ns
+        self.source = source
+        self.gap_ns = gap_ns
+        self.fields = None
+        self._text = None
+        self._hex = None
+    
+    @property
+    def timestamp(self):
+        """datetime: Momento de recepción en hora local."""
+        return datetime.fromtimestamp((self.t_ns + _WALL_OFFSET_NS) / 1e9)
+    
+    @property
+    def length(self):
+        """int: Tamaño de los datos crudos."""
+        return len(self.raw)
+    
+    @property
+    def text(self):
+        """str: Datos decodificados como texto."""
+        if self._text is None:
+            if self.fields is not None:
+                self._text = ' '.join(f"{name}={value}" for name, value in self.fields.items())
+            else:
+                self._text = _decode_text(self.raw)
+        return self._text
+    
+    @property
+    def hex(self):
+        """str: Representación hexadecimal de los datos."""
+        if self._hex is None:
+            self._hex = _to_hex(self.raw)
+        return self._hex
+    
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __contains__(self, key):
+        return key in self.KEYS
+    
+    def get(self, key, default=None):
+        """Equivalente a dict.get() sobre las claves del registro."""
+        if key not in self.KEYS:
+            return default
+        return getattr(self, key)
+    
+    def keys(self):
+        """Claves disponibles en el registro."""
+        return self.KEYS
+    
+    def to_dict(self):
+        """
+        Convierte el registro al diccionario de claves anterior.
+        
+        Returns:
+            dict: Registro con todas sus claves calculadas
+        """
+        return {key: getattr(self, key) for key in self.KEYS}
+    
+    def __repr__(self):
+        return f"DataRecord(raw={self.raw!r}, t_ns={self.t_ns}, source={self.source!r})"
+
+
 class DataHandler:
     """
     Procesa y formatea los datos recibidos del dispositivo Bluetooth.
@@ -16,74 +157,192 @@ class DataHandler:
     útil para mostrar en la interfaz.
     """
     
-    def __init__(self):
-        """Inicializa el manejador de datos."""
-        self.data_history = []
-        self.max_history = 100  # Máximo de registros a mantener
-        logger.info("DataHandler inicializado")
+    def __init__(self, max_history=100):
+        """
+        Inicializa el manejador de datos.
+        
+        Args:
+            max_history: Máximo de registros a mantener en el historial
+        """
+        self.max_history = max_history
+        self.data_history = RingBuffer(max_history)
+        
+        # Esquema de mensajes binarios (ver set_schema)
+        self.schema = None
+        
+        # Series de tiempo de los campos decodificados (ver set_channel_store)
+        self.channels = None
+        logger.info(f"DataHandler inicializado (historial: {max_history} registros)")
     
-    def process(self, raw_data):
+    def process(self, raw_data, t_ns=None, source=None):
         """
         Procesa datos crudos recibidos del dispositivo.
         
+        El texto y la representación hexadecimal se calculan solo cuando
+        se consultan (ver DataRecord). Con un esquema configurado, los
+        campos del mensaje se decodifican aquí (None si no coincide). Si
+        los datos traen varios mensajes seguidos, todos van al almacén de
+        canales y 'fields' guarda el primero, igual que en process_batch().
+        
         Args:
             raw_data: Datos crudos (bytes o string)
+            t_ns: Momento de recepción según time.monotonic_ns() (None = ahora)
+            source: Dirección MAC del dispositivo de origen (opcional)
             
         Returns:
-            dict: Datos procesados con timestamp y formato
+            DataRecord: Datos procesados con timestamp y formato
         """
         try:
-            # Convertir bytes a string si es necesario
-            if isinstance(raw_data, bytes):
-                data_str = raw_data.decode('utf-8', errors='ignore')
-            else:
-                data_str = str(raw_data)
-            
             # Crear registro de datos procesados
-            processed = {
-                'timestamp': datetime.now(),
-                'raw': raw_data,
-                'text': data_str,
-                'length': len(raw_data),
-                'hex': self._to_hex(raw_data)
-            }
+            # Copiar los datos si llegan como vista del buffer de recepción
+            processed = DataRecord(retain(raw_data), t_ns, source)
+            if self.schema is not None:
+                columns = self.schema.decode_batch([processed.raw], t_ns=[processed.t_ns])
+                if columns['t_ns']:
+                    processed.fields = {name: columns[name][0] for name in self.schema.names}
+                    if self.channels is not None:
+                        self.channels.append_batch(columns)
             
-            # Agregar a historial
+            # Agregar a historial (el buffer circular descarta el más antiguo)
             self.data_history.append(processed)
             
-            # Mantener tamaño máximo del historial
-            if len(self.data_history) > self.max_history:
-                self.data_history.pop(0)
-            
-            logger.debug(f"Datos procesados: {processed['text'][:50]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Datos procesados: {processed['text'][:50]}...")
             
             return processed
             
         except Exception as e:
             logger.error(f"Error procesando datos: {e}")
-            return {
-                'timestamp': datetime.now(),
-                'raw': raw_data,
-                'text': f"Error: {str(e)}",
-                'length': 0,
-                'hex': ''
-            }
+            processed = DataRecord(raw_data, t_ns, source)
+            processed._text = f"Error: {str(e)}"
+            processed._hex = ''
+            return processed
     
-    def _to_hex(self, data):
+    def process_batch(self, frames):
         """
-        Convierte datos a representación hexadecimal.
+        Procesa un lote de frames del bus de datos.
+        
+        Equivale a llamar a process() o mark_gap() con cada frame, pero con
+        un esquema configurado todos los mensajes del lote se decodifican
+        en una sola pasada (decode_batch) y se agregan al almacén de
+        canales de una vez (append_batch). Si un frame trae varios
+        mensajes seguidos, todos van al almacén y 'fields' guarda el
+        primero.
         
         Args:
-            data: Datos a convertir
+            frames: Lista de Frame en orden de llegada
             
         Returns:
-            str: Representación hexadecimal
+            list: DataRecord de cada frame, en el mismo orden
         """
-        if isinstance(data, bytes):
-            return ' '.join([f'{b:02X}' for b in data])
-        elif isinstance(data, str):
-            return ' '.join([f'{ord(c):02X}' for c in data])
-        return ''
+        records = []
+        data_records = []
+        for frame in frames:
+            if frame.gap_ns:
+                records.append(self.mark_gap(frame.gap_ns, t_ns=frame.t_ns, source=frame.source))
+                continue
+            # Copiar los datos si llegan como vista del buffer de recepción
+            record = DataRecord(retain(frame.data), frame.t_ns, frame.source)
+            self.data_history.append(record)
+            records.append(record)
+            data_records.append(record)
+        
+        if self.schema is None or not data_records:
+            return records
+        
+        try:
+            columns = self.schema.decode_batch(
+                [record.raw for record in data_records],
+                t_ns=[record.t_ns for record in data_records],
+                index=True
+            )
+            origins = columns.pop('index')
+            names = self.schema.names
+            for i, values in zip(origins, zip(*(columns[name] for name in names))):
+                record = data_records[i]
+                if record.fields is None:
+                    record.fields = dict(zip(names, values))
+            
+            if self.channels is not None:
+                self.channels.append_batch(columns)
+        except Exception as e:
+            logger.error(f"Error decodificando lote de {len(data_records)} frames: {e}")
+        
+        return records
+    
+    def set_schema(self, schema):
+        """
+        Establece el esquema para decodificar mensajes binarios.
+        
+        Args:
+            schema: MessageSchema (ver src/protocol.py), o None para
+                procesar los datos solo como texto y hex
+        """
+        self.schema = schema
+        if schema is not None:
+            logger.info(f"Esquema de mensajes: {schema.name} ({schema.size} bytes)")
+    
+    def set_channel_store(self, store):
+        """
+        Establece dónde guardar los campos decodificados como series de tiempo.
+        
+        Cada mensaje que el esquema decodifica en process() se agrega como
+        una fila del almacén, además de quedar en el historial.
+        
+        Args:
+            store: ChannelStore (ver src/channel_store.py), o None
+        """
+        self.channels = store
+    
+    def decode_batch(self, frames):
+        """
+        Decodifica un lote de frames con el esquema, en una sola pasada.
+        
+        No modifica el historial ni el almacén de canales (para eso está
+        process_batch()); pensado para analizar lotes grandes (capturas,
+        reproducciones) sin crear un DataRecord por mensaje. El resultado
+        se puede agregar de una vez a un ChannelStore con append_batch().
+        
+        Args:
+            frames: Lista de Frame del bus de datos (los marcadores de
+                corte se ignoran)
+            
+        Returns:
+            dict: Nombre de campo -> lista de valores, más la columna 't_ns'
+            
+        Raises:
+            ValueError: Si no hay un esquema configurado
+        """
+        if self.schema is None:
+            raise ValueError("No hay un esquema de mensajes configurado")
+        
+        frames = [frame for frame in frames if not frame.gap_ns]
+        return self.schema.decode_batch(
+            [frame.data for frame in frames],
+            t_ns=[frame.t_ns for frame in frames]
+        )
+    
+    def mark_gap(self, gap_ns, t_ns=None, source=None):
+        """
+        Registra en el historial un corte de la conexión.
+        
+        Los datos enviados por el dispositivo durante el corte se perdieron;
+        el marcador deja constancia de cuándo y cuánto duró.
+        
+        Args:
+            gap_ns: Duración del corte en nanosegundos
+            t_ns: Momento de la reconexión según time.monotonic_ns() (None = ahora)
+            source: Dirección MAC del dispositivo
+            
+        Returns:
+            DataRecord: Registro marcador del corte
+        """
+        record = DataRecord(b'', t_ns, source, gap_ns)
+        record._text = f"--- Conexión interrumpida {gap_ns / 1e9:.1f} s (datos no recibidos) ---"
+        record._hex = ''
+        self.data_history.append(record)
+        logger.info(f"Corte de conexión registrado: {gap_ns / 1e9:.1f} s")
+        return record
     
     def get_history(self, count=None):
         """
@@ -95,10 +354,7 @@ class DataHandler:
         Returns:
             list: Lista de datos procesados
         """
-        if count is None:
-            return self.data_history
-        else:
-            return self.data_history[-count:]
+        return self.data_history.tail(count)
     
     def clear_history(self):
         """Limpia el historial de datos."""
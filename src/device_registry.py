@@ -0,0 +1,104 @@
+"""
+Módulo con el registro persistente de dispositivos conocidos
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class DeviceRegistry:
+    """
+    Registro de dispositivos con los que ya hubo una conexión exitosa.
+
+    Guarda por dirección MAC el nombre, el último puerto RFCOMM que
+    funcionó y la última vez que se vio el dispositivo, en la clave
+    'known_devices' de config.json. La clave 'last_device' apunta al
+    último dispositivo conectado, para reconectar al iniciar sin escanear.
+    """
+
+    def __init__(self, config):
+        """
+        Inicializa el registro.
+
+        Args:
+            config: Instancia de Config donde se persiste el registro
+        """
+        self.config = config
+        self._lock = threading.Lock()
+        self._devices = dict(config.get('known_devices') or {})
+
+    def remember(self, device_address, port, name=None):
+        """
+        Registra una conexión exitosa con un dispositivo.
+
+        Args:
+            device_address: Dirección MAC del dispositivo
+            port: Puerto RFCOMM con el que se conectó
+            name: Nombre del dispositivo (se conserva el anterior si es None)
+        """
+        with self._lock:
+            previous = self._devices.get(device_address, {})
+            self._devices[device_address] = {
+                'address': device_address,
+                'name': name or previous.get('name') or "Dispositivo desconocido",
+                'port': port,
+                'last_seen': time.time()
+            }
+            devices = dict(self._devices)
+
+        self.config.update({'known_devices': devices, 'last_device': device_address})
+        logger.info(f"Dispositivo registrado: {device_address} (puerto {port})")
+
+    def forget(self, device_address):
+        """
+        Elimina un dispositivo del registro.
+
+        Args:
+            device_address: Dirección MAC del dispositivo
+        """
+        with self._lock:
+            self._devices.pop(device_address, None)
+            devices = dict(self._devices)
+
+        values = {'known_devices': devices}
+        if self.config.get('last_device') == device_address:
+            values['last_device'] = None
+        self.config.update(values)
+
+    def get(self, device_address):
+        """
+        Obtiene la información guardada de un dispositivo.
+
+        Args:
+            device_address: Dirección MAC del dispositivo
+
+        Returns:
+            dict o None: 'address', 'name', 'port' y 'last_seen'
+        """
+        with self._lock:
+            device = self._devices.get(device_address)
+            return dict(device) if device else None
+
+    def get_last(self):
+        """
+        Obtiene el último dispositivo conectado.
+
+        Returns:
+            dict o None: Información del dispositivo (ver get())
+        """
+        last_device = self.config.get('last_device')
+        return self.get(last_device) if last_device else None
+
+    def list_devices(self):
+        """
+        Obtiene todos los dispositivos conocidos.
+
+        Returns:
+            list: Dispositivos ordenados del más al menos reciente
+        """
+        with self._lock:
+            devices = [dict(device) for device in self._devices.values()]
+        return sorted(devices, key=lambda device: device['last_seen'], reverse=True)
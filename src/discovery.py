@@ -0,0 +1,157 @@
+"""
+Módulo para el descubrimiento continuo de dispositivos en segundo plano
+"""
+
+import logging
+import threading
+import time
+
+from src.transport import BluezTransport
+
+logger = logging.getLogger(__name__)
+
+
+class DiscoveryService:
+    """
+    Descubre dispositivos continuamente con ventanas de búsqueda cortas.
+
+    Los resultados de cada ventana se combinan en una caché de
+    dispositivos con la primera y la última vez que se vieron. En lugar
+    de entregar la lista completa, se notifican solo los cambios:
+
+        - 'added':   dispositivo nuevo
+        - 'changed': cambió su nombre
+        - 'removed': no se ve desde hace más de stale_after segundos
+
+    Con ventanas de pocos segundos un dispositivo aparece en cuanto
+    termina la ventana en la que se encontró, sin esperar a un escaneo
+    largo.
+    """
+
+    def __init__(self, callback, window=2, stale_after=60, pause=0.5, transport=None):
+        """
+        Inicializa el servicio de descubrimiento.
+
+        Args:
+            callback: Función (evento, dispositivo) a llamar en cada cambio;
+                se ejecuta en el hilo de descubrimiento
+            window: Duración de cada ventana de búsqueda en segundos
+            stale_after: Segundos sin ver un dispositivo para darlo por ausente
+            pause: Segundos de espera entre ventanas
+            transport: Acceso al adaptador (por defecto BluezTransport)
+        """
+        self.transport = transport or BluezTransport()
+        self.callback = callback
+        self.window = window
+        self.stale_after = stale_after
+        self.pause = pause
+
+        self.devices = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Inicia el descubrimiento en segundo plano."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._discovery_loop, daemon=True)
+        self._thread.start()
+        logger.info(f"Descubrimiento continuo iniciado (ventana: {self.window}s)")
+
+    def stop(self, timeout=None):
+        """
+        Detiene el descubrimiento.
+
+        La ventana en curso no se puede interrumpir; el hilo termina al
+        finalizarla.
+
+        Args:
+            timeout: Segundos máximos de espera (None = no esperar)
+        """
+        self._stop_event.set()
+        if timeout and self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        logger.info("Descubrimiento continuo detenido")
+
+    def is_running(self):
+        """
+        Returns:
+            bool: True si el descubrimiento está activo
+        """
+        return bool(self._thread and self._thread.is_alive() and not self._stop_event.is_set())
+
+    def get_devices(self):
+        """
+        Obtiene los dispositivos actualmente presentes.
+
+        Returns:
+            list: Diccionarios con 'name', 'address', 'first_seen' y 'last_seen'
+        """
+        with self._lock:
+            return [dict(device) for device in self.devices.values()]
+
+    def _discovery_loop(self):
+        """
+        Ejecuta ventanas de búsqueda hasta que se llame a stop().
+
+        Este método se ejecuta en un hilo separado.
+        """
+        while not self._stop_event.is_set():
+            try:
+                nearby_devices = self.transport.discover_devices(duration=self.window)
+            except Exception as e:
+                logger.error(f"Error durante el descubrimiento: {e}")
+                nearby_devices = []
+
+            if self._stop_event.is_set():
+                break
+
+            for event, device in self._merge(nearby_devices):
+                try:
+                    self.callback(event, device)
+                except Exception as e:
+                    logger.error(f"Error en callback de descubrimiento: {e}")
+
+            self._stop_event.wait(self.pause)
+
+    def _merge(self, nearby_devices):
+        """
+        Combina los resultados de una ventana con la caché.
+
+        Args:
+            nearby_devices: Tuplas (dirección, nombre) de la ventana
+
+        Returns:
+            list: Tuplas (evento, dispositivo) con los cambios
+        """
+        now = time.time()
+        events = []
+
+        with self._lock:
+            for addr, name in nearby_devices:
+                device = self.devices.get(addr)
+
+                if device is None:
+                    device = {
+                        'name': name if name else "Dispositivo desconocido",
+                        'address': addr,
+                        'first_seen': now,
+                        'last_seen': now
+                    }
+                    self.devices[addr] = device
+                    events.append(('added', dict(device)))
+                    logger.debug(f"Dispositivo encontrado: {name} - {addr}")
+                else:
+                    device['last_seen'] = now
+                    # Una búsqueda de nombre fallida no borra el nombre conocido
+                    if name and name != device['name']:
+                        device['name'] = name
+                        events.append(('changed', dict(device)))
+
+            for addr in [a for a, d in self.devices.items() if now - d['last_seen'] > self.stale_after]:
+                events.append(('removed', self.devices.pop(addr)))
+                logger.debug(f"Dispositivo ausente: {addr}")
+
+        return events
@@ -0,0 +1,325 @@
+"""
+Módulo para reensamblar mensajes a partir del flujo de bytes recibido
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def retain(data):
+    """
+    Copia datos recibidos para conservarlos más allá del callback.
+
+    Los frames pueden llegar como memoryview sobre el buffer de recepción,
+    que se reutiliza en la siguiente lectura. Quien necesite guardarlos
+    (historial, colas, archivos) debe pasarlos por aquí. Solo se copian
+    bytearray y memoryview; cualquier otro valor (bytes, str, objetos ya
+    inmutables) se devuelve sin cambios.
+
+    Args:
+        data: Datos recibidos
+
+    Returns:
+        Datos inmutables y propios
+    """
+    if isinstance(data, (bytearray, memoryview)):
+        return bytes(data)
+    return data
+
+
+class Framer:
+    """
+    Reensamblador incremental de mensajes (frames).
+
+    Recibe los bloques tal como los entrega socket.recv() y devuelve los
+    mensajes completos que contienen, guardando los bytes sobrantes hasta
+    el siguiente bloque. Trabaja sobre un bytearray reutilizable y busca
+    los límites con memoryview, sin crear copias intermedias. Cada byte se
+    copia dos veces: al agregarse el bloque al buffer y al frame (bytes) que
+    lo contiene; los bytes de un frame incompleto se mueven además al
+    inicio del buffer cada vez que se descarta lo ya consumido.
+
+    Las subclases implementan _extract(view), que recorre los datos
+    pendientes y devuelve la lista de frames y los bytes consumidos.
+    """
+
+    def __init__(self, max_frame_size=65536):
+        """
+        Inicializa el reensamblador.
+
+        Args:
+            max_frame_size: Máximo de bytes pendientes sin completar un
+                frame; al superarlo se descartan para no crecer sin límite
+        """
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray()
+
+    def feed(self, chunk):
+        """
+        Agrega un bloque recibido y extrae los frames completos.
+
+        Args:
+            chunk: Bytes recibidos (bytes, bytearray o memoryview)
+
+        Returns:
+            list: Frames completos (bytes) en orden de llegada
+        """
+        self._buffer += chunk
+
+        with memoryview(self._buffer) as view:
+            frames, consumed = self._extract(view)
+
+        if consumed:
+            del self._buffer[:consumed]
+
+        if len(self._buffer) > self.max_frame_size:
+            logger.warning(f"Frame incompleto supera {self.max_frame_size} bytes, "
+                           f"descartando {len(self._buffer)} bytes")
+            self.reset()
+
+        return frames
+
+    def reset(self):
+        """Descarta los bytes pendientes (por ejemplo, al reconectar)."""
+        self._buffer.clear()
+
+    def _extract(self, view):
+        raise NotImplementedError
+
+
+class PassthroughFramer(Framer):
+    """
+    Entrega cada bloque recibido como un frame, sin reensamblar.
+
+    No copia el bloque: si llega como memoryview sobre el buffer de
+    recepción, el frame también lo es (ver retain()).
+    """
+
+    def feed(self, chunk):
+        return [chunk] if chunk else []
+
+
+class DelimiterFramer(Framer):
+    """Separa frames por un delimitador (por ejemplo b'\\n' o b'\\r\\n')."""
+
+    def __init__(self, delimiter=b'\n', keep_delimiter=False, max_frame_size=65536):
+        """
+        Args:
+            delimiter: Secuencia de bytes que termina cada frame
+            keep_delimiter: Si True, el delimitador se incluye en el frame
+            max_frame_size: Ver Framer
+        """
+        super().__init__(max_frame_size)
+        if isinstance(delimiter, str):
+            delimiter = delimiter.encode('utf-8')
+        if not delimiter:
+            raise ValueError("El delimitador no puede estar vacío")
+        self.delimiter = delimiter
+        self.keep_delimiter = keep_delimiter
+        self._scanned = 0  # Bytes ya revisados sin encontrar delimitador
+
+    def feed(self, chunk):
+        frames = super().feed(chunk)
+        # Lo que quedó en el buffer ya fue revisado; la próxima búsqueda
+        # solo necesita retroceder lo suficiente para un delimitador partido
+        self._scanned = max(0, len(self._buffer) - len(self.delimiter) + 1)
+        return frames
+
+    def reset(self):
+        super().reset()
+        self._scanned = 0
+
+    def _extract(self, view):
+        frames = []
+        start = 0
+        delimiter = self.delimiter
+        size = len(delimiter)
+        tail = size if self.keep_delimiter else 0
+
+        index = self._buffer.find(delimiter, self._scanned)
+        while index != -1:
+            frames.append(bytes(view[start:index + tail]))
+            start = index + size
+            index = self._buffer.find(delimiter, start)
+
+        return frames, start
+
+
+class FixedLengthFramer(Framer):
+    """Separa frames de tamaño fijo."""
+
+    def __init__(self, length, max_frame_size=65536):
+        """
+        Args:
+            length: Tamaño de cada frame en bytes
+            max_frame_size: Ver Framer
+        """
+        if length < 1:
+            raise ValueError("La longitud del frame debe ser mayor que cero")
+        super().__init__(max(max_frame_size, length))
+        self.length = length
+
+    def _extract(self, view):
+        length = self.length
+        end = len(view) - len(view) % length
+        frames = [bytes(view[i:i + length]) for i in range(0, end, length)]
+        return frames, end
+
+
+class LengthPrefixFramer(Framer):
+    """Separa frames precedidos por un encabezado con su longitud."""
+
+    def __init__(self, prefix_size=2, byteorder='big', include_prefix=False,
+                 max_frame_size=65536):
+        """
+        Args:
+            prefix_size: Bytes del encabezado de longitud (1, 2 o 4)
+            byteorder: Orden de bytes del encabezado ('big' o 'little')
+            include_prefix: Si True, el encabezado se incluye en el frame
+            max_frame_size: Ver Framer
+        """
+        if prefix_size not in (1, 2, 4):
+            raise ValueError("El encabezado de longitud debe ser de 1, 2 o 4 bytes")
+        super().__init__(max_frame_size)
+        self.prefix_size = prefix_size
+        self.byteorder = byteorder
+        self.include_prefix = include_prefix
+
+    def _extract(self, view):
+        frames = []
+        start = 0
+        prefix_size = self.prefix_size
+        available = len(view)
+
+        while available - start >= prefix_size:
+            length = int.from_bytes(view[start:start + prefix_size], self.byteorder)
+            end = start + prefix_size + length
+            if end > available:
+                break
+            first = start if self.include_prefix else start + prefix_size
+            frames.append(bytes(view[first:end]))
+            start = end
+
+        return frames, start
+
+
+class CobsFramer(DelimiterFramer):
+    """
+    Separa frames codificados con COBS y terminados en 0x00.
+
+    Cada frame se decodifica antes de entregarse; los frames mal formados
+    se descartan con una advertencia.
+    """
+
+    def __init__(self, max_frame_size=65536):
+        super().__init__(b'\x00', keep_delimiter=False, max_frame_size=max_frame_size)
+
+    def _extract(self, view):
+        encoded, consumed = super()._extract(view)
+        frames = []
+        for frame in encoded:
+            if not frame:
+                continue
+            try:
+                frames.append(cobs_decode(frame))
+            except ValueError as e:
+                logger.warning(f"Frame COBS descartado: {e}")
+        return frames, consumed
+
+
+def cobs_encode(data):
+    """
+    Codifica datos con COBS (sin el 0x00 final).
+
+    Args:
+        data: Datos a codificar
+
+    Returns:
+        bytes: Datos codificados, sin bytes 0x00
+    """
+    output = bytearray()
+    data = bytes(data)
+    start = 0
+
+    while True:
+        index = data.find(b'\x00', start, start + 254)
+        if index == -1:
+            block = data[start:start + 254]
+            if len(block) == 254 and start + 254 < len(data):
+                output.append(255)
+                output += block
+                start += 254
+                continue
+            output.append(len(block) + 1)
+            output += block
+            break
+        output.append(index - start + 1)
+        output += data[start:index]
+        start = index + 1
+
+    return bytes(output)
+
+
+def cobs_decode(data):
+    """
+    Decodifica un frame COBS (sin el 0x00 final).
+
+    Args:
+        data: Datos codificados
+
+    Returns:
+        bytes: Datos originales
+
+    Raises:
+        ValueError: Si el frame no es COBS válido
+    """
+    output = bytearray()
+    data = bytes(data)
+    index = 0
+    size = len(data)
+
+    while index < size:
+        code = data[index]
+        if code == 0:
+            raise ValueError("byte 0x00 dentro del frame")
+        end = index + code
+        if end > size:
+            raise ValueError("frame truncado")
+        output += data[index + 1:end]
+        index = end
+        if code < 255 and index < size:
+            output.append(0)
+
+    return bytes(output)
+
+
+FRAMERS = {
+    'none': PassthroughFramer,
+    'delimiter': DelimiterFramer,
+    'fixed': FixedLengthFramer,
+    'length_prefix': LengthPrefixFramer,
+    'cobs': CobsFramer,
+}
+
+
+def create_framer(mode='none', **options):
+    """
+    Crea un reensamblador a partir de su nombre y opciones.
+
+    Pensado para la sección 'framing' de config.json, por ejemplo:
+    {"mode": "delimiter", "delimiter": "\\r\\n"}
+
+    Args:
+        mode: 'none', 'delimiter', 'fixed', 'length_prefix' o 'cobs'
+        **options: Argumentos del constructor del reensamblador
+
+    Returns:
+        Framer: Reensamblador configurado
+
+    Raises:
+        ValueError: Si el modo no existe
+    """
+    if mode not in FRAMERS:
+        raise ValueError(f"Modo de framing desconocido: {mode}")
+    return FRAMERS[mode](**options)
@@ -0,0 +1,191 @@
+"""
+Módulo con la etapa de procesamiento desacoplada del hilo de recepción
+"""
+
+import logging
+import threading
+from collections import deque
+
+from src.framing import retain
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessingPipeline:
+    """
+    Cola acotada con un hilo trabajador que procesa los frames recibidos.
+
+    El hilo de recepción solo llama a submit(), que encola el frame y
+    retorna de inmediato; el procesamiento (DataHandler, logging, UI) corre
+    en el hilo trabajador. Así un consumidor lento no impide vaciar el
+    socket.
+
+    Políticas cuando la cola está llena:
+        - 'drop_oldest': descarta el frame más antiguo de la cola
+        - 'drop_newest': descarta el frame que se intenta encolar
+        - 'block': espera a que haya espacio (frena la recepción; solo
+          recomendable cuando no se puede perder ningún frame)
+    """
+
+    POLICIES = ('block', 'drop_oldest', 'drop_newest')
+
+    def __init__(self, handler, max_size=10000, policy='drop_oldest', name='procesamiento',
+                 batch=False):
+        """
+        Inicializa la etapa de procesamiento.
+
+        Args:
+            handler: Función a llamar con cada frame en el hilo trabajador
+            max_size: Máximo de frames en espera
+            policy: Política de desborde ('block', 'drop_oldest' o 'drop_newest')
+            name: Nombre del hilo trabajador (para logs)
+            batch: Si True, handler recibe la lista de frames que el
+                trabajador toma de la cola de una vez, en lugar de un frame
+                por llamada
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Política de desborde desconocida: {policy}")
+
+        self.handler = handler
+        self.max_size = max_size
+        self.policy = policy
+        self.name = name
+        self.batch = batch
+
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._thread = None
+        self.running = False
+
+        # Contadores
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def start(self):
+        """Inicia el hilo trabajador."""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._worker_loop, name=self.name, daemon=True)
+        self._thread.start()
+        logger.info(f"Etapa de procesamiento '{self.name}' iniciada "
+                    f"(cola: {self.max_size}, política: {self.policy})")
+
+    def stop(self, timeout=2):
+        """
+        Detiene el hilo trabajador después de procesar lo pendiente.
+
+        Args:
+            timeout: Segundos máximos de espera
+        """
+        with self._lock:
+            self.running = False
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        logger.info(f"Etapa de procesamiento '{self.name}' detenida")
+
+    def submit(self, frame):
+        """
+        Encola un frame para procesarlo.
+
+        Es seguro llamarlo desde cualquier hilo. El frame se copia si llega
+        como vista del buffer de recepción.
+
+        Args:
+            frame: Datos a procesar
+
+        Returns:
+            bool: True si se encoló, False si se descartó
+        """
+        frame = retain(frame)
+
+        with self._lock:
+            self.submitted += 1
+
+            if len(self._queue) >= self.max_size:
+                if self.policy == 'drop_newest':
+                    self._count_drop()
+                    return False
+                elif self.policy == 'drop_oldest':
+                    self._queue.popleft()
+                    self._count_drop()
+                else:
+                    while self.running and len(self._queue) >= self.max_size:
+                        self._not_full.wait()
+
+            self._queue.append(frame)
+            self._not_empty.notify()
+
+        return True
+
+    def _count_drop(self):
+        """Cuenta un frame descartado (se llama con el lock tomado)."""
+        self.dropped += 1
+        # Avisar sin inundar el log: primer descarte y luego cada 1000
+        if self.dropped == 1 or self.dropped % 1000 == 0:
+            logger.warning(f"Cola '{self.name}' llena: {self.dropped} frames descartados")
+
+    def _worker_loop(self):
+        """
+        Procesa los frames encolados.
+
+        Este método se ejecuta en el hilo trabajador. Toma todos los frames
+        disponibles de una vez para liberar el lock lo antes posible.
+        """
+        while True:
+            with self._lock:
+                while self.running and not self._queue:
+                    self._not_empty.wait()
+
+                if not self._queue:
+                    break
+
+                batch = list(self._queue)
+                self._queue.clear()
+                self._not_full.notify_all()
+
+            if self.batch:
+                try:
+                    self.handler(batch)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Error en etapa de procesamiento '{self.name}': {e}")
+                self.processed += len(batch)
+                continue
+
+            for frame in batch:
+                try:
+                    self.handler(frame)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Error en etapa de procesamiento '{self.name}': {e}")
+
+            self.processed += len(batch)
+
+    def get_stats(self):
+        """
+        Obtiene los contadores de la etapa.
+
+        Returns:
+            dict: Frames encolados, procesados, descartados, con error y
+                en espera, más la configuración de la cola
+        """
+        with self._lock:
+            queued = len(self._queue)
+
+        return {
+            'submitted': self.submitted,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'queued': queued,
+            'max_size': self.max_size,
+            'policy': self.policy,
+        }
@@ -0,0 +1,246 @@
+"""
+Módulo para decodificar mensajes binarios a partir de esquemas declarativos
+"""
+
+import logging
+import struct
+
+logger = logging.getLogger(__name__)
+
+# Tipos de campo y su código de struct
+FIELD_TYPES = {
+    'u8': 'B', 'i8': 'b',
+    'u16': 'H', 'i16': 'h',
+    'u32': 'I', 'i32': 'i',
+    'u64': 'Q', 'i64': 'q',
+    'f16': 'e', 'f32': 'f', 'f64': 'd',
+    'bool': '?',
+}
+
+BYTE_ORDERS = {'little': '<', 'big': '>'}
+
+
+def _field_code(field_type):
+    """
+    Traduce un tipo de campo a su código de struct.
+
+    Además de FIELD_TYPES se aceptan 'bytes:N' (N bytes sin interpretar) y
+    'pad:N' (N bytes que se saltan).
+
+    Args:
+        field_type: Nombre del tipo
+
+    Returns:
+        str: Código de struct
+
+    Raises:
+        ValueError: Si el tipo no existe
+    """
+    if field_type in FIELD_TYPES:
+        return FIELD_TYPES[field_type]
+
+    kind, _, count = field_type.partition(':')
+    if kind in ('bytes', 'pad') and count.isdigit() and int(count) > 0:
+        return f"{count}{'s' if kind == 'bytes' else 'x'}"
+    raise ValueError(f"Tipo de campo desconocido: {field_type}")
+
+
+class MessageSchema:
+    """
+    Esquema de un mensaje binario de tamaño fijo.
+
+    Se describe con una lista de campos (nombre, tipo[, escala[, offset]])
+    y se compila una sola vez en un struct.Struct. Decodificar un mensaje
+    es un único unpack en C; decodificar un lote une los mensajes en un
+    solo bloque y los separa con iter_unpack(), sin interpretar campo por
+    campo en Python. Solo los campos con escala u offset pasan por una
+    conversión adicional (valor * escala + offset), columna a columna.
+
+    Ejemplo, telemetría de 10 bytes con cabecera 0xAA 0x55:
+
+        schema = MessageSchema(
+            [('seq', 'u16'), ('temp', 'i16', 0.01), ('hum', 'u16', 0.1), ('flags', 'u8'),
+             ('_', 'pad:1')],
+            byte_order='little', header=b'\\xAA\\x55', name='telemetria'
+        )
+
+    Los campos 'pad:N' no aparecen en el resultado.
+    """
+
+    def __init__(self, fields, byte_order='little', header=b'', name='mensaje'):
+        """
+        Compila el esquema.
+
+        Args:
+            fields: Lista de (nombre, tipo) o (nombre, tipo, escala[, offset]);
+                tipos en FIELD_TYPES, 'bytes:N' o 'pad:N'
+            byte_order: 'little' o 'big'
+            header: Bytes fijos al inicio de cada mensaje; los mensajes que
+                no los llevan se descartan
+            name: Nombre del esquema (para logs)
+
+        Raises:
+            ValueError: Si el orden de bytes, un tipo o un nombre no son válidos
+        """
+        if byte_order not in BYTE_ORDERS:
+            raise ValueError(f"Orden de bytes desconocido: {byte_order}")
+        if isinstance(header, str):
+            header = bytes.fromhex(header)
+
+        self.name = name
+        self.byte_order = byte_order
+        self.header = bytes(header)
+
+        codes = [f"{len(self.header)}s"] if self.header else []
+        names = []
+        scales = []
+        for field in fields:
+            field_name, field_type = field[0], field[1]
+            code = _field_code(field_type)
+            codes.append(code)
+            if code.endswith('x'):
+                continue
+            if field_name in names:
+                raise ValueError(f"Campo repetido en el esquema '{name}': {field_name}")
+
+            scale = field[2] if len(field) > 2 else 1
+            offset = field[3] if len(field) > 3 else 0
+            if scale != 1 or offset != 0:
+                scales.append((len(names), scale, offset))
+            names.append(field_name)
+
+        self.names = tuple(names)
+        self.struct = struct.Struct(BYTE_ORDERS[byte_order] + ''.join(codes))
+        self.size = self.struct.size
+        self._scales = scales
+        self._skip = 1 if self.header else 0  # Columnas de cabecera a omitir
+
+        # Contadores
+        self.decoded = 0
+        self.invalid = 0
+
+        logger.info(f"Esquema '{name}' compilado: {self.size} bytes, {len(names)} campos")
+
+    def decode(self, data):
+        """
+        Decodifica un mensaje.
+
+        Args:
+            data: Bytes de un mensaje
+
+        Returns:
+            dict: Campos del mensaje, o None si el tamaño o la cabecera no
+                coinciden
+        """
+        if len(data) != self.size:
+            self.invalid += 1
+            return None
+
+        values = self.struct.unpack(data)
+        if self._skip:
+            if values[0] != self.header:
+                self.invalid += 1
+                return None
+            values = values[1:]
+
+        if self._scales:
+            values = list(values)
+            for i, scale, offset in self._scales:
+                values[i] = values[i] * scale + offset
+
+        self.decoded += 1
+        return dict(zip(self.names, values))
+
+    def decode_batch(self, payloads, t_ns=None, index=False):
+        """
+        Decodifica un lote de mensajes a columnas.
+
+        Un payload puede contener varios mensajes seguidos (por ejemplo, si
+        no hay framing); los que no miden un múltiplo exacto del mensaje o
+        no llevan la cabecera se descartan y se cuentan en 'invalid'.
+
+        Args:
+            payloads: Secuencia de bytes, uno o más mensajes cada uno
+            t_ns: Secuencia paralela de timestamps (opcional); se agrega
+                como columna 't_ns', repetida para cada mensaje del payload
+            index: Si True, agrega la columna 'index' con la posición en
+                payloads de la que salió cada mensaje
+
+        Returns:
+            dict: Nombre de campo -> lista de valores, en orden de llegada
+        """
+        size = self.size
+        lengths = list(map(len, payloads))
+
+        if lengths.count(size) == len(lengths):
+            # Caso habitual: un mensaje completo por payload
+            block = b''.join(payloads)
+            times = list(t_ns) if t_ns is not None else None
+            origins = list(range(len(lengths))) if index else None
+        else:
+            valid = [i for i, length in enumerate(lengths) if length and length % size == 0]
+            self.invalid += len(lengths) - len(valid)
+            block = b''.join(payloads[i] for i in valid)
+            times = None
+            origins = [i for i in valid for _ in range(lengths[i] // size)]
+            if t_ns is not None:
+                times = [t_ns[i] for i in origins]
+
+        rows = list(self.struct.iter_unpack(block))
+
+        if self._skip and rows:
+            header = self.header
+            if any(row[0] != header for row in rows):
+                keep = [i for i, row in enumerate(rows) if row[0] == header]
+                self.invalid += len(rows) - len(keep)
+                rows = [rows[i] for i in keep]
+                if times is not None:
+                    times = [times[i] for i in keep]
+                if origins is not None:
+                    origins = [origins[i] for i in keep]
+
+        columns = list(zip(*rows))[self._skip:] if rows else [()] * len(self.names)
+        columns = [list(column) for column in columns]
+        for i, scale, offset in self._scales:
+            columns[i] = [value * scale + offset for value in columns[i]]
+
+        self.decoded += len(rows)
+        result = dict(zip(self.names, columns))
+        if times is not None:
+            result['t_ns'] = times
+        if index:
+            result['index'] = origins
+        return result
+
+    def get_stats(self):
+        """
+        Obtiene los contadores del esquema.
+
+        Returns:
+            dict: Mensajes decodificados y descartados
+        """
+        return {'name': self.name, 'decoded': self.decoded, 'invalid': self.invalid}
+
+
+def create_schema(fields, byte_order='little', header='', name='mensaje'):
+    """
+    Crea un esquema a partir de su descripción en config.json.
+
+    Pensado para la sección 'protocol', por ejemplo:
+    {"name": "telemetria", "header": "AA55", "byte_order": "little",
+     "fields": [["seq", "u16"], ["temp", "i16", 0.01]]}
+
+    Args:
+        fields: Lista de campos (ver MessageSchema)
+        byte_order: 'little' o 'big'
+        header: Cabecera en hexadecimal
+        name: Nombre del esquema
+
+    Returns:
+        MessageSchema: Esquema compilado
+
+    Raises:
+        ValueError: Si la descripción no es válida
+    """
+    return MessageSchema([tuple(field) for field in fields], byte_order=byte_order,
+                         header=bytes.fromhex(header) if header else b'', name=name)
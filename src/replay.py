@@ -0,0 +1,196 @@
+"""
+Módulo para reproducir capturas grabadas como si llegaran en vivo
+"""
+
+import logging
+import threading
+import time
+
+from src.capture import CaptureReader
+from src.data_bus import Frame
+from src.data_handler import _WALL_OFFSET_NS
+
+logger = logging.getLogger(__name__)
+
+
+class CaptureReplay:
+    """
+    Reproduce capturas binarias (ver BinaryCaptureWriter) por la misma ruta
+    que una conexión real: cada frame se publica en el bus de datos del
+    BluetoothManager y, si hay callback de datos, se le pasa también, como
+    hace _dispatch_frames(). Los suscriptores (procesamiento, interfaz,
+    grabación, canal de comandos...) no distinguen la reproducción de un
+    dispositivo conectado.
+
+    Con speed=1 se respetan los intervalos originales entre frames, con
+    speed=N se reproducen N veces más rápido y con speed=0 sin esperas, lo
+    que sirve como prueba de carga de las etapas de procesamiento y de la
+    interfaz.
+
+    Varios archivos (por ejemplo, los de una captura rotada) se reproducen
+    uno tras otro como una sola línea de tiempo.
+    """
+
+    def __init__(self, manager, paths, speed=1.0, start_ns=None, end_ns=None, loop=False,
+                 keep_timestamps=True, on_finished=None):
+        """
+        Inicializa la reproducción.
+
+        Args:
+            manager: BluetoothManager cuyos consumidores reciben los frames
+            paths: Ruta o lista de rutas de capturas .btcap, en orden
+            speed: Factor de velocidad (1 = tiempo real, 0 = sin esperas)
+            start_ns: Primer instante a reproducir, en el reloj de la
+                captura (None = desde el principio; ver CaptureReader)
+            end_ns: Último instante a reproducir (None = hasta el final)
+            loop: Si True, vuelve a empezar al terminar
+            keep_timestamps: Si True, los frames conservan la hora en que se
+                grabaron; si False, llevan la hora de la reproducción
+            on_finished: Función (estadísticas) a llamar al terminar o
+                detenerse; se ejecuta en el hilo de la reproducción
+        """
+        self.manager = manager
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+        self.speed = speed
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.loop = loop
+        self.keep_timestamps = keep_timestamps
+        self.on_finished = on_finished
+
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.running = False
+
+        # Contadores
+        self.frames = 0
+        self.bytes = 0
+        self.lag_ns = 0  # Retraso respecto al horario original (con speed > 0)
+        self._started = 0
+        self._finished = 0
+
+    def start(self):
+        """
+        Inicia la reproducción en un hilo separado.
+
+        Raises:
+            ValueError: Si algún archivo no es una captura binaria
+            OSError: Si algún archivo no se puede abrir
+        """
+        # Validar todos los archivos antes de empezar
+        for path in self.paths:
+            CaptureReader(path).close()
+
+        self._stop_event.clear()
+        self.running = True
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._replay_loop, name='reproduccion', daemon=True)
+        self._thread.start()
+        speed = f"{self.speed:g}x" if self.speed else "máxima velocidad"
+        logger.info(f"Reproducción iniciada: {len(self.paths)} archivo(s) a {speed}")
+
+    def stop(self, timeout=2):
+        """
+        Detiene la reproducción.
+
+        Args:
+            timeout: Segundos máximos de espera
+        """
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive() \
+                and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    def wait(self, timeout=None):
+        """
+        Espera a que la reproducción termine.
+
+        Args:
+            timeout: Segundos máximos de espera (None = sin límite)
+
+        Returns:
+            bool: True si terminó
+        """
+        if self._thread:
+            self._thread.join(timeout)
+        return not self.running
+
+    def get_stats(self):
+        """
+        Obtiene los contadores de la reproducción.
+
+        Returns:
+            dict: Frames y bytes reproducidos, segundos transcurridos,
+                frames por segundo y retraso respecto al horario original
+        """
+        end = self._finished or time.monotonic()
+        elapsed = end - self._started if self._started else 0
+        return {
+            'frames': self.frames,
+            'bytes': self.bytes,
+            'elapsed': elapsed,
+            'frames_per_second': self.frames / elapsed if elapsed else 0,
+            'lag_ms': self.lag_ns / 1e6,
+            'running': self.running,
+        }
+
+    def _replay_loop(self):
+        """
+        Publica los frames de las capturas en su momento.
+
+        Este método se ejecuta en un hilo separado.
+        """
+        try:
+            while True:
+                self._replay_files()
+                if not self.loop or self._stop_event.is_set():
+                    break
+        except (OSError, ValueError) as e:
+            logger.error(f"Error en la reproducción: {e}")
+        finally:
+            self.running = False
+            self._finished = time.monotonic()
+            stats = self.get_stats()
+            logger.info(f"Reproducción terminada: {stats['frames']} frames en "
+                        f"{stats['elapsed']:.1f}s ({stats['frames_per_second']:,.0f}/s)")
+            if self.on_finished:
+                self.on_finished(stats)
+
+    def _replay_files(self):
+        """Reproduce una vez todos los archivos, como una sola línea de tiempo."""
+        bus = self.manager.data_bus
+        first_wall_ns = None
+        origin_ns = time.monotonic_ns()
+
+        for path in self.paths:
+            with CaptureReader(path) as capture:
+                # Hora de pared de cada frame, común a todos los archivos
+                to_wall = capture.wall_offset_ns
+                for frame in capture.read_range(self.start_ns, self.end_ns):
+                    if self._stop_event.is_set():
+                        return
+
+                    wall_ns = frame.t_ns + to_wall
+                    if first_wall_ns is None:
+                        first_wall_ns = wall_ns
+
+                    if self.speed:
+                        due_ns = origin_ns + int((wall_ns - first_wall_ns) / self.speed)
+                        wait_ns = due_ns - time.monotonic_ns()
+                        self.lag_ns = max(0, -wait_ns)
+                        if wait_ns > 0 and self._stop_event.wait(wait_ns / 1e9):
+                            return
+
+                    if self.keep_timestamps:
+                        # Al reloj monotónico de este proceso
+                        t_ns = wall_ns - _WALL_OFFSET_NS
+                    else:
+                        t_ns = time.monotonic_ns()
+
+                    if bus.has_subscribers():
+                        bus.publish(Frame(frame.data, frame.source, t_ns, frame.gap_ns))
+                    if self.manager.data_callback and not frame.gap_ns:
+                        self.manager.data_callback(frame.data)
+
+                    self.frames += 1
+                    self.bytes += len(frame.data)
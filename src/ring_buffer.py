@@ -0,0 +1,99 @@
+"""
+Módulo con un buffer circular de capacidad fija
+"""
+
+
+class RingBuffer:
+    """
+    Buffer circular de capacidad fija.
+
+    Agregar un elemento y descartar el más antiguo son operaciones O(1),
+    sin importar la capacidad. Al llenarse, cada nuevo elemento
+    sobrescribe al más antiguo.
+    """
+
+    def __init__(self, capacity):
+        """
+        Inicializa el buffer.
+
+        Args:
+            capacity: Número máximo de elementos a mantener
+        """
+        if capacity < 1:
+            raise ValueError("La capacidad debe ser mayor que cero")
+
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._start = 0  # Índice del elemento más antiguo
+        self._size = 0
+
+    def append(self, item):
+        """
+        Agrega un elemento, descartando el más antiguo si está lleno.
+
+        Args:
+            item: Elemento a agregar
+        """
+        end = self._start + self._size
+        if end >= self.capacity:
+            end -= self.capacity
+
+        self._items[end] = item
+
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = end + 1 if end + 1 < self.capacity else 0
+
+    def tail(self, count=None):
+        """
+        Obtiene los últimos elementos en orden cronológico.
+
+        Solo se copian los elementos pedidos (a lo sumo dos slices de la
+        lista interna), no el buffer completo.
+
+        Args:
+            count: Número de elementos a obtener (None = todos)
+
+        Returns:
+            list: Elementos del más antiguo al más reciente
+        """
+        if count is None or count > self._size:
+            count = self._size
+        if count <= 0:
+            return []
+
+        first = self._start + self._size - count
+        if first >= self.capacity:
+            first -= self.capacity
+        last = first + count
+
+        if last <= self.capacity:
+            return self._items[first:last]
+        return self._items[first:] + self._items[:last - self.capacity]
+
+    def clear(self):
+        """Elimina todos los elementos del buffer."""
+        self._items = [None] * self.capacity
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("Índice fuera del buffer")
+
+        index += self._start
+        if index >= self.capacity:
+            index -= self.capacity
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(self.tail())
@@ -0,0 +1,226 @@
+"""
+Módulo con la cola de envío asíncrona
+"""
+
+import concurrent.futures
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class SendQueue:
+    """
+    Cola acotada con un hilo escritor para los datos salientes.
+
+    submit() encola y retorna de inmediato un Future; el hilo escritor
+    junta los envíos pequeños que llegan dentro de una ventana de
+    latencia y los escribe en un único sendall(). Así una ráfaga de
+    comandos no bloquea al hilo que la genera (por ejemplo, el de Tk) y
+    se hacen menos escrituras al socket.
+
+    Si la cola está llena, submit() espera hasta 'timeout' segundos y
+    luego retorna None: el llamador decide si reintentar o descartar.
+    """
+
+    def __init__(self, write, max_size=1000, latency=0.005, max_batch=4096, name='envio'):
+        """
+        Inicializa la cola de envío.
+
+        Args:
+            write: Función (bytes) que escribe todo el bloque o lanza excepción
+            max_size: Máximo de envíos en espera
+            latency: Segundos que se espera a más envíos para agruparlos
+                (0 = agrupar solo lo que ya está en cola)
+            max_batch: Máximo de bytes por escritura agrupada
+            name: Nombre del hilo escritor (para logs)
+        """
+        self.write = write
+        self.max_size = max_size
+        self.latency = latency
+        self.max_batch = max_batch
+        self.name = name
+
+        self._queue = deque()  # Tuplas (datos, future)
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._thread = None
+        self.running = False
+
+        # Contadores
+        self.submitted = 0
+        self.rejected = 0
+        self.batches = 0
+        self.bytes_sent = 0
+        self.errors = 0
+
+    def start(self):
+        """Inicia el hilo escritor."""
+        with self._lock:
+            if self.running:
+                return
+            self.running = True
+        self._thread = threading.Thread(target=self._writer_loop, name=self.name, daemon=True)
+        self._thread.start()
+        logger.info(f"Cola de envío '{self.name}' iniciada "
+                    f"(cola: {self.max_size}, latencia: {self.latency * 1000:.0f} ms)")
+
+    def stop(self, timeout=2):
+        """
+        Detiene el hilo escritor.
+
+        Los envíos que quedaban en cola se cancelan con ConnectionError.
+
+        Args:
+            timeout: Segundos máximos de espera
+        """
+        with self._lock:
+            self.running = False
+            pending = list(self._queue)
+            self._queue.clear()
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+        for _, future in pending:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(ConnectionError("Cola de envío detenida"))
+
+        if self._thread and self._thread.is_alive() \
+                and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        logger.info(f"Cola de envío '{self.name}' detenida")
+
+    def submit(self, data, timeout=0):
+        """
+        Encola datos para enviarlos.
+
+        Es seguro llamarlo desde cualquier hilo.
+
+        Args:
+            data: Datos a enviar (string o bytes)
+            timeout: Segundos máximos de espera si la cola está llena
+                (0 = no esperar, None = esperar sin límite)
+
+        Returns:
+            Future: Se completa con el número de bytes enviados o con la
+                excepción del envío; None si la cola estaba llena o detenida
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        else:
+            data = bytes(data)
+
+        future = concurrent.futures.Future()
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._lock:
+            while self.running and len(self._queue) >= self.max_size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._not_full.wait(remaining)
+
+            if not self.running or len(self._queue) >= self.max_size:
+                self.rejected += 1
+                # Avisar sin inundar el log: primer rechazo y luego cada 100
+                if self.rejected == 1 or self.rejected % 100 == 0:
+                    logger.warning(f"Cola de envío '{self.name}' llena: "
+                                   f"{self.rejected} envíos rechazados")
+                return None
+
+            self.submitted += 1
+            self._queue.append((data, future))
+            self._not_empty.notify()
+
+        return future
+
+    def _next_batch(self):
+        """
+        Espera el siguiente grupo de envíos.
+
+        Tras el primer envío se esperan más hasta 'latency' segundos o
+        hasta llenar 'max_batch' bytes.
+
+        Returns:
+            list: Tuplas (datos, future), vacía si la cola se detuvo
+        """
+        with self._lock:
+            while self.running and not self._queue:
+                self._not_empty.wait()
+            if not self._queue:
+                return []
+
+            batch = [self._queue.popleft()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.latency
+
+            while self.running and size < self.max_batch:
+                if not self._queue:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._not_empty.wait(remaining)
+                    continue
+                if size + len(self._queue[0][0]) > self.max_batch:
+                    break
+                item = self._queue.popleft()
+                batch.append(item)
+                size += len(item[0])
+
+            self._not_full.notify_all()
+            return batch
+
+    def _writer_loop(self):
+        """
+        Escribe los envíos encolados.
+
+        Este método se ejecuta en el hilo escritor.
+        """
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                break
+
+            # Descartar envíos cancelados por el llamador mientras esperaban
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            payload = b''.join(data for data, _ in batch)
+            try:
+                self.write(payload)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Error en cola de envío '{self.name}': {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.bytes_sent += len(payload)
+            for data, future in batch:
+                future.set_result(len(data))
+
+    def get_stats(self):
+        """
+        Obtiene los contadores de la cola.
+
+        Returns:
+            dict: Envíos aceptados, rechazados, escrituras agrupadas, bytes
+                enviados, errores y envíos en espera
+        """
+        with self._lock:
+            queued = len(self._queue)
+
+        return {
+            'submitted': self.submitted,
+            'rejected': self.rejected,
+            'batches': self.batches,
+            'bytes_sent': self.bytes_sent,
+            'errors': self.errors,
+            'queued': queued,
+            'max_size': self.max_size,
+        }
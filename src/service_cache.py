@@ -0,0 +1,115 @@
+"""
+Módulo con la caché de servicios SDP por dispositivo
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceCache:
+    """
+    Caché de resultados de bluetooth.find_service() indexada por MAC.
+
+    Una búsqueda SDP tarda varios segundos y sus resultados casi nunca
+    cambian, así que se guardan durante 'ttl' segundos y se persisten en
+    disco para que sobrevivan entre sesiones.
+    """
+
+    def __init__(self, cache_file='sdp_cache.json', ttl=3600):
+        """
+        Inicializa la caché.
+
+        Args:
+            cache_file: Ruta del archivo de persistencia (None = solo memoria)
+            ttl: Segundos que un resultado se considera válido
+        """
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def get(self, device_address):
+        """
+        Obtiene los servicios guardados de un dispositivo.
+
+        Args:
+            device_address: Dirección MAC del dispositivo
+
+        Returns:
+            list: Servicios guardados, o None si no hay o expiraron
+        """
+        with self._lock:
+            entry = self._entries.get(device_address)
+
+        if entry is None:
+            return None
+        if time.time() - entry['timestamp'] > self.ttl:
+            logger.debug(f"Servicios de {device_address} expirados en caché")
+            return None
+        return entry['services']
+
+    def put(self, device_address, services):
+        """
+        Guarda los servicios de un dispositivo.
+
+        Args:
+            device_address: Dirección MAC del dispositivo
+            services: Lista retornada por bluetooth.find_service()
+        """
+        with self._lock:
+            self._entries[device_address] = {
+                'timestamp': time.time(),
+                'services': services
+            }
+        self._save()
+
+    def invalidate(self, device_address=None):
+        """
+        Descarta los servicios guardados.
+
+        Args:
+            device_address: Dirección MAC a descartar (None = todas)
+        """
+        with self._lock:
+            if device_address is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(device_address, None)
+        self._save()
+        logger.info(f"Caché SDP invalidada: {device_address or 'todos los dispositivos'}")
+
+    def _load(self):
+        """
+        Carga la caché desde el archivo.
+
+        Returns:
+            dict: Entradas cargadas o un diccionario vacío
+        """
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return {}
+
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error cargando caché SDP: {e}")
+            return {}
+
+    def _save(self):
+        """Guarda la caché en el archivo."""
+        if not self.cache_file:
+            return
+
+        try:
+            # Varios diagnósticos en paralelo pueden guardar a la vez
+            with self._lock:
+                data = json.dumps(self._entries, indent=4, default=str)
+                with open(self.cache_file, 'w') as f:
+                    f.write(data)
+        except Exception as e:
+            logger.error(f"Error guardando caché SDP: {e}")
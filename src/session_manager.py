@@ -0,0 +1,364 @@
+"""
+Módulo para mantener varias conexiones RFCOMM simultáneas
+"""
+
+import errno
+import logging
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+
+from src.data_bus import Frame
+from src.framing import PassthroughFramer, retain
+from src.transport import BluezTransport
+
+logger = logging.getLogger(__name__)
+
+
+def _would_block(error):
+    """
+    Indica si un error de socket significa "reintentar más tarde".
+
+    PyBluez no lanza BlockingIOError en sockets no bloqueantes, sino
+    BluetoothError con errno EAGAIN.
+    """
+    return getattr(error, 'errno', None) in (errno.EAGAIN, errno.EWOULDBLOCK)
+
+
+class DeviceSession:
+    """Estado de una conexión RFCOMM abierta con un dispositivo."""
+
+    def __init__(self, address, port, sock, framer):
+        """
+        Args:
+            address: Dirección MAC del dispositivo
+            port: Puerto RFCOMM
+            sock: Socket conectado
+            framer: Reensamblador de mensajes propio de esta sesión
+        """
+        self.address = address
+        self.port = port
+        self.socket = sock
+        self.framer = framer
+        self.connected_at = time.time()
+        self.bytes_received = 0
+        self.frames_received = 0
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Información de la sesión
+        """
+        return {
+            'address': self.address,
+            'port': self.port,
+            'connected_at': self.connected_at,
+            'bytes_received': self.bytes_received,
+            'frames_received': self.frames_received,
+        }
+
+
+class SessionManager:
+    """
+    Gestiona varias conexiones RFCOMM simultáneas, indexadas por MAC.
+
+    Todos los sockets se atienden desde un único hilo de E/S con un
+    selector, en lugar de un hilo por dispositivo. Cada frame recibido se
+    publica en el bus de datos con la dirección del dispositivo de origen.
+    """
+
+    def __init__(self, data_bus, framer_factory=PassthroughFramer, recv_size=4096,
+                 transport=None):
+        """
+        Inicializa el gestor de sesiones.
+
+        Args:
+            data_bus: DataBus donde publicar los frames recibidos
+            framer_factory: Función sin argumentos que crea un Framer por sesión
+            recv_size: Máximo de bytes por lectura de socket
+            transport: Acceso al adaptador (por defecto BluezTransport)
+        """
+        self.transport = transport or BluezTransport()
+        self.data_bus = data_bus
+        self.framer_factory = framer_factory
+        self.recv_size = recv_size
+
+        self.sessions = {}
+        self.session_callback = None
+
+        self._lock = threading.Lock()
+        self._selector = None
+        self._pending = deque()  # Operaciones para el hilo de E/S
+        self._wakeup_r = None
+        self._wakeup_w = None
+        self._io_thread = None
+        self.running = False
+
+        # Buffer compartido: el hilo de E/S atiende un socket a la vez
+        self._recv_buffer = bytearray(recv_size)
+        self._recv_view = memoryview(self._recv_buffer)
+
+    def open(self, device_address, port=1):
+        """
+        Abre una sesión con un dispositivo.
+
+        La conexión se establece en el hilo que llama (es bloqueante); una
+        vez conectada, la recepción pasa al hilo de E/S compartido.
+
+        Args:
+            device_address: Dirección MAC del dispositivo
+            port: Puerto RFCOMM
+
+        Returns:
+            bool: True si la sesión quedó abierta
+        """
+        with self._lock:
+            if device_address in self.sessions:
+                logger.warning(f"Ya existe una sesión con {device_address}")
+                return True
+
+        try:
+            logger.info(f"Abriendo sesión con {device_address} en puerto {port}")
+            sock = self.transport.create_socket()
+            sock.connect((device_address, port))
+            sock.setblocking(False)
+        except Exception as e:
+            logger.error(f"Error abriendo sesión con {device_address}: {e}")
+            return False
+
+        session = DeviceSession(device_address, port, sock, self.framer_factory())
+
+        with self._lock:
+            self.sessions[device_address] = session
+        self._ensure_io_thread()
+        self._submit(self._register, session)
+
+        logger.info(f"Sesión abierta con {device_address} "
+                    f"({len(self.sessions)} sesiones activas)")
+        self._notify(device_address, True)
+        return True
+
+    def close(self, device_address):
+        """
+        Cierra la sesión con un dispositivo.
+
+        Args:
+            device_address: Dirección MAC del dispositivo
+        """
+        with self._lock:
+            session = self.sessions.pop(device_address, None)
+
+        if session is None:
+            return
+
+        if self.running:
+            self._submit(self._unregister, session)
+        else:
+            self._close_socket(session)
+
+        logger.info(f"Sesión con {device_address} cerrada")
+        self._notify(device_address, False)
+
+    def close_all(self):
+        """Cierra todas las sesiones y detiene el hilo de E/S."""
+        for address in list(self.sessions):
+            self.close(address)
+
+        if self.running:
+            self.running = False
+            self._wake()
+            if self._io_thread and self._io_thread.is_alive():
+                self._io_thread.join(timeout=2)
+
+    def get_sessions(self):
+        """
+        Obtiene las sesiones activas.
+
+        Returns:
+            list: Información de cada sesión (ver DeviceSession.to_dict)
+        """
+        with self._lock:
+            return [session.to_dict() for session in self.sessions.values()]
+
+    def is_open(self, device_address):
+        """
+        Verifica si hay una sesión abierta con un dispositivo.
+
+        Args:
+            device_address: Dirección MAC del dispositivo
+
+        Returns:
+            bool: True si la sesión está abierta
+        """
+        return device_address in self.sessions
+
+    def send(self, device_address, data):
+        """
+        Envía datos a un dispositivo con sesión abierta.
+
+        Args:
+            device_address: Dirección MAC del dispositivo
+            data: Datos a enviar (string o bytes)
+
+        Returns:
+            bool: True si el envío fue exitoso
+        """
+        session = self.sessions.get(device_address)
+        if session is None:
+            logger.warning(f"Intento de envío sin sesión con {device_address}")
+            return False
+
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        try:
+            # El socket no es bloqueante: reintentar hasta enviar todo
+            while data:
+                try:
+                    sent = session.socket.send(data)
+                except OSError as e:
+                    if not _would_block(e):
+                        raise
+                    time.sleep(0.001)
+                    continue
+                data = data[sent:]
+            return True
+        except Exception as e:
+            logger.error(f"Error al enviar datos a {device_address}: {e}")
+            return False
+
+    def set_session_callback(self, callback):
+        """
+        Establece el callback para cambios en las sesiones.
+
+        Args:
+            callback: Función (address, connected) a llamar al abrir o
+                cerrar una sesión
+        """
+        self.session_callback = callback
+
+    def _notify(self, device_address, connected):
+        if self.session_callback:
+            try:
+                self.session_callback(device_address, connected)
+            except Exception as e:
+                logger.error(f"Error en callback de sesión: {e}")
+
+    def _ensure_io_thread(self):
+        """Crea el selector y arranca el hilo de E/S si no está corriendo."""
+        with self._lock:
+            if self.running:
+                return
+
+            self._selector = selectors.DefaultSelector()
+            self._wakeup_r, self._wakeup_w = socket.socketpair()
+            self._wakeup_r.setblocking(False)
+            self._selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+
+            self.running = True
+            self._io_thread = threading.Thread(target=self._io_loop, daemon=True)
+            self._io_thread.start()
+            logger.info("Hilo de E/S de sesiones iniciado")
+
+    def _submit(self, operation, session):
+        """Encola una operación para que la ejecute el hilo de E/S."""
+        self._pending.append((operation, session))
+        self._wake()
+
+    def _wake(self):
+        try:
+            self._wakeup_w.send(b'\0')
+        except (OSError, AttributeError):
+            pass
+
+    def _register(self, session):
+        self._selector.register(session.socket, selectors.EVENT_READ, session)
+
+    def _unregister(self, session):
+        try:
+            self._selector.unregister(session.socket)
+        except (KeyError, ValueError):
+            pass
+        self._close_socket(session)
+
+    def _close_socket(self, session):
+        try:
+            session.socket.close()
+        except Exception as e:
+            logger.error(f"Error cerrando socket de {session.address}: {e}")
+
+    def _io_loop(self):
+        """
+        Atiende todos los sockets de sesión.
+
+        Este método se ejecuta en el hilo de E/S.
+        """
+        logger.info("Loop de E/S de sesiones iniciado")
+
+        while self.running:
+            for key, _ in self._selector.select(timeout=0.5):
+                if key.data is None:
+                    self._drain_wakeup()
+                else:
+                    self._read_session(key.data)
+
+            self._run_pending()
+
+        # close_all() encola el cierre de cada sesión antes de detener el
+        # loop: si el loop salió antes de verlas, cerrarlas aquí
+        self._run_pending()
+        self._selector.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+        logger.info("Loop de E/S de sesiones finalizado")
+
+    def _run_pending(self):
+        """Ejecuta las operaciones encoladas por otros hilos (hilo de E/S)."""
+        while self._pending:
+            operation, session = self._pending.popleft()
+            operation(session)
+
+    def _drain_wakeup(self):
+        try:
+            while self._wakeup_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _read_session(self, session):
+        """
+        Lee lo disponible en un socket y publica los frames completos.
+
+        Args:
+            session: Sesión con datos listos para leer
+        """
+        if session.address not in self.sessions:
+            return
+
+        try:
+            recv_into = getattr(session.socket, 'recv_into', None)
+            if recv_into is not None:
+                data = self._recv_view[:recv_into(self._recv_buffer)]
+            else:
+                data = session.socket.recv(self.recv_size)
+        except OSError as e:  # Incluye BluetoothError de PyBluez
+            if _would_block(e):
+                return
+            logger.error(f"Error de recepción en sesión {session.address}: {e}")
+            self.close(session.address)
+            return
+
+        if not data:
+            logger.warning(f"Sesión {session.address} cerrada por el dispositivo")
+            self.close(session.address)
+            return
+
+        session.bytes_received += len(data)
+        frames = session.framer.feed(data)
+        if frames:
+            session.frames_received += len(frames)
+            t_ns = time.monotonic_ns()
+            for frame in frames:
+                self.data_bus.publish(Frame(retain(frame), session.address, t_ns))
@@ -0,0 +1,372 @@
+"""
+Módulo con los transportes Bluetooth: PyBluez real y dispositivo simulado
+"""
+
+import errno
+import logging
+import os
+import socket
+import threading
+import time
+
+try:
+    import bluetooth
+except ImportError:  # Sin PyBluez solo se puede usar SimulatedTransport
+    bluetooth = None
+
+logger = logging.getLogger(__name__)
+
+
+class BluezTransport:
+    """
+    Transporte real: delega en PyBluez.
+
+    BluetoothManager, SessionManager, DiscoveryService y
+    AsyncBluetoothManager solo usan estos tres métodos para hablar con el
+    adaptador, así que cualquier objeto con la misma interfaz puede
+    reemplazarlo (ver SimulatedTransport).
+    """
+
+    def __init__(self):
+        """
+        Raises:
+            ImportError: Si PyBluez no está instalado
+        """
+        if bluetooth is None:
+            raise ImportError("BluezTransport necesita PyBluez: pip install pybluez")
+
+    def discover_devices(self, duration=8):
+        """
+        Escanea dispositivos cercanos.
+
+        Args:
+            duration: Duración del escaneo en segundos
+
+        Returns:
+            list: Tuplas (dirección, nombre)
+        """
+        return bluetooth.discover_devices(
+            duration=duration,
+            lookup_names=True,
+            flush_cache=True,
+            lookup_class=False
+        )
+
+    def find_service(self, device_address):
+        """
+        Busca los servicios SDP de un dispositivo.
+
+        Args:
+            device_address: Dirección MAC del dispositivo
+
+        Returns:
+            list: Servicios en el formato de bluetooth.find_service()
+        """
+        return bluetooth.find_service(address=device_address)
+
+    def create_socket(self):
+        """
+        Crea un socket RFCOMM sin conectar.
+
+        Returns:
+            BluetoothSocket: Socket nuevo
+        """
+        return bluetooth.BluetoothSocket(bluetooth.RFCOMM)
+
+
+class SyntheticTraffic:
+    """
+    Genera paquetes a una tasa y tamaño fijos.
+
+    Por defecto cada paquete es "secuencia,t_ns\\n" rellenado hasta
+    packet_size, donde t_ns es time.monotonic_ns() al enviarlo: como el
+    dispositivo simulado corre en el mismo proceso, el receptor puede
+    calcular la latencia de extremo a extremo de cada paquete.
+    """
+
+    def __init__(self, rate=100, packet_size=64, count=None, payload=None):
+        """
+        Args:
+            rate: Paquetes por segundo (0 = tan rápido como se pueda)
+            packet_size: Bytes por paquete
+            count: Paquetes a enviar (None = sin límite)
+            payload: Función (secuencia) -> bytes para generar paquetes propios
+        """
+        self.rate = rate
+        self.packet_size = packet_size
+        self.count = count
+        self.payload = payload or self._default_payload
+
+    def _default_payload(self, seq):
+        header = f"{seq},{time.monotonic_ns()},".encode('ascii')
+        padding = max(0, self.packet_size - len(header) - 1)
+        return header + b'x' * padding + b'\n'
+
+    def chunks(self, stop_event):
+        """
+        Genera los bloques a escribir, respetando la tasa.
+
+        Con tasas altas se agrupan en un bloque todos los paquetes que ya
+        deberían haberse enviado, en lugar de dormir entre cada uno.
+
+        Args:
+            stop_event: Event que detiene la generación
+
+        Yields:
+            bytes: Bloque de uno o más paquetes
+        """
+        seq = 0
+        start = time.monotonic()
+
+        while not stop_event.is_set() and (self.count is None or seq < self.count):
+            if self.rate:
+                due = int((time.monotonic() - start) * self.rate) + 1
+                if self.count is not None:
+                    due = min(due, self.count)
+                if due <= seq:
+                    stop_event.wait((seq + 1) / self.rate - (time.monotonic() - start))
+                    continue
+            else:
+                due = seq + max(1, 65536 // self.packet_size)
+                if self.count is not None:
+                    due = min(due, self.count)
+
+            yield b''.join(self.payload(n) for n in range(seq, due))
+            seq = due
+
+
+class ReplayTraffic:
+    """
+    Reproduce bloques grabados respetando sus tiempos relativos.
+    """
+
+    def __init__(self, records, speed=1.0, loop=False):
+        """
+        Args:
+            records: Lista de tuplas (segundos_desde_inicio, bytes)
+            speed: Factor de velocidad (2.0 = el doble de rápido, 0 = sin esperas)
+            loop: Si True, vuelve a empezar al terminar
+        """
+        self.records = list(records)
+        self.speed = speed
+        self.loop = loop
+
+    @classmethod
+    def from_file(cls, path, packet_size=64, rate=100, **kwargs):
+        """
+        Crea una reproducción a partir de un archivo de bytes crudos.
+
+        Args:
+            path: Archivo a reproducir
+            packet_size: Bytes por bloque
+            rate: Bloques por segundo
+            **kwargs: Ver ReplayTraffic
+
+        Returns:
+            ReplayTraffic: Reproducción del archivo
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        records = [(i / packet_size / rate, data[i:i + packet_size])
+                   for i in range(0, len(data), packet_size)]
+        return cls(records, **kwargs)
+
+    def chunks(self, stop_event):
+        """
+        Genera los bloques grabados en su momento.
+
+        Args:
+            stop_event: Event que detiene la reproducción
+
+        Yields:
+            bytes: Bloque grabado
+        """
+        while not stop_event.is_set():
+            start = time.monotonic()
+            for offset, data in self.records:
+                if self.speed:
+                    wait = offset / self.speed - (time.monotonic() - start)
+                    if wait > 0 and stop_event.wait(wait):
+                        return
+                yield data
+            if not self.loop:
+                return
+
+
+class SimulatedDevice:
+    """Dispositivo RFCOMM simulado."""
+
+    def __init__(self, address, name="Dispositivo simulado", ports=(1,),
+                 traffic=None, responder=None):
+        """
+        Args:
+            address: Dirección MAC simulada
+            name: Nombre que devuelve el descubrimiento
+            ports: Puertos RFCOMM que aceptan conexiones
+            traffic: Fuente de datos (SyntheticTraffic, ReplayTraffic o
+                cualquier objeto con chunks(stop_event)); None = no envía nada
+            responder: Función (bytes recibidos) -> bytes de respuesta o
+                None, para simular firmware que responde a comandos
+        """
+        self.address = address
+        self.name = name
+        self.ports = tuple(ports)
+        self.traffic = traffic
+        self.responder = responder
+
+    def services(self):
+        """
+        Returns:
+            list: Servicios en el formato de bluetooth.find_service()
+        """
+        return [
+            {
+                'name': 'Serial Port',
+                'protocol': 'RFCOMM',
+                'port': port,
+                'host': self.address,
+                'service-classes': ['1101'],
+                'profiles': [],
+                'description': None,
+                'provider': None,
+                'service-id': None,
+            }
+            for port in self.ports
+        ]
+
+
+class SimulatedSocket:
+    """
+    Socket con la interfaz de BluetoothSocket sobre un socketpair local.
+
+    Al conectar, el otro extremo del par lo atienden los hilos del
+    dispositivo simulado: uno escribe su tráfico y otro lee lo que envía
+    la aplicación (y responde si el dispositivo tiene responder).
+    El resto de métodos (recv, recv_into, send, sendall, setblocking,
+    fileno, getsockopt...) son los del socket local.
+    """
+
+    def __init__(self, transport):
+        self._transport = transport
+        self._sock, self._peer = socket.socketpair()
+        self._stop_event = threading.Event()
+        self._send_lock = threading.Lock()
+        self.device = None
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+    def connect(self, address):
+        """
+        Conecta con un dispositivo simulado.
+
+        Args:
+            address: Tupla (dirección MAC, puerto)
+
+        Raises:
+            OSError: Si el dispositivo no existe o no escucha en el puerto
+        """
+        device_address, port = address
+        device = self._transport.devices.get(device_address)
+        if device is None:
+            raise OSError(errno.EHOSTDOWN, os.strerror(errno.EHOSTDOWN))
+        if port not in device.ports:
+            raise OSError(errno.ECONNREFUSED, os.strerror(errno.ECONNREFUSED))
+
+        if self._transport.connect_delay:
+            time.sleep(self._transport.connect_delay)
+
+        self.device = device
+        if device.traffic is not None:
+            threading.Thread(target=self._write_loop, daemon=True).start()
+        threading.Thread(target=self._read_loop, daemon=True).start()
+        logger.debug(f"Socket simulado conectado a {device_address} en puerto {port}")
+
+    def close(self):
+        """Cierra ambos extremos y detiene el dispositivo simulado."""
+        self._stop_event.set()
+        self._sock.close()
+        try:
+            self._peer.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._peer.close()
+
+    def _peer_send(self, data):
+        with self._send_lock:
+            self._peer.sendall(data)
+
+    def _write_loop(self):
+        """Escribe el tráfico del dispositivo (hilo del dispositivo)."""
+        try:
+            for chunk in self.device.traffic.chunks(self._stop_event):
+                self._peer_send(chunk)
+        except OSError:
+            pass  # La aplicación cerró el socket
+
+    def _read_loop(self):
+        """Lee lo que envía la aplicación (hilo del dispositivo)."""
+        try:
+            while not self._stop_event.is_set():
+                data = self._peer.recv(4096)
+                if not data:
+                    break
+                if self.device.responder:
+                    reply = self.device.responder(data)
+                    if reply:
+                        self._peer_send(reply)
+        except OSError:
+            pass
+
+
+class SimulatedTransport:
+    """
+    Transporte sin hardware: dispositivos, SDP y sockets simulados.
+
+    Permite medir y probar la ruta recepción → procesamiento en cualquier
+    Linux sin adaptador Bluetooth:
+
+        transport = SimulatedTransport([
+            SimulatedDevice("00:11:22:33:44:55", "Sensor",
+                            traffic=SyntheticTraffic(rate=1000, packet_size=32))
+        ])
+        bt = BluetoothManager(transport=transport)
+    """
+
+    def __init__(self, devices=(), scan_delay=0.0, sdp_delay=0.0, connect_delay=0.0):
+        """
+        Args:
+            devices: Dispositivos simulados
+            scan_delay: Segundos que tarda cada escaneo (como máximo su duración)
+            sdp_delay: Segundos que tarda cada búsqueda SDP
+            connect_delay: Segundos que tarda cada conexión
+        """
+        self.devices = {device.address: device for device in devices}
+        self.scan_delay = scan_delay
+        self.sdp_delay = sdp_delay
+        self.connect_delay = connect_delay
+
+    def add_device(self, device):
+        """Agrega un dispositivo simulado (aparece en el próximo escaneo)."""
+        self.devices[device.address] = device
+
+    def remove_device(self, device_address):
+        """Quita un dispositivo simulado (las conexiones abiertas siguen)."""
+        self.devices.pop(device_address, None)
+
+    def discover_devices(self, duration=8):
+        """Ver BluezTransport.discover_devices."""
+        if self.scan_delay:
+            time.sleep(min(self.scan_delay, duration))
+        return [(device.address, device.name) for device in list(self.devices.values())]
+
+    def find_service(self, device_address):
+        """Ver BluezTransport.find_service."""
+        if self.sdp_delay:
+            time.sleep(self.sdp_delay)
+        device = self.devices.get(device_address)
+        return device.services() if device else []
+
+    def create_socket(self):
+        """Ver BluezTransport.create_socket."""
+        return SimulatedSocket(self)
@@ -0,0 +1,281 @@
+"""
+Lista virtualizada de dispositivos
+"""
+
+import customtkinter as ctk
+import math
+import sys
+
+
+class VirtualDeviceList(ctk.CTkFrame):
+    """
+    Lista de dispositivos que solo crea widgets para las filas visibles.
+
+    Un CTkScrollableFrame con una fila por dispositivo crea cuatro
+    widgets por cada uno y los destruye en cada escaneo. Aquí hay un
+    pool fijo de filas, del tamaño del área visible, que se reutilizan
+    al desplazarse: cada fila solo cambia su texto y su posición.
+
+    Los cambios se aplican por dirección MAC (upsert/remove) y una fila
+    solo se reconfigura si el dispositivo que muestra cambió.
+    """
+
+    def __init__(self, master, on_select, empty_text="", row_height=64, **kwargs):
+        """
+        Inicializa la lista.
+
+        Args:
+            master: Widget padre
+            on_select: Función (dispositivo) a llamar al pulsar "Seleccionar"
+            empty_text: Mensaje a mostrar cuando la lista está vacía
+            row_height: Alto de cada fila en píxeles
+        """
+        super().__init__(master, **kwargs)
+
+        self.on_select = on_select
+        self.row_height = row_height
+
+        self._devices = []    # Dispositivos en orden de visualización
+        self._positions = {}  # Dirección MAC -> índice en _devices
+        self._offset = 0      # Píxeles desplazados desde el inicio
+        self._rows = []       # Pool de filas reutilizables
+
+        self._viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self._viewport.pack(side="left", fill="both", expand=True)
+
+        self._scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self._scrollbar.pack(side="right", fill="y")
+
+        self._empty_label = ctk.CTkLabel(
+            self._viewport,
+            text=empty_text,
+            font=("Arial", 12),
+            text_color="gray"
+        )
+
+        self._viewport.bind("<Configure>", self._on_resize)
+
+        # La rueda se enlaza a nivel de aplicación porque en algunas
+        # plataformas el evento va al widget con el foco y no al que está
+        # bajo el puntero; _is_inside() filtra y destroy() lo desenlaza
+        if sys.platform.startswith("linux"):
+            sequences = ("<Button-4>", "<Button-5>")
+        else:
+            sequences = ("<MouseWheel>",)
+        self._wheel_bindings = [
+            (sequence, self.bind_all(sequence, self._on_mouse_wheel, add="+"))
+            for sequence in sequences
+        ]
+
+        self._render()
+
+    def destroy(self):
+        """Quita los enlaces de la rueda y destruye la lista."""
+        for sequence, funcid in self._wheel_bindings:
+            # unbind_all() quitaría también los enlaces de otros widgets:
+            # se borra solo la línea de este callback del script de 'all'
+            script = self.tk.call('bind', 'all', sequence)
+            lines = [line for line in script.split('\n') if funcid not in line]
+            self.tk.call('bind', 'all', sequence, '\n'.join(lines))
+            self.deletecommand(funcid)
+        self._wheel_bindings = []
+        super().destroy()
+
+    # ========== API DE DATOS ==========
+
+    def set_devices(self, devices):
+        """
+        Reemplaza el contenido de la lista.
+
+        Los dispositivos que ya estaban conservan su posición; los nuevos
+        se agregan al final y los ausentes se quitan.
+
+        Args:
+            devices: Lista de diccionarios con 'name' y 'address'
+        """
+        incoming = {device['address']: device for device in devices}
+
+        updated = [incoming.pop(device['address']) for device in self._devices
+                   if device['address'] in incoming]
+        updated.extend(incoming.values())
+
+        self._devices = updated
+        self._positions = {}
+        self._reindex(0)
+        self._render()
+
+    def upsert(self, device):
+        """
+        Agrega un dispositivo o actualiza el existente con la misma MAC.
+
+        Args:
+            device: Diccionario con 'name' y 'address'
+        """
+        index = self._positions.get(device['address'])
+        if index is None:
+            self._positions[device['address']] = len(self._devices)
+            self._devices.append(device)
+        else:
+            self._devices[index] = device
+        self._render()
+
+    def remove(self, address):
+        """
+        Quita un dispositivo de la lista.
+
+        Args:
+            address: Dirección MAC del dispositivo
+        """
+        index = self._positions.pop(address, None)
+        if index is None:
+            return
+        del self._devices[index]
+        self._reindex(index)
+        self._render()
+
+    def clear(self):
+        """Vacía la lista."""
+        self._devices = []
+        self._positions = {}
+        self._offset = 0
+        self._render()
+
+    def get_devices(self):
+        """
+        Obtiene los dispositivos de la lista.
+
+        Returns:
+            list: Dispositivos en orden de visualización
+        """
+        return list(self._devices)
+
+    def __len__(self):
+        return len(self._devices)
+
+    def _reindex(self, start):
+        """Recalcula las posiciones desde el índice indicado."""
+        for index in range(start, len(self._devices)):
+            self._positions[self._devices[index]['address']] = index
+
+    # ========== FILAS ==========
+
+    def _create_row(self):
+        """
+        Crea una fila del pool.
+
+        Returns:
+            dict: Widgets de la fila y el dispositivo que muestra
+        """
+        frame = ctk.CTkFrame(self._viewport, height=self.row_height - 10, corner_radius=10)
+        frame.pack_propagate(False)  # Alto fijo: el desplazamiento depende de ello
+
+        info_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        info_frame.pack(side="left", fill="both", expand=True, padx=10, pady=5)
+
+        name_label = ctk.CTkLabel(info_frame, text="", font=("Arial", 14, "bold"), anchor="w")
+        name_label.pack(anchor="w")
+
+        address_label = ctk.CTkLabel(
+            info_frame, text="", font=("Courier", 11), text_color="gray", anchor="w"
+        )
+        address_label.pack(anchor="w")
+
+        row = {'frame': frame, 'name': name_label, 'address': address_label, 'shown': None}
+
+        select_button = ctk.CTkButton(
+            frame,
+            text="Seleccionar",
+            command=lambda r=row: self._select(r),
+            width=120
+        )
+        select_button.pack(side="right", padx=10)
+
+        return row
+
+    def _ensure_pool(self):
+        """Ajusta el pool al número de filas que caben en el área visible."""
+        needed = math.ceil(self._viewport.winfo_height() / self.row_height) + 1
+        while len(self._rows) < needed:
+            self._rows.append(self._create_row())
+
+    def _select(self, row):
+        if row['shown'] is None:
+            return
+        index = self._positions.get(row['shown'][0])
+        if index is not None:
+            self.on_select(self._devices[index])
+
+    def _render(self):
+        """Actualiza las filas visibles y la barra de desplazamiento."""
+        view_height = max(self._viewport.winfo_height(), 1)
+        total_height = len(self._devices) * self.row_height
+
+        self._offset = max(0, min(self._offset, total_height - view_height))
+        if total_height > view_height:
+            self._scrollbar.set(self._offset / total_height,
+                                (self._offset + view_height) / total_height)
+        else:
+            self._scrollbar.set(0, 1)
+
+        if self._devices:
+            self._empty_label.place_forget()
+        else:
+            self._empty_label.place(relx=0.5, rely=0.5, anchor="center")
+
+        first = self._offset // self.row_height
+        shift = self._offset % self.row_height
+
+        for k, row in enumerate(self._rows):
+            index = first + k
+            if index >= len(self._devices):
+                if row['shown'] is not None:
+                    row['frame'].place_forget()
+                    row['shown'] = None
+                continue
+
+            device = self._devices[index]
+            shown = (device['address'], device['name'])
+            if row['shown'] != shown:
+                row['name'].configure(text=f"📱 {device['name']}")
+                row['address'].configure(text=f"MAC: {device['address']}")
+                row['shown'] = shown
+            row['frame'].place(relx=0.01, relwidth=0.98, y=k * self.row_height - shift + 5)
+
+    # ========== DESPLAZAMIENTO ==========
+
+    def _scroll_to(self, offset):
+        self._offset = int(offset)
+        self._render()
+
+    def _on_scrollbar(self, action, value, units=None):
+        if action == 'moveto':
+            self._scroll_to(float(value) * len(self._devices) * self.row_height)
+        elif action == 'scroll':
+            step = self._viewport.winfo_height() if units == 'pages' else self.row_height // 4
+            self._scroll_to(self._offset + int(value) * step)
+
+    def _on_mouse_wheel(self, event):
+        if not self.winfo_exists() or not self._is_inside(event):
+            return
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        elif abs(event.delta) >= 120:
+            steps = -event.delta // 120  # Windows
+        else:
+            steps = -event.delta  # macOS
+        self._scroll_to(self._offset + steps * (self.row_height // 2))
+
+    def _is_inside(self, event):
+        """Indica si el puntero está sobre la lista."""
+        widget = self.winfo_containing(event.x_root, event.y_root)
+        if widget is None:
+            return False
+        # Comparar por componentes: '.!frame2' no contiene a '.!frame21'
+        path, own = str(widget), str(self)
+        return path == own or path.startswith(own + '.')
+
+    def _on_resize(self, event):
+        self._ensure_pool()
+        self._render()
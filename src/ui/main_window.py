@@ -4,11 +4,18 @@ Ventana principal de la aplicación
 
 import customtkinter as ctk
 from tkinter import messagebox, filedialog
+from collections import deque
 import logging
 import threading
 
+from src.capture import BinaryCaptureWriter, CaptureWriter
+from src.ui.device_list import VirtualDeviceList
+
 logger = logging.getLogger(__name__)
 
+# Velocidades de reproducción de capturas (0 = sin esperas)
+REPLAY_SPEEDS = {"1x": 1, "2x": 2, "10x": 10, "Máxima": 0}
+
 
 class MainWindow:
     """
@@ -31,9 +38,26 @@ class MainWindow:
         self.config = config
         
         # Lista de dispositivos encontrados
-        self.devices_list = []
         self.selected_device = None
         
+        # Grabación continua de frames (ver toggle_capture)
+        self.capture = None
+        
+        # Consola acotada: líneas actuales, máximo y si sigue el final
+        self._console_lines = 0
+        self._console_max_lines = self.config.get('console_max_lines', 5000)
+        self.follow_tail = True
+        
+        # Cola de registros pendientes de mostrar (se llena desde el hilo
+        # de recepción y se vacía en el hilo principal). Cada registro ocupa
+        # al menos una línea, así que nunca se muestran más registros que
+        # líneas tiene la consola: en una ráfaga se descartan los más
+        # antiguos en lugar de acumularlos en memoria y formatearlos
+        self._display_queue = deque(maxlen=self._console_max_lines or 5000)
+        self._display_skipped = 0
+        display_fps = self.config.get('display_fps', 30) or 30
+        self._display_interval_ms = max(1, int(1000 / display_fps))
+        
         # Crear ventana principal
         self.root = ctk.CTk()
         self.root.title("Aplicación Bluetooth - Selector de Dispositivos")
@@ -45,6 +69,9 @@ class MainWindow:
         # Crear interfaz
         self._create_widgets()
         
+        # Programar el refresco periódico de la consola de datos
+        self.root.after(self._display_interval_ms, self._drain_display_queue)
+        
         logger.info("Ventana principal creada")
     
     def _create_widgets(self):
@@ -73,6 +100,14 @@ class MainWindow:
         )
         self.scan_button.pack(pady=5)
         
+        # Interruptor de descubrimiento continuo en segundo plano
+        self.continuous_switch = ctk.CTkSwitch(
+            connection_frame,
+            text="Escaneo continuo",
+            command=self.toggle_continuous_discovery
+        )
+        self.continuous_switch.pack(pady=5)
+        
         # Label de estado de escaneo
         self.scan_status_label = ctk.CTkLabel(
             connection_frame,
@@ -92,22 +127,28 @@ class MainWindow:
         )
         devices_label.pack(pady=10)
         
+        # Botón de diagnóstico de todos los dispositivos encontrados
+        self.diagnose_all_button = ctk.CTkButton(
+            devices_frame,
+            text="🔍 Diagnosticar todos",
+            command=self.diagnosticar_todos,
+            width=180,
+            fg_color="purple",
+            hover_color="darkviolet"
+        )
+        self.diagnose_all_button.pack(pady=5)
+        
         # Frame con scrollbar para la lista de dispositivos
         list_frame = ctk.CTkFrame(devices_frame)
         list_frame.pack(fill="both", expand=True, padx=10, pady=5)
         
-        # ScrollableFrame para dispositivos
-        self.devices_scrollable = ctk.CTkScrollableFrame(list_frame)
-        self.devices_scrollable.pack(fill="both", expand=True)
-        
-        # Mensaje cuando no hay dispositivos
-        self.no_devices_label = ctk.CTkLabel(
-            self.devices_scrollable,
-            text="No hay dispositivos escaneados.\nPresiona 'Escanear Dispositivos' para comenzar.",
-            font=("Arial", 12),
-            text_color="gray"
+        # Lista virtualizada: solo crea widgets para las filas visibles
+        self.device_list = VirtualDeviceList(
+            list_frame,
+            on_select=self.select_device,
+            empty_text="No hay dispositivos escaneados.\nPresiona 'Escanear Dispositivos' para comenzar."
         )
-        self.no_devices_label.pack(pady=50)
+        self.device_list.pack(fill="both", expand=True)
         
         # ========== FRAME DE CONEXIÓN ==========
         connect_frame = ctk.CTkFrame(self.root)
@@ -158,6 +199,16 @@ class MainWindow:
         )
         self.disconnect_button.pack(side="left", padx=5)
         
+        # Botón para abrir una sesión simultánea con el dispositivo
+        self.session_button = ctk.CTkButton(
+            button_frame,
+            text="➕ Sesión adicional",
+            command=self.open_additional_session,
+            width=150,
+            state="disabled"
+        )
+        self.session_button.pack(side="left", padx=5)
+        
         # Estado de conexión
         self.connection_status_label = ctk.CTkLabel(
             connect_frame,
@@ -167,6 +218,15 @@ class MainWindow:
         )
         self.connection_status_label.pack(pady=5)
         
+        # Sesiones simultáneas activas
+        self.sessions_label = ctk.CTkLabel(
+            connect_frame,
+            text="",
+            font=("Arial", 12),
+            text_color="gray"
+        )
+        self.sessions_label.pack()
+        
         # ========== FRAME INFERIOR: DATOS RECIBIDOS ==========
         data_frame = ctk.CTkFrame(self.root)
         data_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -186,14 +246,54 @@ class MainWindow:
         )
         self.data_textbox.pack(fill="both", expand=True, padx=5, pady=5)
         
+        data_buttons_frame = ctk.CTkFrame(data_frame, fg_color="transparent")
+        data_buttons_frame.pack(pady=5)
+        
         # Botón para limpiar datos
         clear_button = ctk.CTkButton(
-            data_frame,
+            data_buttons_frame,
             text="🗑️ Limpiar Datos",
             command=self.clear_data_display,
             width=150
         )
-        clear_button.pack(pady=5)
+        clear_button.pack(side="left", padx=5)
+        
+        # Interruptor para pausar/seguir el final de la consola
+        self.follow_switch = ctk.CTkSwitch(
+            data_buttons_frame,
+            text="Seguir final",
+            command=self.toggle_follow_tail
+        )
+        self.follow_switch.select()
+        self.follow_switch.pack(side="left", padx=5)
+        
+        # Interruptor para grabar en disco todos los frames recibidos
+        self.capture_switch = ctk.CTkSwitch(
+            data_buttons_frame,
+            text="Grabar captura",
+            command=self.toggle_capture
+        )
+        self.capture_switch.pack(side="left", padx=5)
+        
+        # Reproducción de una captura grabada por la misma ruta que los datos en vivo
+        self.replay_button = ctk.CTkButton(
+            data_buttons_frame,
+            text="▶️ Reproducir captura",
+            command=self.toggle_replay,
+            width=170
+        )
+        self.replay_button.pack(side="left", padx=5)
+        
+        self.replay_speed_menu = ctk.CTkOptionMenu(
+            data_buttons_frame,
+            values=list(REPLAY_SPEEDS),
+            width=90
+        )
+        speed = self.config.get('replay_speed', 1)
+        self.replay_speed_menu.set(
+            next((label for label, value in REPLAY_SPEEDS.items() if value == speed), "1x")
+        )
+        self.replay_speed_menu.pack(side="left", padx=5)
     
     def start_scan(self):
         """
@@ -208,8 +308,7 @@ class MainWindow:
             text_color="orange"
         )
         
-        # Limpiar lista anterior
-        self.clear_device_list()
+        # La lista anterior se conserva: al terminar solo se aplican las diferencias
         
         # Ejecutar escaneo en hilo separado
         scan_thread = threading.Thread(target=self._perform_scan, daemon=True)
@@ -242,26 +341,15 @@ class MainWindow:
         Args:
             devices: Lista de dispositivos encontrados
         """
-        self.devices_list = devices
-        
-        # Limpiar widgets anteriores
-        self.clear_device_list()
+        # Aplicar solo las diferencias con la lista mostrada
+        self.device_list.set_devices(devices)
         
         if not devices:
-            # Mostrar mensaje si no hay dispositivos
-            self.no_devices_label.pack(pady=50)
             self.scan_status_label.configure(
                 text=f"No se encontraron dispositivos. Intenta escanear nuevamente.",
                 text_color="red"
             )
         else:
-            # Ocultar mensaje de "no dispositivos"
-            self.no_devices_label.pack_forget()
-            
-            # Crear un widget por cada dispositivo
-            for idx, device in enumerate(devices):
-                self._create_device_widget(device, idx)
-            
             self.scan_status_label.configure(
                 text=f"✓ Se encontraron {len(devices)} dispositivo(s)",
                 text_color="green"
@@ -270,53 +358,6 @@ class MainWindow:
         # Rehabilitar botón de escaneo
         self.scan_button.configure(state="normal", text="🔍 Escanear Dispositivos")
     
-    def _create_device_widget(self, device, index):
-        """
-        Crea un widget para mostrar un dispositivo.
-        
-        Args:
-            device: Diccionario con información del dispositivo
-            index: Índice del dispositivo en la lista
-        """
-        # Frame para cada dispositivo
-        device_frame = ctk.CTkFrame(
-            self.devices_scrollable,
-            corner_radius=10
-        )
-        device_frame.pack(fill="x", padx=10, pady=5)
-        
-        # Frame de información
-        info_frame = ctk.CTkFrame(device_frame, fg_color="transparent")
-        info_frame.pack(side="left", fill="both", expand=True, padx=10, pady=10)
-        
-        # Nombre del dispositivo
-        name_label = ctk.CTkLabel(
-            info_frame,
-            text=f"📱 {device['name']}",
-            font=("Arial", 14, "bold"),
-            anchor="w"
-        )
-        name_label.pack(anchor="w")
-        
-        # Dirección MAC
-        address_label = ctk.CTkLabel(
-            info_frame,
-            text=f"MAC: {device['address']}",
-            font=("Courier", 11),
-            text_color="gray",
-            anchor="w"
-        )
-        address_label.pack(anchor="w")
-        
-        # Botón de selección
-        select_button = ctk.CTkButton(
-            device_frame,
-            text="Seleccionar",
-            command=lambda d=device: self.select_device(d),
-            width=120
-        )
-        select_button.pack(side="right", padx=10)
-    
     def select_device(self, device):
         """
         Selecciona un dispositivo de la lista.
@@ -335,6 +376,7 @@ class MainWindow:
         # Habilitar botones de diagnóstico y conexión
         self.diagnostic_button.configure(state="normal")
         self.connect_button.configure(state="normal")
+        self.session_button.configure(state="normal")
         
         logger.info(f"Dispositivo seleccionado: {device['name']} - {device['address']}")
     
@@ -362,17 +404,21 @@ class MainWindow:
         )
         diagnostic_thread.start()
     
-    def _perform_diagnostic(self):
+    def _perform_diagnostic(self, use_cache=True):
         """
         Realiza el diagnóstico en un hilo separado.
         
         Este método NO debe interactuar directamente con la UI.
+        
+        Args:
+            use_cache: Si False, fuerza una búsqueda SDP nueva
         """
         try:
             # Realizar diagnóstico
             resultado = self.bt_manager.diagnosticar_dispositivo(
                 self.selected_device['address'],
-                self.selected_device['name']
+                self.selected_device['name'],
+                use_cache=use_cache
             )
             
             # Actualizar UI en el hilo principal
@@ -446,6 +492,27 @@ class MainWindow:
         details_textbox.insert("1.0", resultado['detalles'])
         details_textbox.configure(state="disabled")  # Solo lectura
         
+        # Indicar si el resultado salió de la caché SDP y permitir repetirlo
+        if resultado.get('desde_cache'):
+            cache_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+            cache_frame.pack(pady=5)
+            
+            cache_label = ctk.CTkLabel(
+                cache_frame,
+                text="ℹ️ Servicios obtenidos de la caché SDP",
+                font=("Arial", 11),
+                text_color="gray"
+            )
+            cache_label.pack(side="left", padx=5)
+            
+            refresh_button = ctk.CTkButton(
+                cache_frame,
+                text="🔄 Repetir búsqueda SDP",
+                command=lambda: self._repetir_diagnostico(ventana_diagnostico),
+                width=180
+            )
+            refresh_button.pack(side="left", padx=5)
+        
         # Botón de cerrar
         close_button = ctk.CTkButton(
             main_frame,
@@ -470,6 +537,23 @@ class MainWindow:
             )
             connect_button.pack(pady=5)
     
+    def _repetir_diagnostico(self, ventana):
+        """
+        Repite el diagnóstico ignorando la caché SDP.
+        
+        Args:
+            ventana: Ventana de diagnóstico a cerrar
+        """
+        ventana.destroy()
+        self.diagnostic_button.configure(state="disabled", text="⏳ Diagnosticando...")
+        
+        diagnostic_thread = threading.Thread(
+            target=self._perform_diagnostic,
+            kwargs={'use_cache': False},
+            daemon=True
+        )
+        diagnostic_thread.start()
+    
     def _conectar_con_puerto(self, puerto, ventana):
         """
         Conecta usando un puerto específico sugerido por el diagnóstico.
@@ -478,15 +562,11 @@ class MainWindow:
             puerto: Puerto RFCOMM a usar
             ventana: Ventana de diagnóstico a cerrar
         """
-        # Guardar puerto sugerido
-        if not hasattr(self, '_puerto_sugerido'):
-            self._puerto_sugerido = puerto
-        
         # Cerrar ventana de diagnóstico
         ventana.destroy()
         
         # Conectar
-        self.connect_to_device()
+        self.connect_to_device(port=puerto)
     
     def _diagnostic_error(self, error_msg):
         """
@@ -502,8 +582,158 @@ class MainWindow:
             f"Error al diagnosticar el dispositivo:\n\n{error_msg}"
         )
     
-    def connect_to_device(self):
-        """Conecta al dispositivo seleccionado."""
+    def diagnosticar_todos(self):
+        """
+        Diagnostica en paralelo todos los dispositivos de la lista.
+        
+        Los resultados se muestran en una tabla a medida que llegan.
+        """
+        if not len(self.device_list):
+            messagebox.showwarning(
+                "Sin dispositivos",
+                "Primero escanea dispositivos para poder diagnosticarlos"
+            )
+            return
+        
+        devices = self.device_list.get_devices()
+        self.diagnose_all_button.configure(state="disabled", text="⏳ Diagnosticando...")
+        
+        # Ventana con la tabla de compatibilidad
+        ventana = ctk.CTkToplevel(self.root)
+        ventana.title(f"Diagnóstico de {len(devices)} dispositivos")
+        ventana.geometry("700x500")
+        ventana.transient(self.root)
+        
+        main_frame = ctk.CTkFrame(ventana)
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        progress_label = ctk.CTkLabel(
+            main_frame,
+            text=f"Diagnosticando 0/{len(devices)}...",
+            font=("Arial", 14, "bold"),
+            text_color="orange"
+        )
+        progress_label.pack(pady=10)
+        
+        table_textbox = ctk.CTkTextbox(main_frame, font=("Courier", 11))
+        table_textbox.pack(fill="both", expand=True, pady=5)
+        table_textbox.insert("end", f"{'Resultado':<20}{'MAC':<20}{'Puerto':<8}Nombre\n")
+        table_textbox.configure(state="disabled")
+        
+        close_button = ctk.CTkButton(
+            main_frame,
+            text="Cerrar",
+            command=ventana.destroy,
+            width=150
+        )
+        close_button.pack(pady=10)
+        
+        def perform():
+            completados = 0
+            
+            def on_result(resultado):
+                nonlocal completados
+                completados += 1
+                self.root.after(0, self._agregar_fila_diagnostico, table_textbox,
+                                progress_label, resultado, f"{completados}/{len(devices)}")
+            
+            try:
+                resultados = self.bt_manager.diagnosticar_dispositivos(
+                    devices,
+                    max_workers=self.config.get('diagnostic_workers', 8),
+                    timeout=self.config.get('diagnostic_timeout', 15),
+                    callback=on_result
+                )
+                self.root.after(0, self._finalizar_diagnostico_multiple,
+                                table_textbox, progress_label, resultados)
+            except Exception as e:
+                logger.error(f"Error en diagnóstico múltiple: {e}")
+                self.root.after(0, self._diagnostico_multiple_error, ventana, str(e))
+        
+        threading.Thread(target=perform, daemon=True).start()
+    
+    def _formatear_fila_diagnostico(self, resultado):
+        """
+        Formatea un resultado de diagnóstico como fila de la tabla.
+        
+        Args:
+            resultado: Resultado de diagnosticar_dispositivos()
+            
+        Returns:
+            str: Fila de la tabla
+        """
+        puerto = resultado['puerto_sugerido'] or '-'
+        return (f"{resultado['mensaje']:<20}{resultado['address']:<20}"
+                f"{puerto!s:<8}{resultado['name']}\n")
+    
+    def _agregar_fila_diagnostico(self, textbox, progress_label, resultado, progreso):
+        """
+        Agrega a la tabla un resultado recién llegado.
+        
+        Args:
+            textbox: CTkTextbox de la tabla
+            progress_label: Label con el progreso
+            resultado: Resultado de un dispositivo
+            progreso: Texto "completados/total"
+        """
+        if not textbox.winfo_exists():
+            return
+        
+        textbox.configure(state="normal")
+        textbox.insert("end", self._formatear_fila_diagnostico(resultado))
+        textbox.configure(state="disabled")
+        progress_label.configure(text=f"Diagnosticando {progreso}...")
+    
+    def _finalizar_diagnostico_multiple(self, textbox, progress_label, resultados):
+        """
+        Muestra la tabla final, con los dispositivos compatibles primero.
+        
+        Args:
+            textbox: CTkTextbox de la tabla
+            progress_label: Label con el progreso
+            resultados: Lista retornada por diagnosticar_dispositivos()
+        """
+        self.diagnose_all_button.configure(state="normal", text="🔍 Diagnosticar todos")
+        
+        if not textbox.winfo_exists():
+            return
+        
+        ordenados = sorted(resultados, key=lambda r: not r['compatible'])
+        compatibles = sum(1 for r in resultados if r['compatible'])
+        
+        textbox.configure(state="normal")
+        textbox.delete("2.0", "end")
+        textbox.insert("end", ''.join(self._formatear_fila_diagnostico(r) for r in ordenados))
+        textbox.configure(state="disabled")
+        
+        progress_label.configure(
+            text=f"✅ {compatibles} de {len(resultados)} dispositivos compatibles",
+            text_color="green" if compatibles else "red"
+        )
+    
+    def _diagnostico_multiple_error(self, ventana, error_msg):
+        """
+        Maneja errores del diagnóstico múltiple.
+        
+        Args:
+            ventana: Ventana de la tabla
+            error_msg: Mensaje de error
+        """
+        self.diagnose_all_button.configure(state="normal", text="🔍 Diagnosticar todos")
+        if ventana.winfo_exists():
+            ventana.destroy()
+        messagebox.showerror(
+            "Error de Diagnóstico",
+            f"Error al diagnosticar los dispositivos:\n\n{error_msg}"
+        )
+    
+    def connect_to_device(self, port=None):
+        """
+        Conecta al dispositivo seleccionado.
+        
+        Args:
+            port: Puerto RFCOMM (None = puerto en caché SDP o 1)
+        """
         if not self.selected_device:
             messagebox.showwarning(
                 "Sin dispositivo",
@@ -524,15 +754,27 @@ class MainWindow:
         # Conectar en hilo separado
         connect_thread = threading.Thread(
             target=self._perform_connection,
+            args=(port,),
             daemon=True
         )
         connect_thread.start()
     
-    def _perform_connection(self):
-        """Realiza la conexión en un hilo separado."""
+    def _perform_connection(self, port=None):
+        """
+        Realiza la conexión en un hilo separado.
+        
+        Args:
+            port: Puerto RFCOMM (None = puerto en caché SDP o 1)
+        """
         try:
+            address = self.selected_device['address']
+            if port is None:
+                port = self.bt_manager.get_cached_port(address) or 1
+            
             # Intentar conexión
-            success = self.bt_manager.connect(self.selected_device['address'])
+            success = self.bt_manager.connect(
+                address, port, device_name=self.selected_device['name']
+            )
             
             # Actualizar UI según resultado
             self.root.after(0, self._connection_result, success)
@@ -577,6 +819,63 @@ class MainWindow:
                 "• El dispositivo acepta conexiones"
             )
     
+    def auto_connect(self, device):
+        """
+        Reconecta a un dispositivo conocido sin escanear.
+        
+        Se usa al iniciar la aplicación con el último dispositivo del
+        registro. Si la conexión falla se inicia un escaneo normal.
+        
+        Args:
+            device: Diccionario del registro con 'address', 'name' y 'port'
+        """
+        self.select_device(device)
+        
+        self.connect_button.configure(state="disabled")
+        self.scan_button.configure(state="disabled")
+        self.connection_status_label.configure(
+            text=f"● Reconectando a {device['name']}...",
+            text_color="orange"
+        )
+        
+        def perform():
+            try:
+                success = self.bt_manager.connect_known(
+                    device['address'], device.get('port'), device['name']
+                )
+            except Exception as e:
+                logger.error(f"Error en reconexión automática: {e}")
+                success = False
+            self.root.after(0, self._auto_connection_result, success)
+        
+        threading.Thread(target=perform, daemon=True).start()
+    
+    def _auto_connection_result(self, success):
+        """
+        Maneja el resultado de la reconexión automática.
+        
+        A diferencia de _connection_result(), no muestra diálogos: si
+        falla, vuelve al flujo normal iniciando un escaneo.
+        
+        Args:
+            success: True si la conexión fue exitosa
+        """
+        if success:
+            self.connection_status_label.configure(
+                text="● Conectado",
+                text_color="green"
+            )
+            self.disconnect_button.configure(state="normal")
+            self.connect_button.configure(state="disabled")
+        else:
+            logger.info("Reconexión automática fallida, iniciando escaneo")
+            self.connection_status_label.configure(
+                text="● Desconectado",
+                text_color="red"
+            )
+            self.connect_button.configure(state="normal")
+            self.start_scan()
+    
     def disconnect_from_device(self):
         """Desconecta del dispositivo actual."""
         self.bt_manager.disconnect()
@@ -590,11 +889,106 @@ class MainWindow:
         self.connect_button.configure(state="normal")
         self.scan_button.configure(state="normal")
     
+    def open_additional_session(self):
+        """
+        Abre una sesión simultánea con el dispositivo seleccionado.
+        
+        La sesión se suma a las ya abiertas sin cerrar la conexión actual;
+        sus datos aparecen en la consola con la dirección MAC de origen.
+        """
+        if not self.selected_device:
+            messagebox.showwarning(
+                "Sin dispositivo",
+                "Por favor selecciona un dispositivo primero"
+            )
+            return
+        
+        device = self.selected_device
+        port = self.bt_manager.get_cached_port(device['address']) or 1
+        
+        def perform():
+            success = self.bt_manager.open_session(device['address'], port)
+            if not success:
+                self.root.after(
+                    0,
+                    self.show_error,
+                    f"No se pudo abrir una sesión con {device['name']}"
+                )
+        
+        threading.Thread(target=perform, daemon=True).start()
+    
+    def update_sessions_status(self):
+        """Actualiza el indicador de sesiones simultáneas activas."""
+        sessions = self.bt_manager.get_sessions()
+        if sessions:
+            addresses = ', '.join(session['address'] for session in sessions)
+            self.sessions_label.configure(
+                text=f"Sesiones simultáneas ({len(sessions)}): {addresses}"
+            )
+        else:
+            self.sessions_label.configure(text="")
+    
     def clear_device_list(self):
         """Limpia la lista de dispositivos mostrados."""
-        # Destruir todos los widgets hijos del frame scrollable
-        for widget in self.devices_scrollable.winfo_children():
-            widget.destroy()
+        self.device_list.clear()
+    
+    def toggle_continuous_discovery(self):
+        """
+        Activa o desactiva el descubrimiento continuo de dispositivos.
+        
+        Mientras está activo, la lista se actualiza de forma incremental
+        con cada dispositivo que aparece, cambia o desaparece.
+        """
+        if self.continuous_switch.get():
+            self.scan_button.configure(state="disabled")
+            self.clear_device_list()
+            self.scan_status_label.configure(
+                text="Escaneo continuo activo...",
+                text_color="orange"
+            )
+            self.bt_manager.start_discovery(
+                self._on_discovery_event,
+                window=self.config.get('discovery_window', 2),
+                stale_after=self.config.get('discovery_stale_after', 60)
+            )
+        else:
+            self.bt_manager.stop_discovery()
+            self.scan_button.configure(state="normal")
+            self.scan_status_label.configure(
+                text=f"Escaneo continuo detenido ({len(self.device_list)} dispositivo(s))",
+                text_color="gray"
+            )
+    
+    def _on_discovery_event(self, event, device):
+        """
+        Recibe un cambio del descubrimiento continuo.
+        
+        Se ejecuta en el hilo de descubrimiento; solo reenvía el evento
+        al hilo principal.
+        
+        Args:
+            event: 'added', 'changed' o 'removed'
+            device: Diccionario con información del dispositivo
+        """
+        self.root.after(0, self._apply_discovery_event, event, device)
+    
+    def _apply_discovery_event(self, event, device):
+        """
+        Aplica un cambio del descubrimiento a la lista, sin reconstruirla.
+        
+        Args:
+            event: 'added', 'changed' o 'removed'
+            device: Diccionario con información del dispositivo
+        """
+        if event == 'removed':
+            self.device_list.remove(device['address'])
+        else:
+            self.device_list.upsert(device)
+        
+        self.scan_status_label.configure(
+            text=f"Escaneo continuo activo: {len(self.device_list)} dispositivo(s)",
+            text_color="green"
+        )
     
     def _scan_error(self, error_msg):
         """
@@ -611,31 +1005,223 @@ class MainWindow:
         
         messagebox.showerror("Error de escaneo", f"Error durante el escaneo:\n{error_msg}")
     
-    def update_data_display(self, processed_data):
+    def enqueue_data_display(self, processed_data):
         """
-        Actualiza la visualización de datos recibidos.
+        Encola datos procesados para mostrarlos en el próximo refresco.
+        
+        Es seguro llamarlo desde cualquier hilo: no toca ningún widget,
+        solo agrega el registro a la cola que vacía el hilo principal.
+        
+        Si la cola está llena se descarta el registro más antiguo; la
+        cantidad descartada se indica en la consola en el próximo refresco.
         
         Args:
             processed_data: Datos procesados del manejador de datos
         """
-        # Formatear datos para mostrar
+        queue = self._display_queue
+        if len(queue) == queue.maxlen:
+            self._display_skipped += 1
+        queue.append(processed_data)
+    
+    def _drain_display_queue(self):
+        """
+        Muestra todos los registros pendientes con una sola inserción.
+        
+        Se ejecuta en el hilo principal a la frecuencia configurada en
+        'display_fps'. Como la cola está acotada al máximo de líneas de la
+        consola, cada refresco formatea como mucho ese número de registros,
+        sin importar cuántos paquetes se recibieron.
+        """
+        try:
+            # Con varias sesiones, cada línea indica el dispositivo de origen
+            show_source = bool(self.bt_manager.get_sessions())
+            pending = []
+            
+            skipped, self._display_skipped = self._display_skipped, 0
+            if skipped:
+                pending.append(f"--- {skipped} registros no mostrados (ráfaga) ---\n")
+            
+            # Solo los registros que ya estaban: los que lleguen mientras
+            # tanto esperan al próximo refresco
+            for _ in range(len(self._display_queue)):
+                pending.append(
+                    self._format_data(self._display_queue.popleft(), show_source)
+                )
+            
+            if pending:
+                self._append_to_console(''.join(pending))
+        except Exception as e:
+            logger.error(f"Error actualizando visualización de datos: {e}")
+        finally:
+            self.root.after(self._display_interval_ms, self._drain_display_queue)
+    
+    def _format_data(self, processed_data, show_source=False):
+        """
+        Formatea un registro procesado para la consola de datos.
+        
+        Args:
+            processed_data: Datos procesados del manejador de datos
+            show_source: Si True, incluye la dirección MAC de origen
+            
+        Returns:
+            str: Texto a insertar en la consola
+        """
         timestamp = processed_data['timestamp'].strftime("%H:%M:%S")
         text = processed_data['text']
         hex_data = processed_data['hex']
+        source = processed_data.get('source') if show_source else None
         
-        # Agregar al textbox
-        display_text = f"[{timestamp}] {text}\n"
+        if source:
+            display_text = f"[{timestamp}] [{source}] {text}\n"
+        else:
+            display_text = f"[{timestamp}] {text}\n"
         if hex_data:
             display_text += f"  HEX: {hex_data}\n"
         
-        self.data_textbox.insert("end", display_text)
+        return display_text
+    
+    def update_data_display(self, processed_data):
+        """
+        Actualiza la visualización de datos recibidos.
+        
+        Debe llamarse desde el hilo principal. Desde otros hilos usa
+        enqueue_data_display().
+        
+        Args:
+            processed_data: Datos procesados del manejador de datos
+        """
+        self._append_to_console(self._format_data(processed_data))
+    
+    def _append_to_console(self, text):
+        """
+        Agrega texto a la consola respetando el máximo de líneas.
+        
+        Las líneas más antiguas se eliminan en bloque (al superar el máximo
+        en un 10%) para que el costo de cada inserción se mantenga estable
+        en sesiones largas.
+        
+        Args:
+            text: Texto a agregar, terminado en salto de línea
+        """
+        self.data_textbox.insert("end", text)
+        self._console_lines += text.count("\n")
+        
+        max_lines = self._console_max_lines
+        if max_lines and self._console_lines > max_lines + max(1, max_lines // 10):
+            excess = self._console_lines - max_lines
+            self.data_textbox.delete("1.0", f"{excess + 1}.0")
+            self._console_lines -= excess
+        
+        # Auto-scroll al final solo si el usuario no pausó la consola
+        if self.follow_tail:
+            self.data_textbox.see("end")
+    
+    def toggle_follow_tail(self):
+        """Activa o pausa el desplazamiento automático al final de la consola."""
+        self.follow_tail = bool(self.follow_switch.get())
+        if self.follow_tail:
+            self.data_textbox.see("end")
+    
+    def toggle_capture(self):
+        """Inicia o detiene la grabación continua de frames en disco."""
+        if self.capture_switch.get():
+            options = self.config.get('capture', {})
+            try:
+                common = dict(
+                    directory=options.get('directory', 'capturas'),
+                    max_bytes=int(options.get('max_mb', 64) * 1024 * 1024),
+                    max_seconds=int(options.get('max_minutes', 60) * 60),
+                    fsync_interval=options.get('fsync_seconds', 5)
+                )
+                if options.get('format', 'binary') == 'binary':
+                    self.capture = BinaryCaptureWriter(**common)
+                else:
+                    self.capture = CaptureWriter(compress=options.get('compress', False), **common)
+                self.capture.start(self.bt_manager)
+            except OSError as e:
+                logger.error(f"Error iniciando captura: {e}")
+                self.capture = None
+                self.capture_switch.deselect()
+                self.show_error(f"No se pudo iniciar la captura:\n{e}")
+        else:
+            self.stop_capture()
+    
+    def stop_capture(self):
+        """Detiene la grabación continua si está activa."""
+        if self.capture:
+            self.capture.stop()
+            self.capture = None
+    
+    def toggle_replay(self):
+        """Elige capturas y las reproduce, o detiene la reproducción en curso."""
+        if self.bt_manager.replay and self.bt_manager.replay.running:
+            self.bt_manager.stop_replay()
+            return
         
-        # Auto-scroll al final
-        self.data_textbox.see("end")
+        paths = filedialog.askopenfilenames(
+            title="Reproducir captura",
+            initialdir=self.config.get('capture', {}).get('directory', 'capturas'),
+            filetypes=[("Capturas binarias", "*.btcap"), ("Todos los archivos", "*.*")]
+        )
+        if not paths:
+            return
+        
+        if self.bt_manager.connected and not messagebox.askyesno(
+            "Reproducir captura",
+            "Hay un dispositivo conectado: sus datos se mezclarán con los de la "
+            "reproducción.\n¿Continuar?"
+        ):
+            return
+        
+        try:
+            # Los nombres llevan fecha y número de rotación: ordenarlos da el orden de grabación
+            self.bt_manager.start_replay(
+                sorted(paths),
+                speed=REPLAY_SPEEDS[self.replay_speed_menu.get()],
+                on_finished=self._on_replay_finished
+            )
+        except (OSError, ValueError) as e:
+            logger.error(f"Error iniciando reproducción: {e}")
+            self.show_error(f"No se pudo reproducir la captura:\n{e}")
+            return
+        
+        self.replay_button.configure(text="⏹️ Detener reproducción")
+        self.replay_speed_menu.configure(state="disabled")
+    
+    def _on_replay_finished(self, stats):
+        """
+        Recibe el fin de la reproducción.
+        
+        Se ejecuta en el hilo de la reproducción; solo reenvía el aviso
+        al hilo principal.
+        
+        Args:
+            stats: Estadísticas de la reproducción
+        """
+        self.root.after(0, self._replay_finished, stats)
+    
+    def _replay_finished(self, stats):
+        """
+        Restaura los controles y muestra el resultado de la reproducción.
+        
+        Args:
+            stats: Estadísticas de la reproducción
+        """
+        self.replay_button.configure(text="▶️ Reproducir captura")
+        self.replay_speed_menu.configure(state="normal")
+        messagebox.showinfo(
+            "Reproducción terminada",
+            f"{stats['frames']} frames ({stats['bytes'] / 1e6:.1f} MB) en "
+            f"{stats['elapsed']:.1f} s\n"
+            f"{stats['frames_per_second']:,.0f} frames/s"
+        )
     
     def clear_data_display(self):
         """Limpia la visualización de datos."""
+        self._display_queue.clear()
+        self._display_skipped = 0
         self.data_textbox.delete("1.0", "end")
+        self._console_lines = 0
         self.data_handler.clear_history()
     
     def update_connection_status(self, connected, device_info):
@@ -657,6 +1243,19 @@ class MainWindow:
                 text_color="red"
             )
     
+    def show_reconnecting(self, attempt, delay):
+        """
+        Muestra que se está reintentando la conexión.
+        
+        Args:
+            attempt: Número de intento
+            delay: Segundos de espera antes del intento
+        """
+        self.connection_status_label.configure(
+            text=f"● Reconectando (intento {attempt}, en {delay:.0f}s)...",
+            text_color="orange"
+        )
+    
     def show_error(self, message):
         """
         Muestra un mensaje de error.
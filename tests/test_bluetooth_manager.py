@@ -0,0 +1,57 @@
+"""
+Pruebas de la recepción del BluetoothManager sobre el transporte simulado
+"""
+
+import socket
+import threading
+import time
+
+from src.bluetooth_manager import BluetoothManager
+from src.transport import SimulatedDevice, SimulatedTransport
+
+ADDRESS = "00:00:00:00:00:01"
+
+
+def test_peer_close_triggers_reconnection_and_gap_frame():
+    transport = SimulatedTransport([SimulatedDevice(ADDRESS)])
+    manager = BluetoothManager(transport=transport)
+    manager.set_reconnect_policy(enabled=True, initial_delay=0.05)
+
+    gaps = []
+    reconnected = threading.Event()
+
+    def on_frame(frame):
+        if frame.gap_ns:
+            gaps.append(frame)
+            reconnected.set()
+
+    subscription = manager.subscribe(on_frame, name='prueba')
+    assert manager.connect(ADDRESS, 1)
+    first_socket = manager.socket
+
+    try:
+        # El dispositivo cierra su extremo: recv() devuelve una lectura vacía
+        first_socket._peer.shutdown(socket.SHUT_RDWR)
+
+        assert reconnected.wait(2)
+        assert manager.connected
+        assert manager.socket is not first_socket
+        assert gaps[0].source == ADDRESS and gaps[0].gap_ns > 0
+    finally:
+        manager.disconnect()
+        subscription.stop()
+
+
+def test_peer_close_without_reconnection_disconnects():
+    transport = SimulatedTransport([SimulatedDevice(ADDRESS)])
+    manager = BluetoothManager(transport=transport)
+    assert manager.connect(ADDRESS, 1)
+
+    manager.socket._peer.shutdown(socket.SHUT_RDWR)
+
+    deadline = time.monotonic() + 2
+    while manager.connected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not manager.connected
+    manager.receive_thread.join(timeout=2)
+    assert not manager.receive_thread.is_alive()
@@ -0,0 +1,32 @@
+"""
+Pruebas de la grabación binaria de capturas
+"""
+
+import time
+
+from src.bluetooth_manager import BluetoothManager
+from src.capture import BinaryCaptureWriter, CaptureReader
+from src.data_bus import Frame
+from src.transport import SimulatedTransport
+
+
+def test_writers_started_in_the_same_second_use_different_files(tmp_path):
+    manager = BluetoothManager(transport=SimulatedTransport())
+    first = BinaryCaptureWriter(directory=str(tmp_path))
+    second = BinaryCaptureWriter(directory=str(tmp_path))
+    first.start(manager)
+    second.start(manager)
+
+    t_ns = time.monotonic_ns()
+    for n in range(10):
+        manager.data_bus.publish(Frame(b'frame %d' % n, "00:00:00:00:00:01", t_ns + n, 0))
+
+    first.stop()
+    second.stop()
+
+    assert first.current_path != second.current_path
+    for writer in (first, second):
+        with CaptureReader(writer.current_path) as capture:
+            frames = list(capture)
+            assert [frame.data for frame in frames] == [b'frame %d' % n for n in range(10)]
+            assert capture.time_range() == (t_ns, t_ns + 9)